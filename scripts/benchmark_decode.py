@@ -0,0 +1,63 @@
+# %%
+# Compare the former per-element decoding of times and durations with the
+# vectorized functions in pyb2b.decode, on a 50k-row flight list.
+import timeit
+
+import numpy as np
+import pandas as pd
+from pyb2b.decode import decode_duration, decode_time
+
+n = 50_000
+rng = np.random.default_rng(42)
+start = pd.Timestamp("2024-07-01")
+offsets = pd.to_timedelta(rng.integers(0, 86400, n), unit="s")
+
+times = pd.Series(
+    np.where(
+        rng.random(n) < 0.1,
+        None,
+        (start + offsets).strftime("%Y-%m-%d %H:%M"),
+    )
+)
+durations = pd.Series(
+    np.where(
+        rng.random(n) < 0.1,
+        None,
+        (offsets.components.hours.astype(str).str.zfill(2))
+        + (offsets.components.minutes.astype(str).str.zfill(2))
+        + (offsets.components.seconds.astype(str).str.zfill(2)),
+    )
+)
+
+
+def former_time() -> pd.Series:
+    return times.apply(lambda x: pd.Timestamp(x, tz="utc"))
+
+
+def former_duration() -> pd.Series:
+    return durations.apply(
+        lambda x: (
+            pd.Timedelta(f"{x[:2]} hours {x[2:4]} minutes {x[4:6]} seconds")
+            if x == x and x is not None
+            else pd.Timedelta("0")
+        )
+    )
+
+
+# %%
+assert (former_time().dropna() == decode_time(times).dropna()).all()
+assert (
+    former_duration()[durations.notna()]
+    == decode_duration(durations)[durations.notna()]
+).all()
+
+for name, former, vectorized in [
+    ("time", former_time, lambda: decode_time(times)),
+    ("duration", former_duration, lambda: decode_duration(durations)),
+]:
+    t_former = min(timeit.repeat(former, number=1, repeat=3))
+    t_vectorized = min(timeit.repeat(vectorized, number=1, repeat=3))
+    print(
+        f"{name:>8}: {t_former * 1000:8.1f} ms -> "
+        f"{t_vectorized * 1000:6.1f} ms (x{t_former / t_vectorized:.0f})"
+    )
@@ -0,0 +1,786 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import zipfile
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+from .navigation import _load, cache_dir
+
+_log = logging.getLogger(__name__)
+
+#: Columns of each table in the store
+tables: dict[str, list[str]] = {
+    "designated_points": ["id", "designator", "type", "latitude", "longitude"],
+    "navaids": ["id", "designator", "type", "name", "latitude", "longitude"],
+    "aerodromes": ["id", "icao", "designator", "name", "latitude", "longitude"],
+    "routes": ["id", "designator"],
+    "route_segments": ["route", "start", "end", "lower", "upper"],
+    "airspaces": ["id", "designator", "type", "name"],
+    "airspace_components": ["airspace", "lower", "upper", "offset"],
+    "airspace_vertices": ["latitude", "longitude"],
+}
+
+Row = dict[str, Any]
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _href(elt: None | ElementTree.Element) -> None | str:
+    """Returns the uuid an xlink:href attribute refers to."""
+    if elt is None:
+        return None
+    for key, value in elt.attrib.items():
+        if _local(key) == "href":
+            return value.rpartition(":")[2]
+    return None
+
+
+def _pos(text: None | str) -> tuple[float, float]:
+    """Decodes a gml:pos (latitude first in EPSG:4326)."""
+    if text is None:
+        return np.nan, np.nan
+    lat, lon = text.split()[:2]
+    return float(lat), float(lon)
+
+
+def _level(elt: None | ElementTree.Element) -> float:
+    """Decodes a vertical limit into a flight level."""
+    if elt is None or elt.text is None:
+        return np.nan
+    text, uom = elt.text.strip(), elt.get("uom", "FL")
+    if text in ("GND", "FLOOR"):
+        return 0.0
+    if text in ("UNL", "CEILING"):
+        return np.inf
+    try:
+        value = float(text)
+    except ValueError:
+        return np.nan
+    if uom == "FT":
+        return value / 100
+    if uom == "M":
+        return value / 0.3048 / 100
+    return value  # FL
+
+
+def _timeslice(feature: ElementTree.Element) -> None | ElementTree.Element:
+    """Returns the BASELINE time slice of a feature (or the first one)."""
+    slices = [ts[0] for ts in feature.iterfind("{*}timeSlice") if len(ts)]
+    for ts in slices:
+        if ts.findtext("{*}interpretation") == "BASELINE":
+            return ts
+    return slices[0] if slices else None
+
+
+def _designated_point(feature: ElementTree.Element, ts: Any) -> Row:
+    lat, lon = _pos(ts.findtext("{*}location/{*}Point/{*}pos"))
+    return dict(
+        id=feature.findtext("{*}identifier"),
+        designator=ts.findtext("{*}designator"),
+        type=ts.findtext("{*}type"),
+        latitude=lat,
+        longitude=lon,
+    )
+
+
+def _navaid(feature: ElementTree.Element, ts: Any) -> Row:
+    lat, lon = _pos(ts.findtext("{*}location/{*}ElevatedPoint/{*}pos"))
+    return dict(
+        id=feature.findtext("{*}identifier"),
+        designator=ts.findtext("{*}designator"),
+        type=ts.findtext("{*}type"),
+        name=ts.findtext("{*}name"),
+        latitude=lat,
+        longitude=lon,
+    )
+
+
+def _aerodrome(feature: ElementTree.Element, ts: Any) -> Row:
+    lat, lon = _pos(ts.findtext("{*}ARP/{*}ElevatedPoint/{*}pos"))
+    return dict(
+        id=feature.findtext("{*}identifier"),
+        icao=ts.findtext("{*}locationIndicatorICAO"),
+        designator=ts.findtext("{*}designator"),
+        name=ts.findtext("{*}name"),
+        latitude=lat,
+        longitude=lon,
+    )
+
+
+def _route(feature: ElementTree.Element, ts: Any) -> Row:
+    return dict(
+        id=feature.findtext("{*}identifier"),
+        designator="".join(
+            ts.findtext(f"{{*}}{field}") or ""
+            for field in (
+                "designatorPrefix",
+                "designatorSecondLetter",
+                "designatorNumber",
+                "multipleIdentifier",
+            )
+        ),
+    )
+
+
+def _segment_point(elt: None | ElementTree.Element) -> None | str:
+    if elt is None:
+        return None
+    for choice in elt:
+        if _local(choice.tag).startswith("pointChoice_"):
+            return _href(choice)
+    return None
+
+
+def _route_segment(feature: ElementTree.Element, ts: Any) -> Row:
+    return dict(
+        route=_href(ts.find("{*}routeFormed")),
+        start=_segment_point(ts.find("{*}start/{*}EnRouteSegmentPoint")),
+        end=_segment_point(ts.find("{*}end/{*}EnRouteSegmentPoint")),
+        lower=_level(ts.find("{*}lowerLimit")),
+        upper=_level(ts.find("{*}upperLimit")),
+    )
+
+
+#: Nautical miles per unit of length
+_nautical_miles = {
+    "NM": 1.0,
+    "[nmi_i]": 1.0,
+    "KM": 1 / 1.852,
+    "M": 1 / 1852,
+    "FT": 0.3048 / 1852,
+}
+
+
+def _coords(elt: ElementTree.Element) -> list[float]:
+    """Returns the coordinates of the points of a line segment."""
+    coords: list[float] = []
+    for child in elt:
+        tag = _local(child.tag)
+        if tag in ("pos", "posList") and child.text:
+            coords.extend(float(x) for x in child.text.split())
+        elif tag in ("pointProperty", "pointRep"):
+            coords.extend(_pos(child.findtext(".//{*}pos")))
+    return coords
+
+
+def _arc(segment: ElementTree.Element) -> list[float]:
+    """Returns vertices along an ArcByCenterPoint or CircleByCenterPoint.
+
+    Angles are bearings (clockwise from the north), as in the AIXM coding
+    guidelines, and vertices are spaced by at most 5 degrees.
+    """
+    center = _coords(segment)
+    radius = segment.find("{*}radius")
+    if len(center) < 2 or radius is None or radius.text is None:
+        return []
+    if _local(segment.tag) == "CircleByCenterPoint":
+        start, end = 0.0, 360.0
+    else:
+        start = float(segment.findtext("{*}startAngle") or 0)
+        end = float(segment.findtext("{*}endAngle") or 0)
+    lat, lon = center[:2]
+    unit = _nautical_miles.get(radius.get("uom", "NM"), 1)
+    length = float(radius.text) * unit / 60  # in degrees of latitude
+    bearing = np.radians(
+        np.linspace(start, end, int(np.ceil(abs(end - start) / 5)) + 1)
+    )
+    vertices = np.column_stack(
+        [
+            lat + length * np.cos(bearing),
+            lon + length * np.sin(bearing) / np.cos(np.radians(lat)),
+        ]
+    )
+    return vertices.ravel().tolist()  # type: ignore
+
+
+def _ring(ring: ElementTree.Element, ignored: Counter[str]) -> list[float]:
+    """Returns the vertices of a gml:exterior ring, as in a posList."""
+    coords: list[float] = []
+    for elt in ring.iter():
+        tag = _local(elt.tag)
+        if tag == "LinearRing":
+            segments = [elt]
+        elif tag == "segments":
+            segments = list(elt)
+        else:
+            continue
+        for segment in segments:
+            kind = _local(segment.tag)
+            if kind in ("LinearRing", "GeodesicString", "LineStringSegment"):
+                coords.extend(_coords(segment))
+            elif kind in ("ArcByCenterPoint", "CircleByCenterPoint"):
+                coords.extend(_arc(segment))
+            else:
+                ignored[f"{kind} segments"] += 1
+    return coords
+
+
+def _airspace(feature: ElementTree.Element, ts: Any) -> Row:
+    components: list[Row] = []
+    ignored: Counter[str] = Counter()
+    for component in ts.iterfind(
+        "{*}geometryComponent/{*}AirspaceGeometryComponent"
+    ):
+        volume = component.find("{*}theAirspaceVolume/{*}AirspaceVolume")
+        if volume is None:
+            continue
+        # one polygon per patch, without holes: points inside of an
+        # interior ring are still considered inside of the airspace
+        polygons: list[list[float]] = []
+        projection = volume.find("{*}horizontalProjection")
+        for patch in projection.iter() if projection is not None else []:
+            if _local(patch.tag) != "PolygonPatch":
+                continue
+            exterior = patch.find("{*}exterior")
+            if exterior is not None:
+                polygons.append(_ring(exterior, ignored))
+            ignored["interior rings"] += len(patch.findall("{*}interior"))
+        contributor = volume.find(
+            "{*}contributorAirspace/{*}AirspaceVolumeDependency/{*}theAirspace"
+        )
+        components.append(
+            dict(
+                operation=component.findtext("{*}operation"),
+                contributor=_href(contributor),
+                lower=_level(volume.find("{*}lowerLimit")),
+                upper=_level(volume.find("{*}upperLimit")),
+                polygons=polygons,
+            )
+        )
+    return dict(
+        id=feature.findtext("{*}identifier"),
+        designator=ts.findtext("{*}designator"),
+        type=ts.findtext("{*}type"),
+        name=ts.findtext("{*}name"),
+        components=components,
+        ignored=ignored,
+    )
+
+
+Volume = tuple[float, float, list[float]]
+
+
+def _resolve(airspaces: list[Row]) -> list[list[Volume]]:
+    """Returns the (lower, upper, vertices) volumes of each airspace.
+
+    Aggregated airspaces (e.g. collapsed sectors) refer to the airspaces
+    they are made of with contributorAirspace: the volumes of contributors
+    are copied, with the vertical limits of the aggregate when it sets
+    them.
+    """
+    position = dict((row["id"], i) for i, row in enumerate(airspaces))
+    resolved: dict[int, list[Volume]] = {}
+    skipped = 0
+
+    def volumes(i: int, visiting: frozenset[int]) -> list[Volume]:
+        nonlocal skipped
+        if i in resolved:
+            return resolved[i]
+        result: list[Volume] = []
+        for component in airspaces[i]["components"]:
+            # SUBTR and INTERS would need polygon clipping: rather than
+            # indexing a volume larger than the airspace, they are skipped
+            if component["operation"] not in (None, "BASE", "UNION"):
+                skipped += 1
+                continue
+            lower, upper = component["lower"], component["upper"]
+            contributor = position.get(component["contributor"])
+            if component["contributor"] is None:
+                result.extend(
+                    (lower, upper, polygon) for polygon in component["polygons"]
+                )
+            elif contributor is not None and contributor not in visiting:
+                result.extend(
+                    (
+                        c_lower if np.isnan(lower) else lower,
+                        c_upper if np.isnan(upper) else upper,
+                        vertices,
+                    )
+                    for c_lower, c_upper, vertices in volumes(
+                        contributor, visiting | {contributor}
+                    )
+                )
+            else:
+                _log.warning(
+                    f"Airspace {airspaces[i]['designator']}: contributor "
+                    f"{component['contributor']} not found"
+                )
+        resolved[i] = result
+        return result
+
+    result = [volumes(i, frozenset([i])) for i in range(len(airspaces))]
+    if skipped > 0:
+        _log.warning(f"{skipped} SUBTR/INTERS airspace components skipped")
+    ignored = sum((row["ignored"] for row in airspaces), Counter[str]())
+    for what, count in ignored.items():
+        _log.warning(f"{count} {what} ignored in airspace geometries")
+    return result
+
+
+Handler = Callable[[ElementTree.Element, Any], Row]
+
+#: Features ingested, by AIXM tag, with the table they go to
+handlers: dict[str, tuple[str, Handler]] = {
+    "DesignatedPoint": ("designated_points", _designated_point),
+    "Navaid": ("navaids", _navaid),
+    "AirportHeliport": ("aerodromes", _aerodrome),
+    "Route": ("routes", _route),
+    "RouteSegment": ("route_segments", _route_segment),
+    "Airspace": ("airspaces", _airspace),
+}
+
+
+def iter_features(fh: IO[bytes]) -> Iterator[tuple[str, Row]]:
+    """Yields (table, row) for each feature of an AIXM file, as it is read.
+
+    Features are discarded once decoded, so that memory does not grow with
+    the size of the file.
+    """
+    root: None | ElementTree.Element = None
+    for event, elt in ElementTree.iterparse(fh, events=("start", "end")):
+        if root is None:
+            root = elt
+        if event != "end":
+            continue
+        tag = _local(elt.tag)
+        if tag in handlers:
+            ts = _timeslice(elt)
+            if ts is not None:
+                table, handler = handlers[tag]
+                yield table, handler(elt, ts)
+        elif tag == "hasMember":
+            root.clear()
+
+
+def _open(path: Path) -> Iterator[IO[bytes]]:
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith(".xml"):
+                    with archive.open(name) as fh:
+                        yield fh
+    else:
+        with path.open("rb") as fh:
+            yield fh
+
+
+def ingest(
+    paths: Iterable[str | Path],
+    airac: str,
+    cache: str | Path = cache_dir,
+) -> AIXMStore:
+    """Builds the store of an AIRAC cycle from AIXM files.
+
+    Files (XML or zip archives of XML files) are parsed as streams. Each
+    column is written as a .npy file so that it can be memory-mapped.
+
+    :param paths: AIXM files, e.g. downloaded by ``airac``
+    :param airac: the AIRAC cycle, e.g. "2401"
+    :param cache: the directory where stores are kept
+    """
+    columns: dict[str, dict[str, list[Any]]] = dict(
+        (table, dict((column, []) for column in names))
+        for table, names in tables.items()
+    )
+    # contributors of aggregated airspaces may come later in the files
+    airspaces: list[Row] = []
+    for path in paths:
+        _log.info(f"ingest {path}")
+        for fh in _open(Path(path)):
+            for table, row in iter_features(fh):
+                if table == "airspaces":
+                    airspaces.append(row)
+                for column, values in columns[table].items():
+                    values.append(row[column])
+
+    components = columns["airspace_components"]
+    vertices = columns["airspace_vertices"]
+    for i, volumes in enumerate(_resolve(airspaces)):
+        for lower, upper, coords in volumes:
+            components["airspace"].append(i)
+            components["lower"].append(lower)
+            components["upper"].append(upper)
+            components["offset"].append(len(vertices["latitude"]))
+            vertices["latitude"].extend(coords[0::2])
+            vertices["longitude"].extend(coords[1::2])
+    # the end of the last polygon
+    components["offset"].append(len(vertices["latitude"]))
+
+    target = Path(cache) / f"aixm_{airac}"
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for table, content in columns.items():
+        for column, values in content.items():
+            if column in ("latitude", "longitude", "lower", "upper"):
+                array = np.asarray(values, dtype=np.float32)
+            elif column in ("airspace", "offset"):
+                array = np.asarray(values, dtype=np.int64)
+            else:
+                array = np.asarray(
+                    [value if value is not None else "" for value in values],
+                    dtype=str,
+                )
+            np.save(tmp / f"{table}.{column}.npy", array)
+    (tmp / "meta.json").write_text(
+        json.dumps(
+            dict(
+                airac=airac,
+                sizes=dict(
+                    (table, len(next(iter(content.values()))))
+                    for table, content in columns.items()
+                ),
+            )
+        )
+    )
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+    # Indexes built before the store (e.g. from traffic) are outdated
+    (Path(cache) / f"navindex_{airac}.npz").unlink(missing_ok=True)
+    _load.cache_clear()
+    _airspace_index.cache_clear()
+    return AIXMStore(target)
+
+
+class AIXMStore:
+    """Navigation data of an AIRAC cycle, as memory-mapped NumPy arrays.
+
+    Columns are only mapped when first accessed, and pages are shared
+    between all processes opening the same store.
+
+    Tables and columns are listed in :data:`tables`. Each airspace is made
+    of one or several components (see :meth:`components`), with their own
+    vertical limits. The vertices of the horizontal projection of component
+    i are between offsets i and i + 1 of airspace_vertices.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self._columns: dict[tuple[str, str], np.ndarray] = {}
+
+    @classmethod
+    def load(
+        cls, airac: str, cache: str | Path = cache_dir
+    ) -> None | AIXMStore:
+        """Returns the store of an AIRAC cycle, if it was ingested."""
+        path = Path(cache) / f"aixm_{airac}"
+        return cls(path) if (path / "meta.json").exists() else None
+
+    @property
+    def airac(self) -> str:
+        return self.meta["airac"]  # type: ignore
+
+    def column(self, table: str, column: str) -> np.ndarray:
+        key = (table, column)
+        if key not in self._columns:
+            if column not in tables[table]:
+                raise KeyError(f"No column {column} in {table}")
+            self._columns[key] = np.load(
+                self.path / f"{table}.{column}.npy", mmap_mode="r"
+            )
+        return self._columns[key]
+
+    def frame(self, table: str) -> pd.DataFrame:
+        """Returns a copy of a table as a DataFrame."""
+        columns = [c for c in tables[table] if c != "offset"]
+        return pd.DataFrame(
+            dict((column, self.column(table, column)) for column in columns)
+        )
+
+    def components(self, i: int) -> np.ndarray:
+        """Returns the positions of the components of an airspace."""
+        airspace = self.column("airspace_components", "airspace")
+        start, stop = np.searchsorted(airspace, [i, i + 1])
+        return np.arange(start, stop)
+
+    def vertices(self, i: int) -> np.ndarray:
+        """Returns the (latitude, longitude) vertices of a component."""
+        offset = self.column("airspace_components", "offset")
+        start, stop = int(offset[i]), int(offset[i + 1])
+        return np.stack(
+            [
+                self.column("airspace_vertices", "latitude")[start:stop],
+                self.column("airspace_vertices", "longitude")[start:stop],
+            ],
+            axis=1,
+        )
+
+    def points(self) -> pd.DataFrame:
+        """Returns designated points and navaids, with name, latitude and
+        longitude columns."""
+        return pd.concat(
+            [
+                self.frame(table)[["id", "designator", "latitude", "longitude"]]
+                for table in ("designated_points", "navaids")
+            ]
+        ).rename(columns={"designator": "name"})
+
+    def airways(self) -> pd.DataFrame:
+        """Returns the points of each route, with route, navaid, latitude
+        and longitude columns."""
+        points = self.points().set_index("id")
+        routes = self.frame("routes").set_index("id").designator
+        segments = self.frame("route_segments")
+        return (
+            pd.concat(
+                [
+                    segments[["route", "start"]].rename(
+                        columns={"start": "point"}
+                    ),
+                    segments[["route", "end"]].rename(columns={"end": "point"}),
+                ]
+            )
+            .assign(route=lambda df: df.route.map(routes))
+            .join(points, on="point", how="inner")
+            .dropna(subset=["route"])
+            .rename(columns={"name": "navaid"})[
+                ["route", "navaid", "latitude", "longitude"]
+            ]
+        )
+
+
+def _contains(
+    polygon: np.ndarray, latitude: np.ndarray, longitude: np.ndarray
+) -> np.ndarray:
+    """Tests whether points are inside a polygon (even-odd rule).
+
+    :param polygon: (latitude, longitude) vertices
+    """
+    if not np.array_equal(polygon[0], polygon[-1]):
+        polygon = np.concatenate([polygon, polygon[:1]])
+    yi, xi = polygon[:-1, 0, None], polygon[:-1, 1, None]
+    yj, xj = polygon[1:, 0, None], polygon[1:, 1, None]
+    inside = np.zeros(len(latitude), dtype=bool)
+    # edges x points matrices, computed by chunks of points
+    step = max(1, (1 << 20) // len(yi))
+    for start in range(0, len(latitude), step):
+        y = latitude[None, start : start + step]
+        x = longitude[None, start : start + step]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = ((yi > y) != (yj > y)) & (
+                x < (xj - xi) * (y - yi) / (yj - yi) + xi
+            )
+        inside[start : start + step] = crossing.sum(axis=0) % 2 == 1
+    return inside
+
+
+class AirspaceIndex:
+    """A spatial index over the airspaces of an AIXM store.
+
+    Bounding boxes of airspace components are registered in the cells of a
+    regular latitude/longitude grid. Points are first matched with the
+    components registered in their cell, then filtered on the bounding
+    boxes and vertical limits, and only the remaining candidates are tested
+    against the polygons.
+
+    :param store: the AIXM store of an AIRAC cycle
+    :param types: the types of airspaces to index (e.g. SECTOR), by default
+        all of them
+    :param resolution: the size of the cells, in degrees
+    """
+
+    def __init__(
+        self,
+        store: AIXMStore,
+        types: None | Iterable[str] = None,
+        resolution: float = 1.0,
+    ) -> None:
+        self.store = store
+        self.resolution = resolution
+        offset = store.column("airspace_components", "offset")
+        latitude = store.column("airspace_vertices", "latitude")
+        longitude = store.column("airspace_vertices", "longitude")
+        selected = np.flatnonzero(np.diff(offset) >= 3)
+        airspaces = store.column("airspace_components", "airspace")[selected]
+        if types is not None:
+            kind = store.column("airspaces", "type")[airspaces]
+            keep = np.isin(kind, list(types))
+            selected, airspaces = selected[keep], airspaces[keep]
+
+        #: indices of the components in the store
+        self.components = selected
+        #: indices of the airspaces in the store
+        self.airspaces = airspaces
+        self.designators = store.column("airspaces", "designator")[airspaces]
+        self.lower = np.nan_to_num(
+            store.column("airspace_components", "lower")[selected], nan=0
+        )
+        self.upper = np.nan_to_num(
+            store.column("airspace_components", "upper")[selected], nan=np.inf
+        )
+        bounds = np.array(
+            [
+                (
+                    latitude[offset[i] : offset[i + 1]].min(),
+                    latitude[offset[i] : offset[i + 1]].max(),
+                    longitude[offset[i] : offset[i + 1]].min(),
+                    longitude[offset[i] : offset[i + 1]].max(),
+                )
+                for i in selected
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        self.bounds = bounds
+
+        # cells covered by the bounding box of each airspace
+        rows = self._rows(bounds[:, 0]), self._rows(bounds[:, 1])
+        cols = self._cols(bounds[:, 2]), self._cols(bounds[:, 3])
+        keys: list[np.ndarray] = []
+        for rmin, rmax, cmin, cmax in zip(*rows, *cols):
+            r, c = np.mgrid[rmin : rmax + 1, cmin : cmax + 1]
+            keys.append(self._key(r.ravel(), c.ravel()))
+        sizes = [len(k) for k in keys]
+        cell_keys = np.concatenate(keys) if keys else np.array([], np.int64)
+        members = np.repeat(np.arange(len(selected)), sizes)
+        order = np.argsort(cell_keys, kind="stable")
+        self._cell_keys, first = np.unique(cell_keys[order], return_index=True)
+        self._cell_offsets = np.append(first, len(order))
+        self._cell_members = members[order]
+
+    @classmethod
+    def load(
+        cls,
+        airac: str,
+        types: None | tuple[str, ...] = None,
+        resolution: float = 1.0,
+    ) -> AirspaceIndex:
+        """Returns the index of an ingested AIRAC cycle (cached)."""
+        return _airspace_index(airac, types, resolution)
+
+    def _rows(self, latitude: np.ndarray) -> np.ndarray:
+        return np.floor((latitude + 90) / self.resolution).astype(np.int64)
+
+    def _cols(self, longitude: np.ndarray) -> np.ndarray:
+        return np.floor((longitude + 180) / self.resolution).astype(np.int64)
+
+    def _key(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        ncols = int(np.ceil(360 / self.resolution)) + 1
+        return rows * ncols + cols  # type: ignore
+
+    def query(
+        self,
+        latitude: Any,
+        longitude: Any,
+        flight_level: Any = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns all (point, airspace) pairs such that the point is inside
+        one of the components of the airspace.
+
+        :param latitude: latitudes of points
+        :param longitude: longitudes of points
+        :param flight_level: flight levels of points, compared with the
+            vertical limits of the airspaces. By default, or if a value is
+            NaN, vertical limits are ignored.
+
+        The first array holds positions in the input, the second one
+        positions in the index (see :attr:`designators`), each pair being
+        returned once even if several components contain the point.
+        """
+        lat = np.asarray(latitude, dtype=np.float64)
+        lon = np.asarray(longitude, dtype=np.float64)
+        fl = (
+            np.full(len(lat), np.nan)
+            if flight_level is None
+            else np.asarray(flight_level, dtype=np.float64)
+        )
+        empty = np.array([], dtype=np.int64)
+        if len(self._cell_keys) == 0 or len(lat) == 0:
+            return empty, empty
+
+        # candidates registered in the cell of each point, none for points
+        # which could not be located (NaN coordinates)
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+        keys = self._key(self._rows(lat[valid]), self._cols(lon[valid]))
+        pos = np.searchsorted(self._cell_keys, keys)
+        pos = np.minimum(pos, len(self._cell_keys) - 1)
+        found = self._cell_keys[pos] == keys
+        starts = np.where(found, self._cell_offsets[pos], 0)
+        counts = np.where(found, self._cell_offsets[pos + 1] - starts, 0)
+        points = np.repeat(valid, counts)
+        within = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        candidates = self._cell_members[np.repeat(starts, counts) + within]
+
+        # bounding boxes and vertical limits
+        bounds = self.bounds[candidates]
+        p_lat, p_lon, p_fl = lat[points], lon[points], fl[points]
+        keep = (
+            (bounds[:, 0] <= p_lat)
+            & (p_lat <= bounds[:, 1])
+            & (bounds[:, 2] <= p_lon)
+            & (p_lon <= bounds[:, 3])
+            & (
+                np.isnan(p_fl)
+                | (
+                    (self.lower[candidates] <= p_fl)
+                    & (p_fl <= self.upper[candidates])
+                )
+            )
+        )
+        points, candidates = points[keep], candidates[keep]
+
+        # exact tests, one polygon at a time
+        inside = np.zeros(len(points), dtype=bool)
+        order = np.argsort(candidates, kind="stable")
+        airspaces, first = np.unique(candidates[order], return_index=True)
+        for airspace, idx in zip(airspaces, np.split(order, first[1:])):
+            polygon = self.store.vertices(int(self.components[airspace]))
+            inside[idx] = _contains(polygon, lat[points[idx]], lon[points[idx]])
+        points, candidates = points[inside], candidates[inside]
+
+        # one pair per airspace when components overlap
+        _, first = np.unique(
+            np.stack([points, self.airspaces[candidates]]),
+            axis=1,
+            return_index=True,
+        )
+        first.sort()
+        return points[first], candidates[first]
+
+    def annotate(
+        self, data: pd.DataFrame, column: str = "airspaces"
+    ) -> pd.DataFrame:
+        """Adds the list of airspaces containing each point of a profile.
+
+        The data must have latitude and longitude columns, and either a
+        flight_level (as in ProfileBatch) or an altitude (in ft, as in
+        FlightInfo.parsePlan) column.
+        """
+        if "flight_level" in data.columns:
+            fl = data.flight_level.to_numpy(dtype=np.float64)
+        elif "altitude" in data.columns:
+            fl = data.altitude.to_numpy(dtype=np.float64) / 100
+        else:
+            fl = None
+        points, airspaces = self.query(data.latitude, data.longitude, fl)
+        designators = pd.Series(self.designators[airspaces], index=points)
+        grouped = designators.groupby(level=0).agg(list)
+        result: list[list[str]] = [[] for _ in range(len(data))]
+        for i, names in zip(grouped.index, grouped):
+            result[i] = names
+        return data.assign(**{column: result})
+
+
+@lru_cache()
+def _airspace_index(
+    airac: str, types: None | tuple[str, ...], resolution: float
+) -> AirspaceIndex:
+    store = AIXMStore.load(airac)
+    if store is None:
+        raise FileNotFoundError(f"No AIXM store for AIRAC {airac}")
+    return AirspaceIndex(store, types, resolution)
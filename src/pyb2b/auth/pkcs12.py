@@ -1,6 +1,10 @@
+import logging
 import os
 import typing
-from datetime import datetime, timezone
+import warnings
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from ssl import PROTOCOL_TLS, SSLContext
 from tempfile import NamedTemporaryFile
 
@@ -11,15 +15,59 @@ from cryptography.hazmat.primitives.serialization.pkcs12 import (
 )
 from cryptography.x509.base import Certificate
 
+_log = logging.getLogger(__name__)
 
-def check_cert(cert: typing.Optional[Certificate]) -> None:
+#: A warning is issued if the client certificate expires within this delay
+expiry_warning = timedelta(days=30)
+
+
+def check_cert(
+    cert: typing.Optional[Certificate],
+    warn_before: typing.Optional[timedelta] = None,
+) -> None:
     if not cert:
         raise ValueError("Broken client certificate")
 
-    if cert.not_valid_after_utc < datetime.now(tz=timezone.utc):
-        raise ValueError(
-            f"Client certificate expired: Not After: {cert.not_valid_after}"
-        )
+    not_after = cert.not_valid_after_utc
+    if not_after < datetime.now(tz=timezone.utc):
+        raise ValueError(f"Client certificate expired: Not After: {not_after}")
+
+    if warn_before is not None:
+        if not_after < datetime.now(tz=timezone.utc) + warn_before:
+            warnings.warn(
+                f"Client certificate expires soon: Not After: {not_after}"
+            )
+
+
+def _load_cert_chain(
+    ssl_context: SSLContext, pem: bytes, password: typing.Optional[bytes]
+) -> None:
+    """Loads a PEM chain, without writing it to disk when possible.
+
+    OpenSSL only loads certificates from files: on Linux, the file is an
+    anonymous file living in memory (memfd).
+    """
+    if hasattr(os, "memfd_create"):
+        fd = os.memfd_create("b2b")  # close-on-exec by default
+        try:
+            os.write(fd, pem)
+            ssl_context.load_cert_chain(
+                f"/proc/self/fd/{fd}", password=password
+            )
+            return
+        except FileNotFoundError:  # no /proc
+            pass
+        finally:
+            os.close(fd)
+
+    with NamedTemporaryFile(delete=False) as c:
+        try:
+            c.write(pem)
+            c.flush()
+            c.close()
+            ssl_context.load_cert_chain(c.name, password=password)
+        finally:
+            os.remove(c.name)
 
 
 def create_ssl_context(
@@ -32,31 +80,42 @@ def create_ssl_context(
 
     assert private_key is not None
     assert cert is not None
-    check_cert(cert)
+    check_cert(cert, expiry_warning)
+
+    # The private key is only written encrypted (if there is a password)
+    encryption: serialization.KeySerializationEncryption
+    encryption = serialization.NoEncryption()
+    if pkcs12_password_bytes:
+        encryption = serialization.BestAvailableEncryption(
+            pkcs12_password_bytes
+        )
+    pem = private_key.private_bytes(
+        Encoding.PEM, PrivateFormat.PKCS8, encryption
+    )
+    pem += cert.public_bytes(Encoding.PEM)
+    for ca_cert in ca_certs or []:
+        check_cert(ca_cert)
+        pem += ca_cert.public_bytes(Encoding.PEM)
 
     ssl_context = SSLContext(PROTOCOL_TLS)
-    with NamedTemporaryFile(delete=False) as c:
-        try:
-            private_bytes = private_key.private_bytes(
-                Encoding.PEM,
-                PrivateFormat.TraditionalOpenSSL,
-                serialization.NoEncryption(),
-            )
-            c.write(private_bytes)
+    _load_cert_chain(ssl_context, pem, pkcs12_password_bytes)
+    return ssl_context
 
-            public_bytes = cert.public_bytes(Encoding.PEM)
-            c.write(public_bytes)
 
-            if ca_certs:
-                for ca_cert in ca_certs:
-                    check_cert(ca_cert)
-                    ca_public_bytes = ca_cert.public_bytes(Encoding.PEM)
-                    c.write(ca_public_bytes)
+def load_ssl_context(
+    pkcs12_filename: typing.Union[str, Path], pkcs12_password: str
+) -> SSLContext:
+    """Returns the SSL context for a PKCS12 file.
 
-            c.flush()
-            c.close()
-            ssl_context.load_cert_chain(c.name, password=pkcs12_password_bytes)
-        finally:
-            os.remove(c.name)
+    The context is built once per file (and modification time) and
+    password, then shared by all B2B instances of the process, and by the
+    processes forked from it.
+    """
+    path = Path(pkcs12_filename).resolve()
+    return _cached_ssl_context(path, path.stat().st_mtime_ns, pkcs12_password)
 
-    return ssl_context
+
+@lru_cache()
+def _cached_ssl_context(path: Path, mtime: int, password: str) -> SSLContext:
+    _log.info(f"Load client certificate {path}")
+    return create_ssl_context(path.read_bytes(), password.encode())
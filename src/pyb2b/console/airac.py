@@ -6,6 +6,11 @@ from pathlib import Path
 import httpx
 
 from pyb2b import b2b
+from pyb2b.aixm import ingest
+from pyb2b.services.airspace.structure.aixm_dataset import (
+    Manifest,
+    local_path,
+)
 
 description = """
 Get data from Network Manager B2B Service.
@@ -24,6 +29,21 @@ def main() -> None:
     )
 
     parser.add_argument("-a", dest="airac", default=None, help="AIRAC version")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=2,
+        help="number of files downloaded concurrently",
+    )
+    parser.add_argument(
+        "-i",
+        "--ingest",
+        dest="ingest",
+        action="store_true",
+        help="build the navigation database from the downloaded files",
+    )
 
     args = parser.parse_args()
 
@@ -35,11 +55,19 @@ def main() -> None:
 
     if args.airac is not None:
 
-        async def download_data() -> None:
+        async def download_data() -> Manifest:
             async with httpx.AsyncClient(verify=b2b.context) as client:
-                await b2b.async_aixm_request(client, args.airac, Path("."))
+                return await b2b.async_aixm_request(
+                    client, args.airac, Path("."), jobs=args.jobs
+                )
 
-        asyncio.run(download_data())
+        manifest = asyncio.run(download_data())
+        if args.ingest:
+            files = manifest["files"].values()
+            ingest(
+                (local_path(file, Path(".")) for file in files),
+                manifest["airac"],
+            )
     else:
         raise RuntimeError("No action requested")
 
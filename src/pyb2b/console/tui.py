@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Union
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Union,
+)
 
 import httpx
-from rich.json import JSON
+from rich.highlighter import JSONHighlighter
 from rich.text import Text
-from textual import on
+from textual import on, work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical, VerticalScroll
 from textual.logging import TextualHandler
+from textual.timer import Timer
+from textual.widget import Widget
 from textual.widgets import (
     DataTable,
     Footer,
@@ -22,7 +37,9 @@ from textual.widgets import (
     TabbedContent,
     TabPane,
     Tabs,
+    Tree,
 )
+from textual.widgets.tree import TreeNode
 
 import pandas as pd
 from pyb2b import b2b
@@ -33,16 +50,62 @@ from pyb2b.services.flight.management import (
     FlightPlanList,
     FlightRetrieval,
 )
+from pyb2b.services.flight.management.flightretrieval import FlightKeys
 from pyb2b.types.generated.flight import (
     FlightOrFlightPlan,
     FlightPlanOrInvalidFiling,
 )
 
+Results = Union[
+    FlightPlanList,
+    FlightListByAirspace,
+    FlightListByAerodrome,
+    FlightListByMeasure,
+]
+
+#: Number of rows added to the table before yielding to the event loop
+chunk_size = 256
+
+#: Style of the cells which changed on the last refresh
+changed_style = "bold reverse"
+
+flightplan_columns = (
+    "date",
+    "callsign",
+    "from",
+    "to",
+    "EOBT",
+    "flightid",
+    "status",
+)
+flightlist_columns = (
+    "date",
+    "icao24",
+    "typecode",
+    "callsign",
+    "number",
+    "from",
+    "to",
+    "EOBT",
+    "flightid",
+    "CTOT",
+    "regulation",
+)
+
 # -- Formatters --
 
 logging.basicConfig(level="NOTSET", handlers=[TextualHandler()])
 
 
+@lru_cache(maxsize=4096)
+def _format_time(timestamp: str, format_spec: str) -> str:
+    # Timestamps in a list mostly share the same dates and minutes
+    try:
+        return format(pd.Timestamp(timestamp, tz="utc"), format_spec)
+    except ValueError:  # e.g. SLOT_TIME_NOT_LIMITED
+        return timestamp
+
+
 class Time:
     def __init__(self, timestamp: None | int | str | pd.Timestamp):
         self.ts = timestamp
@@ -50,6 +113,8 @@ class Time:
     def __format__(self, __format_spec: str) -> str:
         if self.ts is None:
             return ""
+        if isinstance(self.ts, str):
+            return _format_time(self.ts, __format_spec)
         if isinstance(self.ts, int):
             ts = pd.Timestamp(self.ts, unit="s", tz="utc")
         else:
@@ -57,6 +122,172 @@ class Time:
         return format(ts, __format_spec)
 
 
+def flightplan_rows(
+    flightplanlist: FlightPlanList,
+) -> Iterator[tuple[Any, ...]]:
+    if flightplanlist.json["data"] is None:
+        return
+
+    def eobt(entry: FlightPlanOrInvalidFiling) -> str:
+        if lfvp := entry.get("lastValidFlightPlan", None):
+            return lfvp["id"]["keys"]["estimatedOffBlockTime"]
+        return ""
+
+    s = flightplanlist.json["data"]["summaries"]
+    summaries = s if isinstance(s, list) else [s]
+
+    for entry in sorted(summaries, key=eobt):
+        if lvfp := entry.get("lastValidFlightPlan", None):
+            yield (
+                f"{Time(eobt(entry)):%d %b %y}",
+                lvfp["id"]["keys"]["aircraftId"],
+                lvfp["id"]["keys"]["aerodromeOfDeparture"],
+                lvfp["id"]["keys"]["aerodromeOfDestination"],
+                f"{Time(eobt(entry)):%H:%MZ}",
+                lvfp["id"]["id"],
+                lvfp["status"],
+            )
+
+
+def flightlist_rows(
+    flightlist: FlightListByAerodrome
+    | FlightListByAirspace
+    | FlightListByMeasure,
+) -> Iterator[tuple[Any, ...]]:
+    if flightlist.json["data"] is None:
+        return
+
+    def eobt(entry: FlightOrFlightPlan) -> str:
+        if flight_id := entry.get("flight", None):
+            return flight_id["flightId"]["keys"]["estimatedOffBlockTime"]
+        return ""
+
+    s = flightlist.json["data"]["flights"]
+    summaries: list[FlightOrFlightPlan] = s if isinstance(s, list) else [s]
+
+    for entry in sorted(summaries, key=eobt):
+        if flight := entry.get("flight", None):
+            yield (
+                f"{Time(eobt(entry)):%d %b %y}",
+                flight.get("aircraftAddress", "").lower(),
+                flight.get("aircraftType", None),
+                flight["flightId"]["keys"]["aircraftId"],
+                flight.get("iataFlightDesignator", {"id": ""})["id"],
+                flight["flightId"]["keys"]["aerodromeOfDeparture"],
+                flight["flightId"]["keys"]["aerodromeOfDestination"],
+                f"{Time(eobt(entry)):%H:%MZ}",
+                flight["flightId"].get("id", None),
+                f"{Time(flight.get('calculatedTakeOffTime', None)):%H:%MZ}",
+                flight.get("mostPenalisingRegulation", None),
+            )
+
+
+# -- Searches --
+
+
+class Search(NamedTuple):
+    """The content of the search fields."""
+
+    start: pd.Timestamp
+    callsign: str
+    origin: str
+    destination: str
+    airspace: str
+    regulation: str
+
+    async def fetch(self, client: httpx.AsyncClient) -> None | Results:
+        start, stop = self.start, self.start + pd.Timedelta("1 day")
+        callsign, origin, destination = (
+            self.callsign,
+            self.origin,
+            self.destination,
+        )
+
+        if callsign or origin and destination and origin != destination:
+            return await b2b.async_flightplanlist(
+                client,
+                start=start,
+                stop=stop,
+                callsign=callsign if callsign else "*",
+                origin=origin if origin else "*",
+                destination=destination if destination else "*",
+            )
+        elif origin and destination:
+            return await b2b.async_flightlistbyaerodrome(
+                client, origin, "GLOBAL", start=start, stop=stop
+            )
+        elif origin:
+            return await b2b.async_flightlistbyaerodrome(
+                client, origin, "DEPARTURE", start=start, stop=stop
+            )
+        elif destination:
+            return await b2b.async_flightlistbyaerodrome(
+                client, destination, "ARRIVAL", start=start, stop=stop
+            )
+        elif self.airspace:
+            return await b2b.async_flightlistbyairspace(
+                client, self.airspace, start=start, stop=stop
+            )
+        elif self.regulation:
+            return await b2b.async_flightlistbymeasure(
+                client, regulation=self.regulation, start=start, stop=stop
+            )
+        return None
+
+
+# -- Cache --
+
+
+class RetrievalCache:
+    """A LRU cache of flight retrievals, with a time to live.
+
+    Entries are the tasks fetching the retrievals, so that a flight
+    requested while it is being prefetched is only fetched once. Failed
+    fetches are not kept.
+
+    :param maxsize: the maximum number of flights in the cache
+    :param ttl: the time to live of an entry, in seconds
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[
+            FlightKeys, tuple[float, asyncio.Task[FlightRetrieval]]
+        ] = OrderedDict()
+
+    def __contains__(self, keys: FlightKeys) -> bool:
+        if (entry := self._entries.get(keys)) is None:
+            return False
+        return time.monotonic() - entry[0] < self.ttl
+
+    def get(
+        self,
+        keys: FlightKeys,
+        fetch: Callable[[], Awaitable[FlightRetrieval]],
+    ) -> asyncio.Task[FlightRetrieval]:
+        """Returns the task fetching a flight, starting it if needed."""
+        if keys in self:
+            self._entries.move_to_end(keys)
+            return self._entries[keys][1]
+
+        task = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda task: self._discard(keys, task))
+        self._entries[keys] = (time.monotonic(), task)
+        self._entries.move_to_end(keys)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return task
+
+    def _discard(
+        self, keys: FlightKeys, task: asyncio.Task[FlightRetrieval]
+    ) -> None:
+        if not task.cancelled() and task.exception() is None:
+            return
+        if (entry := self._entries.get(keys)) is not None and entry[1] is task:
+            del self._entries[keys]
+
+
 # -- Widgets --
 
 
@@ -203,6 +434,91 @@ class Flight(VerticalScroll):
         self.focus()  # helps activating the Binding
 
 
+class _Page(NamedTuple):
+    """The placeholder for the next children of a node."""
+
+    value: dict[str, Any] | list[Any]
+    start: int
+
+
+class JSONTree(Tree[Any]):
+    """A tree view of a JSON reply, built lazily.
+
+    Nothing is built until the widget is displayed, and the children of
+    a node are only created when the node is expanded, by pages of
+    :attr:`page_size`. As the tree only renders the lines on screen, the
+    cost of the view does not depend on the size of the reply.
+    """
+
+    page_size = 100
+    highlighter = JSONHighlighter()
+
+    def __init__(self, id: None | str = None) -> None:
+        super().__init__("reply", id=id)
+        self.show_root = False
+        self._json: Any = None
+        self._dirty = False
+
+    def update_json(self, json: Any) -> None:
+        self._json = json
+        self._dirty = True
+        # The tab panes which are not active are not displayed
+        if all(
+            w.display for w in self.ancestors_with_self if isinstance(w, Widget)
+        ):
+            self.build()
+
+    def build(self) -> None:
+        """Builds the first level of the tree, if the reply changed."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.clear()
+        self.root.data = self._json
+        self.add_page(self.root, self._json, 0)
+        self.root.expand()
+
+    def label(self, key: Any, value: Any) -> Text:
+        if isinstance(value, dict):
+            return Text.assemble((f"{key}", "bold"), f" {{{len(value)}}}")
+        if isinstance(value, list):
+            return Text.assemble((f"{key}", "bold"), f" [{len(value)}]")
+        return Text.assemble(
+            (f"{key}", "bold"), ": ", self.highlighter(json.dumps(value))
+        )
+
+    def add_page(self, node: TreeNode[Any], value: Any, start: int) -> None:
+        items: Iterable[tuple[Any, Any]]
+        if isinstance(value, dict):
+            items = islice(value.items(), start, start + self.page_size)
+        elif isinstance(value, list):
+            items = enumerate(value[start : start + self.page_size], start)
+        else:
+            return
+        for key, child in items:
+            if isinstance(child, (dict, list)):
+                node.add(
+                    self.label(key, child), child, allow_expand=bool(child)
+                )
+            else:
+                node.add_leaf(self.label(key, child), child)
+        if (end := start + self.page_size) < len(value):
+            more = Text(f"… {len(value) - end} more", style="italic")
+            node.add_leaf(more, _Page(value, end))
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded[Any]) -> None:
+        node = event.node
+        if not node.children:
+            self.add_page(node, node.data, 0)
+
+    def on_tree_node_selected(self, event: Tree.NodeSelected[Any]) -> None:
+        node = event.node
+        if isinstance(page := node.data, _Page) and node.parent is not None:
+            parent = node.parent
+            node.remove()
+            self.add_page(parent, page.value, page.start)
+
+
 # -- Application --
 
 
@@ -210,14 +526,26 @@ class B2B(App[None]):
     CSS_PATH = "style.tcss"
     BINDINGS = [  # noqa: RUF012
         ("q", "quit", "Quit"),
-        ("r", "refresh", "Refresh"),  # TODO
+        ("r", "refresh", "Live"),
         ("/", "search", "Search"),
         Binding("escape", "escape", show=False),
         Binding("d", "show_debug", "Debug"),
     ]
 
+    #: Number of rows prefetched above and below the highlighted row
+    prefetch_neighbours = 1
+    #: Time the cursor must rest on a row before prefetching, in seconds
+    prefetch_delay = 0.3
+
+    #: Interval between two refreshes in live mode, in seconds
+    refresh_interval = 30
+
+    current_search: None | Search = None
+    refresh_timer: None | Timer = None
+
     def compose(self) -> ComposeResult:
         self.client = httpx.AsyncClient(verify=b2b.context)
+        self.retrievals = RetrievalCache()
         yield Header()
         yield Footer()
         with TabbedContent():
@@ -227,17 +555,14 @@ class B2B(App[None]):
             with TabPane("Flight", id="flight-pane"):
                 yield Flight()
             with TabPane("Debug", id="debug-pane"):
-                yield VerticalScroll(
-                    Static(id="results"), id="results-container"
-                )
+                yield JSONTree(id="results")
 
     def on_mount(self) -> None:
         self.title = "EUROCONTROL B2B"
         table = self.query_one(DataTable)
         table.cursor_type = "row"
-        table.add_columns(
-            "date", "callsign", "from", "to", "EOBT", "flightid", "status"
-        )
+        for column in flightplan_columns:
+            table.add_column(column, key=column)
         tabbed_content = self.query_one(TabbedContent)
         tabbed_content.hide_tab("debug-pane")
         self.query_one(Tabs).add_class("hidden")
@@ -250,92 +575,137 @@ class B2B(App[None]):
             await self.action_quit()
         self.query_one(DataTable).focus()
 
+    @on(TabbedContent.TabActivated, pane="#debug-pane")
+    def build_debug(self) -> None:
+        self.query_one(JSONTree).build()
+
     def action_show_debug(self) -> None:
         self.query_one(Tabs).remove_class("hidden")
         tabbed_content = self.query_one(TabbedContent)
         tabbed_content.show_tab("debug-pane")
         tabbed_content.active = "debug-pane"
 
+    def row_keys(self, table: DataTable[Any], row_index: int) -> FlightKeys:
+        columns = [c.label.plain for c in table.columns.values()]
+        line_info = dict(zip(columns, table.get_row_at(row_index)))
+        return FlightKeys(
+            pd.Timestamp(f"{line_info['date']} {line_info['EOBT']}"),
+            callsign=str(line_info["callsign"]),
+            origin=str(line_info["from"]),
+            destination=str(line_info["to"]),
+        )
+
+    def flightretrieval(
+        self, keys: FlightKeys
+    ) -> asyncio.Task[FlightRetrieval]:
+        return self.retrievals.get(
+            keys, lambda: b2b.async_flightretrieval(self.client, *keys)
+        )
+
+    def on_data_table_row_highlighted(
+        self, event: DataTable.RowHighlighted
+    ) -> None:
+        self.prefetch(event.data_table, event.cursor_row)
+
+    @work(exclusive=True, group="prefetch")
+    async def prefetch(self, table: DataTable[Any], row_index: int) -> None:
+        """Fetches the highlighted flight and its neighbours in advance.
+
+        Prefetching only starts when the cursor rests on a row, and flights
+        are fetched one at a time, so that browsing through the table does
+        not use up the request quotas.
+        """
+        await asyncio.sleep(self.prefetch_delay)
+        rows = [row_index]
+        for offset in range(1, self.prefetch_neighbours + 1):
+            rows.extend([row_index + offset, row_index - offset])
+
+        for row in rows:
+            if not 0 <= row < table.row_count:
+                continue
+            keys = self.row_keys(table, row)
+            if keys in self.retrievals:
+                continue
+            logging.info(f"Prefetch {keys}")
+            # The fetch goes on (and lands in the cache) if the cursor moves
+            try:
+                await asyncio.shield(self.flightretrieval(keys))
+            except Exception as e:
+                logging.info(f"Prefetch failed: {e}")
+
     async def on_data_table_row_selected(
         self, event: DataTable.RowSelected
     ) -> None:
-        columns = [c.label.plain for c in event.data_table.columns.values()]
-        line_info = dict(zip(columns, event.data_table.get_row(event.row_key)))
-        logging.info(f"Selected row {line_info}")
+        keys = self.row_keys(event.data_table, event.cursor_row)
+        logging.info(f"Selected row {keys}")
 
-        result = await b2b.async_flightretrieval(
-            self.client,
-            pd.Timestamp(f"{line_info['date']} {line_info['EOBT']}"),
-            callsign=line_info["callsign"],
-            origin=line_info["from"],
-            destination=line_info["to"],
-        )
+        result = await self.flightretrieval(keys)
         self.update_flight(result)
-        self.query_one("#results", Static).update(JSON(json.dumps(result.json)))
+        self.query_one(JSONTree).update_json(result.json)
 
     @on(Input.Submitted)
-    async def lookup_flightplanlist(self) -> None:
+    def lookup_flightplanlist(self) -> None:
         date = self.query_one("#input_date", Input)
-        start_str = date.value if date.value else "now"
-        start = pd.Timestamp(start_str)
-        stop = start + pd.Timedelta("1 day")
-
-        callsign = self.query_one("#input_callsign", Input).value
-        origin = self.query_one("#input_origin", Input).value
-        destination = self.query_one("#input_destination", Input).value
-        airspace = self.query_one("#input_airspace", Input).value
-        regulation = self.query_one("#input_regulation", Input).value
-        results: Union[
-            FlightPlanList,
-            FlightListByAirspace,
-            FlightListByAerodrome,
-            FlightListByMeasure,
-        ]
+        search = Search(
+            start=pd.Timestamp(date.value if date.value else "now"),
+            callsign=self.query_one("#input_callsign", Input).value,
+            origin=self.query_one("#input_origin", Input).value,
+            destination=self.query_one("#input_destination", Input).value,
+            airspace=self.query_one("#input_airspace", Input).value,
+            regulation=self.query_one("#input_regulation", Input).value,
+        )
+        self.search(search)
+
+    @work(exclusive=True, group="search")
+    async def search(self, search: Search) -> None:
+        """Runs a search, cancelling the one in progress (if any)."""
+        self.current_search = search
+        results = await search.fetch(self.client)
+        if results is None:
+            return
 
-        if callsign or origin and destination and origin != destination:
-            callsign = callsign if callsign else "*"
-            origin = origin if origin else "*"
-            destination = destination if destination else "*"
-            results = await b2b.async_flightplanlist(
-                self.client,
-                start=start,
-                stop=stop,
-                callsign=callsign,
-                origin=origin,
-                destination=destination,
-            )
-            self.update_with_flightplan(results)
-        elif origin and destination:
-            results = await b2b.async_flightlistbyaerodrome(
-                self.client, origin, "GLOBAL", start=start, stop=stop
-            )
-            self.update_with_flightlist(results)
-        elif origin:
-            results = await b2b.async_flightlistbyaerodrome(
-                self.client, origin, "DEPARTURE", start=start, stop=stop
-            )
-            self.update_with_flightlist(results)
-        elif destination:
-            results = await b2b.async_flightlistbyaerodrome(
-                self.client, destination, "ARRIVAL", start=start, stop=stop
-            )
-            self.update_with_flightlist(results)
-        elif airspace:
-            results = await b2b.async_flightlistbyairspace(
-                self.client, airspace, start=start, stop=stop
-            )
-            self.update_with_flightlist(results)
-        elif regulation:
-            results = await b2b.async_flightlistbymeasure(
-                self.client, regulation=regulation, start=start, stop=stop
-            )
-            self.update_with_flightlist(results)
+        if isinstance(results, FlightPlanList):
+            await self.update_with_flightplan(results)
         else:
-            return
+            await self.update_with_flightlist(results)
+
+        self.query_one(JSONTree).update_json(results.json)
 
-        self.query_one("#results", Static).update(
-            JSON(json.dumps(results.json))
+    def action_refresh(self) -> None:
+        """Toggles the live mode, where the current search is polled."""
+        if self.refresh_timer is not None:
+            self.refresh_timer.stop()
+            self.refresh_timer = None
+            self.sub_title = ""
+            self.notify("Live mode off")
+            return
+        self.refresh_timer = self.set_interval(
+            self.refresh_interval, self.refresh_search
         )
+        self.sub_title = "Live"
+        self.notify(f"Live mode on, refresh every {self.refresh_interval} s")
+
+    @work(exclusive=True, group="refresh")
+    async def refresh_search(self) -> None:
+        """Polls the current search, and updates the table in place."""
+        search = self.current_search
+        if search is None:
+            return
+        if any(w.group == "search" and w.is_running for w in self.workers):
+            return
+        results = await search.fetch(self.client)
+        if results is None or search is not self.current_search:
+            return
+
+        table = self.query_one(DataTable)
+        if isinstance(results, FlightPlanList):
+            rows = flightplan_rows(results)
+        else:
+            rows = flightlist_rows(results)
+        await self.diff_rows(table, rows)
+        self.sub_title = f"Live, updated {pd.Timestamp('now'):%H:%M:%S}"
+
+        self.query_one(JSONTree).update_json(results.json)
 
     def update_flight(self, flight: FlightRetrieval) -> None:
         self.query_one(Tabs).remove_class("hidden")
@@ -346,7 +716,58 @@ class B2B(App[None]):
         flight_content = self.query_one(Flight)
         flight_content.update_flight(flight)
 
-    def update_with_flightlist(
+    async def add_rows(
+        self, table: DataTable[Any], rows: Iterable[tuple[Any, ...]]
+    ) -> None:
+        """Adds rows to the table by chunks.
+
+        Rows are decoded lazily, and the event loop gets control back
+        after each chunk, so that the interface stays responsive (and the
+        search may be cancelled) while a large list is loading.
+        """
+        columns = [c.label.plain for c in table.ordered_columns]
+        idx = columns.index("flightid")
+        rows = iter(rows)
+        while chunk := list(islice(rows, chunk_size)):
+            for row in chunk:
+                # Rows are identified by flightId, for later refreshes
+                key = row[idx]
+                table.add_row(*row, key=key if key not in table.rows else None)
+            await asyncio.sleep(0)
+
+    async def diff_rows(
+        self, table: DataTable[Any], rows: Iterable[tuple[Any, ...]]
+    ) -> None:
+        """Updates the table with new rows, identified by flightId.
+
+        Only the cells which changed are updated, and highlighted until
+        the next refresh. Flights which disappeared are removed, and new
+        flights are added at the end of the table.
+        """
+        columns = [c.label.plain for c in table.ordered_columns]
+        idx = columns.index("flightid")
+        new_rows = {row[idx]: row for row in rows if row[idx] is not None}
+
+        for row_key in list(table.rows):
+            if row_key.value not in new_rows:
+                table.remove_row(row_key)
+        for count, (key, row) in enumerate(new_rows.items(), 1):
+            if key not in table.rows:
+                table.add_row(*row, key=key)
+                continue
+            for column, old, new in zip(columns, table.get_row(key), row):
+                if isinstance(old, Text):  # changed on the last refresh
+                    old = old.plain
+                    table.update_cell(key, column, old)
+                new = "" if new is None else str(new)
+                if new != ("" if old is None else str(old)):
+                    table.update_cell(
+                        key, column, Text(new, changed_style), update_width=True
+                    )
+            if count % chunk_size == 0:
+                await asyncio.sleep(0)
+
+    async def update_with_flightlist(
         self,
         flightlist: None
         | FlightListByAerodrome
@@ -356,93 +777,25 @@ class B2B(App[None]):
         table = self.query_one(DataTable)
 
         table.clear(columns=True)
-        table.add_columns(
-            "date",
-            "icao24",
-            "typecode",
-            "callsign",
-            "number",
-            "from",
-            "to",
-            "EOBT",
-            "flightid",
-            "regulation",
-        )
+        for column in flightlist_columns:
+            table.add_column(column, key=column)
         if flightlist is None:
             return None
 
-        if flightlist.json["data"] is None:
-            return None
-
-        def eobt(entry: FlightOrFlightPlan) -> str:
-            if flight_id := entry.get("flight", None):
-                return flight_id["flightId"]["keys"]["estimatedOffBlockTime"]
-            return ""
-
-        fpl_data = flightlist.json
-        s = fpl_data["data"]["flights"]
-        summaries: list[FlightOrFlightPlan] = s if isinstance(s, list) else [s]
-        summaries = sorted(summaries, key=eobt)
-
-        table.add_rows(
-            (
-                (
-                    f"{Time(eobt(entry)):%d %b %y}",
-                    flight.get("aircraftAddress", "").lower(),
-                    flight.get("aircraftType", None),
-                    flight["flightId"]["keys"]["aircraftId"],
-                    flight.get("iataFlightDesignator", {"id": ""})["id"],
-                    flight["flightId"]["keys"]["aerodromeOfDeparture"],
-                    flight["flightId"]["keys"]["aerodromeOfDestination"],
-                    f"{Time(eobt(entry)):%H:%MZ}",
-                    flight["flightId"].get("id", None),
-                    flight.get("mostPenalisingRegulation", None),
-                )
-                for entry in summaries
-                if (flight := entry.get("flight", None))
-            ),
-        )
+        await self.add_rows(table, flightlist_rows(flightlist))
 
-    def update_with_flightplan(
+    async def update_with_flightplan(
         self, flightplanlist: None | FlightPlanList
     ) -> None:
         table = self.query_one(DataTable)
 
         table.clear(columns=True)
-        table.add_columns(
-            "date", "callsign", "from", "to", "EOBT", "flightid", "status"
-        )
+        for column in flightplan_columns:
+            table.add_column(column, key=column)
         if flightplanlist is None:
             return None
 
-        if flightplanlist.json["data"] is None:
-            return None
-
-        def eobt(entry: FlightPlanOrInvalidFiling) -> str:
-            if lfvp := entry.get("lastValidFlightPlan", None):
-                return lfvp["id"]["keys"]["estimatedOffBlockTime"]
-            return ""
-
-        fpl_data = flightplanlist.json
-        s = fpl_data["data"]["summaries"]
-        summaries = s if isinstance(s, list) else [s]
-        summaries = sorted(summaries, key=eobt)
-
-        table.add_rows(
-            (
-                (
-                    f"{Time(eobt(entry)):%d %b %y}",
-                    lvfp["id"]["keys"]["aircraftId"],
-                    lvfp["id"]["keys"]["aerodromeOfDeparture"],
-                    lvfp["id"]["keys"]["aerodromeOfDestination"],
-                    f"{Time(eobt(entry)):%H:%MZ}",
-                    lvfp["id"]["id"],
-                    lvfp["status"],
-                )
-                for entry in summaries
-                if (lvfp := entry.get("lastValidFlightPlan", None))
-            ),
-        )
+        await self.add_rows(table, flightplan_rows(flightplanlist))
 
 
 def main() -> None:
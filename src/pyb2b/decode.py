@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+#: The shape of B2B timestamps, with optional seconds
+time_pattern = r"(19|20)\d{2}-\d{2}-\d{2} \d{2}:\d{2}(:\d{2})?"
+
+#: The shape of B2B durations, with optional sign and seconds
+duration_pattern = r"([+-]?)([0-9]{2})([0-9]{2})([0-9]{2})?"
+_duration = re.compile(duration_pattern)
+
+
+def decode_time(values: pd.Series | Iterable[Any]) -> pd.Series:
+    """Decodes timestamps as datetime64[ns, UTC].
+
+    B2B timestamps come as ``YYYY-MM-DD HH:MM`` or ``YYYY-MM-DD HH:MM:SS``
+    in UTC; missing or malformed values (e.g. SLOT_TIME_NOT_LIMITED) are
+    decoded as NaT.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    # Only values shaped as B2B timestamps are parsed: in ISO8601 mode, a
+    # duration such as "1200" would be read as a year, out of bounds for ns.
+    valid = series.astype("string").str.fullmatch(time_pattern, na=False)
+    parsed = pd.to_datetime(
+        series.where(valid), format="ISO8601", utc=True, errors="coerce"
+    )
+    return parsed.dt.as_unit("ns")
+
+
+def decode_duration(values: pd.Series | Iterable[Any]) -> pd.Series:
+    """Decodes durations as timedelta64[ns].
+
+    B2B durations come as ``HHMM`` or ``HHMMSS``, possibly signed (``-`` or
+    ``+`` prefix); missing or malformed values are decoded as NaT.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    # Checked on the whole values: the fixed-width strings below truncate
+    # longer ones, e.g. "12345678" would be read as 12:34:56.
+    valid = (
+        series.astype("string")
+        .str.fullmatch(duration_pattern, na=False)
+        .to_numpy(dtype=bool)
+    )
+    text = series.where(series.notna(), "").to_numpy(dtype="U7")
+    negative = np.char.startswith(text, "-")
+    text = np.char.lstrip(text, "+-").astype("U6")
+    length = np.char.str_len(text)
+    # the UCS4 code points of each string, padded with zeros
+    digits = text.view(np.uint32).reshape(-1, 6).astype(np.int64) - ord("0")
+    seconds = (
+        (digits[:, 0] * 10 + digits[:, 1]) * 3600
+        + (digits[:, 2] * 10 + digits[:, 3]) * 60
+        + np.where(length == 6, digits[:, 4] * 10 + digits[:, 5], 0)
+    )
+    result = np.where(negative, -seconds, seconds).astype("timedelta64[s]")
+    result[~valid] = np.timedelta64("NaT")
+    return pd.Series(
+        result.astype("timedelta64[ns]"), index=series.index, name=series.name
+    )
+
+
+def parse_duration(text: Any) -> pd.Timedelta:
+    """Decodes a single duration, as :func:`decode_duration` does.
+
+    Meant for scalar fields, without the cost of building arrays.
+    """
+    match = _duration.fullmatch(text) if isinstance(text, str) else None
+    if match is None:
+        return pd.NaT
+    sign, hours, minutes, seconds = match.groups()
+    duration = pd.Timedelta(
+        hours=int(hours), minutes=int(minutes), seconds=int(seconds or 0)
+    )
+    return -duration if sign == "-" else duration
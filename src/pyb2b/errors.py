@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types.generated.common import ReplyStatus
+
+#: Reply statuses meaning the request was rejected because of a quota or an
+#: overload of the NM systems: the same request may succeed later.
+QUOTA_STATUS: set[ReplyStatus] = {
+    "RESOURCE_OVERLOAD",
+    "REQUEST_COUNT_QUOTA_EXCEEDED",
+    "PARALLEL_REQUEST_COUNT_QUOTA_EXCEEDED",
+    "REQUEST_OVERBOOKING_REJECTED",
+    "BANDWIDTH_QUOTAS_EXCEEDED",
+}
+
+
+class ReplyError(RuntimeError):
+    """Raised when a B2B reply comes with a status other than OK."""
+
+    def __init__(self, status: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class QuotaExceeded(ReplyError):
+    """Raised when a request is rejected because of a quota or an overload."""
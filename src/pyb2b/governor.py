@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+from typing import Awaitable, Callable, TypeVar
+from weakref import WeakKeyDictionary
+
+import httpx
+
+from .errors import QuotaExceeded
+
+T = TypeVar("T")
+
+_log = logging.getLogger(__name__)
+
+
+class Governor:
+    """Adaptive limit on the number of concurrent asynchronous requests.
+
+    The limit grows additively (by one request per window of successful
+    requests) and is halved when NM rejects a request because of a quota.
+    Rejected requests are retried after a jittered exponential backoff.
+
+    The limit is shared, but requests are counted per event loop: each loop
+    using the governor (e.g. in different threads) may run up to ``limit``
+    concurrent requests.
+
+    :param initial: the initial number of concurrent requests
+    :param maximum: the number of concurrent requests never exceeded
+    :param retries: the number of retries for a rejected request
+    :param backoff: the base delay (in seconds) before a retry
+    :param max_backoff: the maximum delay (in seconds) before a retry
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        maximum: int = 32,
+        retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ) -> None:
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._epoch = 0
+        # asyncio primitives are bound to one event loop, but the same
+        # instance may be used by several loops, in turn or at once
+        self._lock = threading.Lock()
+        self._conditions: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Condition
+        ] = WeakKeyDictionary()
+        self._active: WeakKeyDictionary[asyncio.AbstractEventLoop, int] = (
+            WeakKeyDictionary()
+        )
+
+    @property
+    def active(self) -> int:
+        """The number of requests in progress, in all event loops."""
+        with self._lock:
+            return sum(self._active.values())
+
+    def _get_condition(
+        self,
+    ) -> tuple[asyncio.AbstractEventLoop, asyncio.Condition]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._conditions:
+                self._conditions[loop] = asyncio.Condition()
+                self._active[loop] = 0
+            return loop, self._conditions[loop]
+
+    async def acquire(self) -> int:
+        loop, condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(
+                lambda: self._active[loop] < int(self.limit)
+            )
+            self._active[loop] += 1
+            return self._epoch
+
+    async def release(self, epoch: int, success: None | bool) -> None:
+        """Frees a slot and adjusts the limit.
+
+        :param epoch: the value returned by :meth:`acquire`
+        :param success: True if the request succeeded, False if it was
+            rejected because of a quota, None if it failed for another reason.
+        """
+        loop, condition = self._get_condition()
+        async with condition:
+            self._active[loop] -= 1
+            if success:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif success is not None and epoch == self._epoch:
+                # only halve once for all requests sent with the former limit
+                self.limit = max(1.0, self.limit / 2)
+                self._epoch += 1
+                _log.info(f"Quota exceeded, limit set to {int(self.limit)}")
+            condition.notify_all()
+
+    def delay(self, attempt: int) -> float:
+        bound = min(self.max_backoff, self.backoff * 2**attempt)
+        return random.uniform(0, bound)
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Awaits func() within the limit, retries if it hits a quota."""
+        attempt = 0
+        while True:
+            epoch = await self.acquire()
+            success: None | bool = None
+            try:
+                result = await func()
+                success = True
+                return result
+            except QuotaExceeded:
+                success = False
+                if attempt >= self.retries:
+                    raise
+            except httpx.HTTPStatusError as error:
+                if error.response.status_code not in (429, 503):
+                    raise
+                success = False
+                if attempt >= self.retries:
+                    raise
+            finally:
+                await self.release(epoch, success)
+            await asyncio.sleep(self.delay(attempt))
+            attempt += 1
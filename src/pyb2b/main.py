@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
+import threading
 from pathlib import Path
-from typing import Any, ClassVar, Literal, TypedDict
-from xml.dom import minidom
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, TypedDict, overload
 from xml.etree import ElementTree
+from xml.parsers.expat import ExpatError
 
 import httpx
 import xmltodict
 
-from .auth.pkcs12 import create_ssl_context
+from .auth.pkcs12 import load_ssl_context
+from .errors import QUOTA_STATUS, QuotaExceeded, ReplyError
+from .governor import Governor
 from .services.airspace.structure.aixm_dataset import _AIXMDataset
 from .services.flight.management import (
     _FlightListByAerodrome,
@@ -20,7 +25,9 @@ from .services.flight.management import (
     _FlightRetrieval,
 )
 from .services.flow.measures.regulationlist import _RegulationList
-from .types.generated.common import Reply
+
+if TYPE_CHECKING:
+    from .types.generated.common import Reply
 
 
 class OperationMode(TypedDict):
@@ -69,88 +76,213 @@ class B2B(
         "file_url": base_ops + "FILE_OPS/gateway/spec/",
     }
 
+    #: Replies larger than this size (in bytes) are decoded in a worker
+    #: thread by :meth:`async_post`, so that the event loop is not blocked.
+    async_decode_size: ClassVar[int] = 1 << 18
+
     def __init__(
         self,
         mode: Literal["PREOPS", "OPS"],
         version: str,
         pkcs12_filename: str | Path,
         pkcs12_password: str,
+        *,
+        max_connections: int = 10,
     ) -> None:
         self.mode: OperationMode = getattr(self.__class__, mode)
         self.version = version
-        self.context = create_ssl_context(
-            Path(pkcs12_filename).read_bytes(),
-            pkcs12_password.encode(),
+        self.context = load_ssl_context(pkcs12_filename, pkcs12_password)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
         )
+        self._client: None | httpx.Client = None
+        self._client_pid: None | int = None
+        self._client_lock = threading.Lock()
+        self.governor = Governor()
+
+    @property
+    def client(self) -> httpx.Client:
+        """The keep-alive client used by synchronous calls.
+
+        The client is created on first use and shared between threads, so
+        that consecutive calls reuse the TLS connections of the pool. A forked
+        process gets its own client.
+        """
+        pid = os.getpid()
+        if self._client is None or self._client_pid != pid:
+            with self._client_lock:
+                if self._client is None or self._client_pid != pid:
+                    self._client = httpx.Client(
+                        verify=self.context, limits=self.limits
+                    )
+                    self._client_pid = pid
+        return self._client
+
+    def close(self) -> None:
+        """Closes the connections kept alive for synchronous calls."""
+        with self._client_lock:
+            if self._client is not None and self._client_pid == os.getpid():
+                self._client.close()
+            self._client = None
+            self._client_pid = None
+
+    def __enter__(self) -> B2B:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def decode_reply(self, res: httpx.Response) -> Reply:
+        """Decodes the XML content of a reply, in a single pass.
+
+        Errors are raised based on the status of the reply:
+
+        - INVALID_INPUT raises an AttributeError;
+        - statuses related to quotas raise a QuotaExceeded exception;
+        - any other status but OK raises a ReplyError.
+
+        """
+        content = res.content
+        # Fast path: the status comes right after the header of the reply
+        head = content[:1024]
+        idx = head.find(b"<status>")
+        if idx >= 0 and head.startswith(b"OK</status>", idx + 8):
+            return xmltodict.parse(content)  # type: ignore
 
-    def raise_xml_errors(self, res: httpx.Response) -> None:
         try:
-            tree = ElementTree.fromstring(res.content)
-        except ElementTree.ParseError:
-            print(res.content)
-            raise RuntimeError()
-
-        if tree is None:
-            raise RuntimeError("Unexpected error")
-        status = tree.find("status")
-        assert status is not None
-
-        if status.text == "INVALID_INPUT":
-            errors: list[str] = []
-            for error in tree.findall("inputValidationErrors"):
-                rough_string = ElementTree.tostring(error)
-                errors_dict: Reply = xmltodict.parse(rough_string)
-                invalid = errors_dict["inputValidationErrors"]
-                if isinstance(invalid, list):
-                    invalid = invalid[0]
-                _type = invalid["type"]
-                try:
-                    if invalid.get("parameters", None) is not None:
-                        parameters = invalid["parameters"]
-                except Exception:
-                    errors.clear()
-                    break
-                errors.append(f"{_type} {json.dumps(parameters, indent=2)}")
+            reply: dict[str, Any] = xmltodict.parse(content)
+        except ExpatError:
+            raise RuntimeError(f"Unexpected reply: {res.text}")
+
+        ((tag, body),) = reply.items()
+        status: None | str = body.get("status", None)
+        if status is None:
+            raise RuntimeError(f"Unexpected reply: {res.text}")
+
+        if status == "INVALID_INPUT":
+            invalid = body.get("inputValidationErrors", [])
+            if not isinstance(invalid, list):
+                invalid = [invalid]
+            errors = list(
+                f"{error.get('type', '')} "
+                f"{json.dumps(error.get('parameters', None), indent=2)}"
+                for error in invalid
+            )
             if len(errors) > 0:
-                raise AttributeError(tree.tag + " " + "\n".join(errors))
-
-        if status.text != "OK":
-            reason = tree.find("reason")
-            reason = None
-            if reason is not None:
-                raise RuntimeError(f"{tree.tag} {status.text}: {reason.text}")
-
-            # otherwise
-            rough_string = ElementTree.tostring(tree)
-            reparsed = minidom.parseString(rough_string)
-            raise RuntimeError(reparsed.toprettyxml(indent="  "))
-
-    def post(self, data: dict[str, Any]) -> Reply:
-        # TODO some pretty printing?
-        _log.debug(data)
-        _log.debug(xmltodict.unparse(data))
-        res = httpx.post(
+                raise AttributeError(tag + " " + "\n".join(errors))
+
+        if status != "OK":
+            exception: type[ReplyError] = ReplyError
+            if status in QUOTA_STATUS:
+                exception = QuotaExceeded
+            raise exception(
+                status, xmltodict.unparse(reply, pretty=True, indent="  ")
+            )
+
+        return reply  # type: ignore
+
+    def decode_element(self, res: httpx.Response) -> ElementTree.Element:
+        """Parses the XML content of a reply into an ElementTree.
+
+        Errors are raised as in :meth:`decode_reply`.
+        """
+        content = res.content
+        head = content[:1024]
+        idx = head.find(b"<status>")
+        if idx < 0 or not head.startswith(b"OK</status>", idx + 8):
+            self.decode_reply(res)  # raises if the status is not OK
+        return ElementTree.fromstring(content)
+
+    def raise_xml_errors(self, res: httpx.Response) -> None:
+        """Raises the errors reported in a reply, see :meth:`decode_reply`."""
+        self.decode_reply(res)
+
+    def encode(self, data: str | dict[str, Any]) -> bytes:
+        """Encodes a request, either a dictionary or a formatted XML string."""
+        if isinstance(data, str):
+            return data.encode()
+        content: str = xmltodict.unparse(data)
+        return content.encode()
+
+    @overload
+    def post(
+        self, data: str | dict[str, Any], *, element: Literal[False] = False
+    ) -> Reply: ...
+
+    @overload
+    def post(
+        self, data: str | dict[str, Any], *, element: Literal[True]
+    ) -> ElementTree.Element: ...
+
+    def post(
+        self, data: str | dict[str, Any], *, element: bool = False
+    ) -> Reply | ElementTree.Element:
+        """Posts a request.
+
+        :param data: the request, as a dictionary or a formatted XML string
+        :param element: if True, the reply is parsed as an ElementTree
+            rather than decoded into a dictionary.
+        """
+        content = self.encode(data)
+        _log.debug(content)
+        res = self.client.post(
             url=self.mode["post_url"] + self.version,
-            data=xmltodict.unparse(data).encode(),
+            content=content,
             headers={"Content-Type": "application/xml"},
-            verify=self.context,
         )
         res.raise_for_status()
-        self.raise_xml_errors(res)
-        return xmltodict.parse(res.content)  # type: ignore
+        if element:
+            return self.decode_element(res)
+        return self.decode_reply(res)
 
+    @overload
     async def async_post(
         self,
         client: httpx.AsyncClient,
-        data: dict[str, Any],
-    ) -> Reply:
-        request = httpx.Request(
-            "POST",
-            url=self.mode["post_url"] + self.version,
-            data=xmltodict.unparse(data).encode(),
-            headers={"Content-Type": "application/xml"},
-        )
-        res = await client.send(request)
-        res.raise_for_status()
-        self.raise_xml_errors(res)
-        return xmltodict.parse(res.content)  # type: ignore
+        data: str | dict[str, Any],
+        *,
+        element: Literal[False] = False,
+    ) -> Reply: ...
+
+    @overload
+    async def async_post(
+        self,
+        client: httpx.AsyncClient,
+        data: str | dict[str, Any],
+        *,
+        element: Literal[True],
+    ) -> ElementTree.Element: ...
+
+    async def async_post(
+        self,
+        client: httpx.AsyncClient,
+        data: str | dict[str, Any],
+        *,
+        element: bool = False,
+    ) -> Reply | ElementTree.Element:
+        """Posts a request within the limits set by the governor.
+
+        Requests rejected because of a quota (e.g.
+        PARALLEL_REQUEST_COUNT_QUOTA_EXCEEDED) are retried after a backoff,
+        and the number of concurrent requests is adjusted accordingly.
+
+        Parameters are the same as in :meth:`post`.
+        """
+        content = self.encode(data)
+
+        async def send() -> Reply | ElementTree.Element:
+            request = httpx.Request(
+                "POST",
+                url=self.mode["post_url"] + self.version,
+                content=content,
+                headers={"Content-Type": "application/xml"},
+            )
+            res = await client.send(request)
+            res.raise_for_status()
+            decode = self.decode_element if element else self.decode_reply
+            if len(res.content) > self.async_decode_size:
+                return await asyncio.to_thread(decode, res)
+            return decode(res)
+
+        return await self.governor.call(send)
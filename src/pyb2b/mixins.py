@@ -1,9 +1,19 @@
 from __future__ import annotations
 
 import json
+from functools import cached_property
 from numbers import Integral, Real
 from pathlib import Path
-from typing import Any, ClassVar, Generic, Type, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Generic,
+    Iterable,
+    Type,
+    TypeVar,
+)
+from xml.etree import ElementTree
 
 from rich.box import SIMPLE_HEAVY
 from rich.console import Console, ConsoleOptions, RenderResult
@@ -11,11 +21,14 @@ from rich.table import Table
 
 import pandas as pd
 
-from .types.generated.common import Reply
+if TYPE_CHECKING:
+    from .types.generated.common import Reply
+
 
 D = TypeVar("D", bound="DataFrameMixin")
+E = TypeVar("E", bound="ElementListMixin")
 J = TypeVar("J", bound="JSONMixin[Any]")
-T = TypeVar("T", bound=Reply)
+T = TypeVar("T", bound="Reply")
 
 
 class JSONMixin(Generic[T]):
@@ -49,8 +62,7 @@ class DataFrameMixin:
     _obfuscate: None | list[str] = None
 
     @property
-    def data(self) -> pd.DataFrame:
-        ...
+    def data(self) -> pd.DataFrame: ...
 
     def _repr_html_(self) -> None | str:
         return self.data._repr_html_()  # type: ignore
@@ -96,3 +108,96 @@ class DataFrameMixin:
         delta = self.data.shape[0] - self.max_rows
         if delta > 0:
             yield f"... ({delta} more entries)"
+
+
+class ElementListMixin(DataFrameMixin):
+    """A list of elements in an ElementTree reply, keyed by identifier.
+
+    Subclasses provide the path to the elements (relative to the reply),
+    the path to their identifier (relative to each element) and build_df().
+    """
+
+    elements_path: ClassVar[str]
+    key_path: ClassVar[str]
+
+    reply: ElementTree.Element
+
+    def __init__(self, data: None | pd.DataFrame = None) -> None:
+        if data is not None:
+            self.data = data
+
+    @classmethod
+    def fromB2BReply(cls: Type[E], r: Any) -> E:
+        assert r.reply is not None
+        return cls.fromET(r.reply)
+
+    @classmethod
+    def fromET(cls: Type[E], tree: ElementTree.Element) -> E:
+        instance = cls()
+        instance.reply = tree
+        instance.build_df()
+        return instance
+
+    def build_df(self) -> None:
+        raise NotImplementedError
+
+    @cached_property
+    def data(self) -> pd.DataFrame:
+        self.build_df()
+        return self.data
+
+    @cached_property
+    def _elements(self) -> dict[str, ElementTree.Element]:
+        """Elements by identifier, indexed in a single pass."""
+        elements: dict[str, ElementTree.Element] = {}
+        for elt in self.reply.iterfind(self.elements_path):
+            key = elt.findtext(self.key_path)
+            if key is not None:
+                elements.setdefault(key, elt)
+        return elements
+
+    def element(self, item: str) -> None | ElementTree.Element:
+        return self._elements.get(item)
+
+    def _ipython_key_completions_(self) -> set[str]:
+        return set(self._elements)
+
+    def take(self: E, ids: Iterable[str]) -> E:
+        """Returns a new list with the elements matching the identifiers.
+
+        Elements are kept in the order of ids; unknown identifiers (and
+        duplicates) are ignored.
+        """
+        return self._from_elements(
+            self.reply.tag,
+            (
+                self._elements[id_]
+                for id_ in dict.fromkeys(ids)
+                if id_ in self._elements
+            ),
+        )
+
+    @classmethod
+    def concat(cls: Type[E], lists: Iterable[E]) -> E:
+        """Merges lists into a new one.
+
+        If an identifier appears in several lists, the first element
+        prevails.
+        """
+        tag = "reply"
+        elements: dict[str, ElementTree.Element] = {}
+        for list_ in lists:
+            tag = list_.reply.tag
+            for key, elt in list_._elements.items():
+                elements.setdefault(key, elt)
+        return cls._from_elements(tag, elements.values())
+
+    @classmethod
+    def _from_elements(
+        cls: Type[E], tag: str, elements: Iterable[ElementTree.Element]
+    ) -> E:
+        reply = parent = ElementTree.Element(tag)
+        for name in cls.elements_path.split("/")[:-1]:
+            parent = ElementTree.SubElement(parent, name)
+        parent.extend(elements)
+        return cls.fromET(reply)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from appdirs import user_cache_dir
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .aixm import AIXMStore
+
+_log = logging.getLogger(__name__)
+
+cache_dir = Path(user_cache_dir("b2b"))
+
+
+class NavIndex:
+    """Coordinates of navigation points, for one AIRAC cycle.
+
+    Points are looked up by name, or by (airway, name) since the same name
+    may designate different points around the world. Names are only indexed
+    on their own when they are not ambiguous.
+
+    Coordinates are stored in compact NumPy arrays (float32), so that the
+    index is cheap to save, load and look up.
+    """
+
+    def __init__(
+        self,
+        names: np.ndarray,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        airway_routes: np.ndarray,
+        airway_names: np.ndarray,
+        airway_latitude: np.ndarray,
+        airway_longitude: np.ndarray,
+    ) -> None:
+        self.names = names
+        self.latitude = latitude
+        self.longitude = longitude
+        self.airway_routes = airway_routes
+        self.airway_names = airway_names
+        self.airway_latitude = airway_latitude
+        self.airway_longitude = airway_longitude
+        self._points = dict((name, i) for i, name in enumerate(names.tolist()))
+        self._airways = dict(
+            (key, i)
+            for i, key in enumerate(
+                zip(airway_routes.tolist(), airway_names.tolist())
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(
+        self, name: str, airway: None | str = None
+    ) -> None | tuple[float, float]:
+        """Returns the (latitude, longitude) of a point, or None.
+
+        :param name: the name of the point, e.g. a fix or a navaid
+        :param airway: the airway the point is reached by, if any
+        """
+        if airway is not None:
+            idx = self._airways.get((airway, name), None)
+            if idx is not None:
+                return (
+                    float(self.airway_latitude[idx]),
+                    float(self.airway_longitude[idx]),
+                )
+        idx = self._points.get(name, None)
+        if idx is not None:
+            return float(self.latitude[idx]), float(self.longitude[idx])
+        return None
+
+    @classmethod
+    def from_frames(
+        cls, points: pd.DataFrame, airways: pd.DataFrame
+    ) -> NavIndex:
+        """Builds the index from two tables.
+
+        :param points: a table with name, latitude and longitude columns
+        :param airways: a table with route, navaid, latitude and longitude
+            columns, with one line per point of each airway
+        """
+        # the same point may be listed twice (e.g. a VOR and its DME): only
+        # names with different coordinates are ambiguous
+        unique = points.drop_duplicates(
+            ["name", "latitude", "longitude"]
+        ).drop_duplicates("name", keep=False)
+        airways = airways.drop_duplicates(["route", "navaid"])
+        return cls(
+            names=unique.name.to_numpy(dtype=str),
+            latitude=unique.latitude.to_numpy(dtype=np.float32),
+            longitude=unique.longitude.to_numpy(dtype=np.float32),
+            airway_routes=airways.route.to_numpy(dtype=str),
+            airway_names=airways.navaid.to_numpy(dtype=str),
+            airway_latitude=airways.latitude.to_numpy(dtype=np.float32),
+            airway_longitude=airways.longitude.to_numpy(dtype=np.float32),
+        )
+
+    @classmethod
+    def from_aixm(cls, store: AIXMStore) -> NavIndex:
+        """Builds the index from the AIXM data ingested for an AIRAC cycle."""
+        return cls.from_frames(store.points(), store.airways())
+
+    @classmethod
+    def from_traffic(cls) -> NavIndex:
+        """Builds the index from the navaids and airways of traffic."""
+        from traffic.data import airways, navaids
+
+        return cls.from_frames(navaids.data, airways.data)
+
+    def to_file(self, filename: str | Path) -> None:
+        np.savez(
+            filename,
+            names=self.names,
+            latitude=self.latitude,
+            longitude=self.longitude,
+            airway_routes=self.airway_routes,
+            airway_names=self.airway_names,
+            airway_latitude=self.airway_latitude,
+            airway_longitude=self.airway_longitude,
+        )
+
+    @classmethod
+    def from_file(cls, filename: str | Path) -> NavIndex:
+        with np.load(filename) as content:
+            return cls(**dict(content.items()))
+
+    @classmethod
+    def load(cls, airac: None | str | pd.Timestamp = None) -> NavIndex:
+        """Returns the index for an AIRAC cycle (by default, the current one).
+
+        The index is built from the AIXM store of the cycle if it was
+        ingested, or else from the data of traffic. It is saved in the cache
+        directory and kept in memory for the rest of the session.
+
+        :param airac: an AIRAC cycle (e.g. "2401") or a timestamp
+        """
+        if airac is None or not (isinstance(airac, str) and len(airac) == 4):
+            from pitot.airac import airac_cycle
+
+            airac = airac_cycle(airac)
+        return _load(airac)
+
+
+@lru_cache()
+def _load(airac: str) -> NavIndex:
+    from .aixm import AIXMStore
+
+    store = AIXMStore.load(airac, cache_dir)
+    if store is None:
+        return _load_traffic()
+    path = cache_dir / f"navindex_{airac}.npz"
+    if path.exists():
+        return NavIndex.from_file(path)
+    _log.info(f"Build navigation index for AIRAC {airac}")
+    index = NavIndex.from_aixm(store)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index.to_file(path)
+    return index
+
+
+@lru_cache()
+def _load_traffic() -> NavIndex:
+    # traffic data does not follow AIRAC cycles, only traffic releases
+    path = cache_dir / f"navindex_traffic_{version('traffic')}.npz"
+    if path.exists():
+        return NavIndex.from_file(path)
+    _log.info("Build navigation index from traffic")
+    index = NavIndex.from_traffic()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index.to_file(path)
+    return index
@@ -1,4 +1,7 @@
 from .flight.management.flightplanlist import FlightPlanList
-from .flight.management.flightretrieval import FlightRetrieval
+from .flight.management.flightretrieval import (
+    FlightRetrieval,
+    FlightRetrievalList,
+)
 
-__all__ = ["FlightPlanList", "FlightRetrieval"]
+__all__ = ["FlightPlanList", "FlightRetrieval", "FlightRetrievalList"]
@@ -1,19 +1,61 @@
-import io
+from __future__ import annotations
+
+import asyncio
+import json
 import logging
 import re
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
 
 import httpx
-from pitot.airac import airac_cycle
 from tqdm.asyncio import tqdm
 
 import pandas as pd
 
-from ....types.generated.airspace import CompleteAIXMDatasetReply
-from ....types.generated.common import File
+if TYPE_CHECKING:
+    from ....types.generated.airspace import CompleteAIXMDatasetReply
+    from ....types.generated.common import File
+
 
 _log = logging.getLogger(__name__)
 
+#: Size of the chunks written to disk while downloading AIXM files
+chunk_size = 1 << 16
+
+
+class Manifest(TypedDict):
+    """The version of the AIXM dataset of an AIRAC cycle available on disk."""
+
+    airac: str
+    updateId: str
+    files: dict[str, File]
+
+
+def local_path(file: File, output_dir: Path) -> Path:
+    return output_dir / file["id"].split("/")[-1]
+
+
+def partial_path(path: Path) -> Path:
+    return path.with_name(path.name + ".part")
+
+
+def manifest_path(airac_id: str, output_dir: Path) -> Path:
+    return output_dir / f"aixm_{airac_id}.json"
+
+
+def read_manifest(path: Path) -> None | Manifest:
+    if not path.exists():
+        return None
+    manifest: Manifest = json.loads(path.read_text())
+    return manifest
+
+
+def write_manifest(path: Path, manifest: Manifest) -> None:
+    tmp = partial_path(path)
+    tmp.write_text(json.dumps(manifest, indent=2))
+    tmp.replace(path)
+
 
 class _AIXMDataset:
     async def _async_file_get(
@@ -21,41 +63,134 @@ class _AIXMDataset:
         client: httpx.AsyncClient,
         file: File,
         output_dir: str | Path,
+        progress: None | tqdm = None,
+        timeout: None | float = 60,
     ) -> None:
-        buffer = io.BytesIO()
-        output_dir = Path(output_dir)
-        path = output_dir / Path(file["id"].split("/")[-1])
-        if path.exists():
+        """Downloads a file, streamed to disk.
+
+        Chunks are appended to a temporary .part file, which is renamed once
+        its size matches the fileLength of the file. If the download is
+        interrupted, the next call resumes it with a HTTP Range request. A
+        .part file the server has nothing to add to (416) is renamed if the
+        server reports the same size, or downloaded again.
+
+        :param progress: a progress bar shared with other downloads, which
+            already accounts for the bytes of the .part file. By default, a
+            progress bar is displayed for this file only.
+        :param timeout: the timeout (in seconds) of network operations
+        """
+        path = local_path(file, Path(output_dir))
+        partial = partial_path(path)
+        total = int(file["fileLength"]) if "fileLength" in file else None
+        if path.exists() and (total is None or path.stat().st_size == total):
             return
 
+        offset = partial.stat().st_size if partial.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+        if total is not None and offset >= total:
+            headers = {}  # stale or corrupted, start over
+        restart = False
         async with client.stream(
             "GET",
             url=self.mode["file_url"] + file["id"],  # type: ignore
+            headers=headers,
+            timeout=timeout,
         ) as response:
-            total = int(file["fileLength"])
-            async for chunk in tqdm(
-                response.aiter_bytes(1024),
-                total=total // 1024 + 1 if total % 1024 > 0 else 0,
-                desc=path.stem,
-            ):
-                buffer.write(chunk)
+            if response.status_code == 416 and offset > 0:
+                # nothing after the offset: the .part file is complete if the
+                # server reports the same size, stale otherwise
+                content_range = response.headers.get("Content-Range")
+                restart = content_range != f"bytes */{offset}"
+            else:
+                response.raise_for_status()
+                with (
+                    partial.open("ab" if offset > 0 else "wb") as fh,
+                    tqdm(
+                        total=total,
+                        initial=offset,
+                        unit="B",
+                        unit_scale=True,
+                        desc=path.stem,
+                    )
+                    if progress is None
+                    else nullcontext(progress) as bar,
+                ):
+                    if response.status_code != 206:  # Range not supported
+                        fh.truncate(0)
+                        bar.update(-offset)
+                        offset = 0
+                    _log.info(f"download {path} from byte {offset}")
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        fh.write(chunk)
+                        bar.update(len(chunk))
 
-        buffer.seek(0)
+        if restart:
+            _log.info(f"restart {path}")
+            partial.unlink()
+            if progress is not None:
+                progress.update(-offset)
+            return await self._async_file_get(
+                client, file, output_dir, progress, timeout
+            )
 
+        size = partial.stat().st_size
+        if total is not None and size != total:
+            raise RuntimeError(
+                f"Incomplete download of {path}: {size} bytes out of {total}"
+            )
         _log.info(f"write {path}")
-        path.write_bytes(buffer.getvalue())
+        partial.replace(path)
+
+    async def _async_file_retry(
+        self,
+        client: httpx.AsyncClient,
+        file: File,
+        output_dir: Path,
+        progress: tqdm,
+        semaphore: asyncio.Semaphore,
+        retries: int,
+        timeout: None | float,
+    ) -> None:
+        """Downloads a file, resuming it after network errors."""
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    return await self._async_file_get(
+                        client, file, output_dir, progress, timeout
+                    )
+                except httpx.TransportError as error:
+                    if attempt == retries:
+                        raise
+                    delay = self.governor.delay(attempt)  # type: ignore
+                    _log.warning(
+                        f"{error!r} for {file['id']}, resume in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
 
     async def async_aixm_request(
         self,
         client: httpx.AsyncClient,
         airac_id: str | int | pd.Timestamp,
         output_dir: str | Path,
-    ) -> None:
+        jobs: int = 2,
+        retries: int = 5,
+        timeout: None | float = 60,
+    ) -> Manifest:
         """
         Downloads the EUROCONTROL data files following the AIXM standard.
 
         :param airac_id: the AIRAC cycle, e.g. 2201 (1st cycle of 2022)
         :param output_dir: where to download the data.
+        :param jobs: the number of files downloaded concurrently
+        :param retries: the number of times a download is resumed after a
+            network error (e.g. a timeout or a dropped connection)
+        :param timeout: the timeout (in seconds) of network operations
+
+        Downloads are incremental: a manifest of the files on disk is kept
+        for each AIRAC cycle, so that only new or changed files are
+        downloaded, and files superseded by a newer updateId are removed.
+
+        Returns the manifest of the files on disk.
 
         **See also**: :ref:`How to configure EUROCONTROL data files?`
         """
@@ -67,6 +202,8 @@ class _AIXMDataset:
         if isinstance(airac_id, str) and not re.match(r"\d{4}", airac_id):
             airac_id = pd.Timestamp(airac_id, tz="utc")
         if isinstance(airac_id, pd.Timestamp):
+            from pitot.airac import airac_cycle
+
             airac_id = airac_cycle(airac_id)
         assert isinstance(airac_id, str)
 
@@ -91,7 +228,81 @@ class _AIXMDataset:
         entry = max(summaries, key=lambda x: x["updateId"])
         files = entry["files"]
         assert isinstance(files, list)
-        # don't do asyncio.gather (ReadTimeout)
+
+        output_dir = Path(output_dir)
+        manifest_file = manifest_path(airac_id, output_dir)
+        current = dict((file["id"], file) for file in files)
+        previous = read_manifest(manifest_file)
+        if previous is not None:
+            for id_, file in previous["files"].items():
+                if current.get(id_) != file:  # superseded or changed
+                    path = local_path(file, output_dir)
+                    _log.info(f"remove {path}")
+                    path.unlink(missing_ok=True)
+                    partial_path(path).unlink(missing_ok=True)
+
+        todo = [
+            file
+            for file in files
+            if previous is None
+            or previous["files"].get(file["id"]) != file
+            or not local_path(file, output_dir).exists()
+        ]
+        _log.info(f"update {entry['updateId']}: {len(todo)} file(s) to get")
+
+        downloaded = 0
         for file in files:
-            await self._async_file_get(client, file, output_dir)
-        return
+            path = local_path(file, output_dir)
+            if path.exists():
+                downloaded += path.stat().st_size
+            elif partial_path(path).exists():
+                downloaded += partial_path(path).stat().st_size
+
+        semaphore = asyncio.Semaphore(jobs)
+        with tqdm(
+            total=sum(int(file.get("fileLength", 0)) for file in files),
+            initial=downloaded,
+            unit="B",
+            unit_scale=True,
+            desc=f"AIRAC {airac_id}",
+        ) as progress:
+            results = await asyncio.gather(
+                *(
+                    self._async_file_retry(
+                        client,
+                        file,
+                        output_dir,
+                        progress,
+                        semaphore,
+                        retries,
+                        timeout,
+                    )
+                    for file in todo
+                ),
+                return_exceptions=True,
+            )
+
+        errors = [
+            (file["id"], result)
+            for file, result in zip(todo, results)
+            if isinstance(result, BaseException)
+        ]
+        failed = set(id_ for id_, _ in errors)
+        manifest = Manifest(
+            airac=airac_id,
+            updateId=entry["updateId"],
+            files=dict(
+                (id_, file)
+                for id_, file in current.items()
+                if id_ not in failed
+            ),
+        )
+        write_manifest(manifest_file, manifest)
+        for id_, error in errors:
+            _log.error(f"Failed to download {id_}: {error!r}")
+        if len(errors) > 0:
+            raise RuntimeError(
+                f"{len(errors)} file(s) could not be downloaded, run again "
+                "to resume"
+            ) from errors[0][1]
+        return manifest
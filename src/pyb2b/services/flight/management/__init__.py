@@ -2,14 +2,23 @@ from .flightlistbyaerodrome import FlightListByAerodrome, _FlightListByAerodrome
 from .flightlistbyairspace import FlightListByAirspace, _FlightListByAirspace
 from .flightlistbymeasure import FlightListByMeasure, _FlightListByMeasure
 from .flightplanlist import FlightPlanList, _FlightPlanList
-from .flightretrieval import FlightRetrieval, _FlightRetrieval
+from .flightretrieval import (
+    FlightKeys,
+    FlightRetrieval,
+    FlightRetrievalList,
+    _FlightRetrieval,
+)
+from .profiles import ProfileBatch
 
 __all__ = [
+    "FlightKeys",
     "FlightListByAerodrome",
     "FlightListByAirspace",
     "FlightListByMeasure",
     "FlightPlanList",
     "FlightRetrieval",
+    "FlightRetrievalList",
+    "ProfileBatch",
     "_FlightListByAerodrome",
     "_FlightListByAirspace",
     "_FlightListByMeasure",
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, ClassVar, Iterator
+
+import pandas as pd
+
+from ....decode import decode_duration, decode_time
+from ....mixins import DataFrameMixin
+
+if TYPE_CHECKING:
+    from ....types.generated.flight import FlightOrFlightPlan
+
+#: Columns renamed for consistency with FlightPlanList.data
+rename_cols = {
+    "aircraftId": "callsign",
+    "aerodromeOfDeparture": "origin",
+    "aerodromeOfDestination": "destination",
+    "estimatedOffBlockTime": "EOBT",
+}
+
+#: Fields decoded as durations (some of them end with Time): all the fields
+#: typed as Duration* in the generated types (a test checks it), except for
+#: the too generic ShiftHourMinute.value
+duration_fields = {
+    "afterCTO",
+    "arrivalTaxiTime",
+    "beforeCTO",
+    "currentlyUsedTaxiTime",
+    "delay",
+    "deltaDelay",
+    "duration",
+    "elapsedTime",
+    "estimatedElapsedTime",
+    "fuelEndurance",
+    "minimumTurnaroundTime",
+    "newRouteMinShiftDelayImprovement",
+    "occupancyDuration",
+    "revisedTaxiTime",
+    "step",
+    "taxiTime",
+    "timeToInsertInSequence",
+    "timeToRemoveFromSequence",
+    "totalEstimatedElapsedTime",
+}
+
+
+def _flatten(entry: dict[str, Any], prefix: str = "") -> Iterator[Any]:
+    for key, value in entry.items():
+        if key.startswith("@"):  # XML attributes
+            continue
+        if isinstance(value, dict):
+            yield from _flatten(value, prefix + key + ".")
+        else:
+            yield prefix + key, value
+
+
+def flight_record(entry: FlightOrFlightPlan) -> None | dict[str, Any]:
+    """Flattens a FlightOrFlightPlan entry into a single level dictionary.
+
+    The keys of the flight are inlined; nested fields are named after their
+    path, e.g. ``requestedFlightLevel.level``.
+    """
+    flight: Any = entry.get("flight", None)
+    if flight is not None:
+        flight_id = flight.get("flightId", {})
+    else:
+        plan = entry.get("flightPlan", None) or {}
+        if (flight := plan.get("lastValidFlightPlan", None)) is None:
+            return None
+        flight_id = flight.get("id", {})
+    fields = dict(
+        (key, value)
+        for key, value in flight.items()
+        if key not in ("flightId", "id")
+    )
+    return {
+        "flightId": flight_id.get("id", None),
+        **flight_id.get("keys", {}),
+        **dict(_flatten(fields)),
+    }
+
+
+def flight_table(entries: list[FlightOrFlightPlan]) -> pd.DataFrame:
+    """Converts the flights of a flight list reply into a typed table.
+
+    - all timestamps (fields ending with ``Time``) are datetime64[ns, UTC];
+    - durations (taxi time, delay, etc.) are timedelta64[ns];
+    - aerodromes and types (aircraft type, states, categories) are
+      categoricals;
+    - other fields are nullable strings (lists are left as objects).
+    """
+    records = list(
+        record
+        for entry in entries
+        if (record := flight_record(entry)) is not None
+    )
+    data = pd.DataFrame.from_records(records)
+    columns: dict[str, pd.Series] = {}
+    for name, column in data.items():
+        assert isinstance(name, str)
+        field = name.split(".")[-1]
+        if column.map(lambda x: isinstance(x, list)).any():
+            continue
+        if field in duration_fields:
+            columns[name] = decode_duration(column)
+        elif field.endswith("Time"):
+            columns[name] = decode_time(column)
+        elif "erodrome" in field or field.endswith(
+            ("Type", "Category", "State", "Status")
+        ):
+            columns[name] = column.astype("category")
+        else:
+            columns[name] = column.astype("string")
+    return data.assign(**columns).rename(columns=rename_cols)
+
+
+class FlightListMixin(DataFrameMixin):
+    """Provides a table view over the flights of a flight list reply."""
+
+    json: Any
+
+    columns_options: ClassVar[None | dict[str, dict[str, Any]]] = dict(
+        flightId=dict(style="blue bold"),
+        callsign=dict(),
+        aircraftType=dict(),
+        origin=dict(),
+        destination=dict(),
+        EOBT=dict(),
+        mostPenalisingRegulation=dict(),
+    )
+
+    @cached_property
+    def data(self) -> pd.DataFrame:
+        """The flights in the list, one per line, sorted by EOBT.
+
+        The table is built on first access, then cached.
+        """
+        data = self.json.get("data", None) or {}
+        flights = data.get("flights", [])
+        table = flight_table(
+            flights if isinstance(flights, list) else [flights]
+        )
+        if "EOBT" not in table.columns:
+            return table
+        return table.sort_values(
+            "EOBT", kind="stable", na_position="first", ignore_index=True
+        )
@@ -1,6 +1,54 @@
+from __future__ import annotations
+
+import re
+import textwrap
+import warnings
+from pathlib import Path
+from typing import Any, Callable, NoReturn, cast
+from xml.dom import minidom
+from xml.etree import ElementTree
+
+import pandas as pd
+
+from ....decode import decode_duration, decode_time, parse_duration
+from ....mixins import ElementListMixin
+from ....navigation import NavIndex
+from .columnar import duration_fields
+
+rename_cols = {
+    "aircraftId": "callsign",
+    "aircraftType": "typecode",
+    "aircraftAddress": "icao24",
+    "aerodromeOfDeparture": "origin",
+    "aerodromeOfDestination": "destination",
+    "estimatedOffBlockTime": "EOBT",
+    "calculatedOffBlockTime": "COBT",
+    "actualOffBlockTime": "AOBT",
+    "estimatedTakeOffTime": "ETOT",
+    "calculatedTakeOffTime": "CTOT",
+    "actualTakeOffTime": "ATOT",
+    "estimatedTimeOfArrival": "ETOA",
+    "calculatedTimeOfArrival": "CTOA",
+    "actualTimeOfArrival": "ATOA",
+}
+
+
 class ParseFields:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        index: None | NavIndex = None,
+        airac: None | str | pd.Timestamp = None,
+    ) -> None:
         self.route: None | str = None
+        self.airac = airac
+        self._index = index
+
+    @property
+    def index(self) -> NavIndex:
+        # only loaded when a published point is met
+        if self._index is None:
+            self._index = NavIndex.load(self.airac)
+        return self._index
 
     def parse(self, elt: ElementTree.Element) -> dict[str, Any]:
         if ("Time" in elt.tag or "time" in elt.tag) and elt.text is not None:
@@ -59,19 +107,11 @@ class ParseFields:
 
     def point(self, point: ElementTree.Element) -> dict[str, Any]:
         pointId = point.find("pointId")
-        if pointId is not None:
-            from traffic.data import airways, navaids
-
+        if pointId is not None and pointId.text is not None:
             rep: dict[str, Any] = {"FIX": pointId.text}
-            if self.route is not None:
-                airway = airways[self.route]
-                if airway is not None:
-                    nx = navaids.extent(airway)
-                    if nx is not None:
-                        fix = nx[pointId.text]
-                        if fix is not None:
-                            rep["latitude"] = fix.latitude
-                            rep["longitude"] = fix.longitude
+            coords = self.index.get(pointId.text, self.route)
+            if coords is not None:
+                rep["latitude"], rep["longitude"] = coords
             return rep
         dbePoint = point.find("nonPublishedPoint-DBEPoint")
         if dbePoint is not None:
@@ -97,12 +137,66 @@ class ParseFields:
         return self.unknown(point)
 
 
+def _decode_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    """Decodes times and durations of a tag→text mapping, in place."""
+    for name, text in fields.items():
+        if name in duration_fields:
+            fields[name] = parse_duration(text)
+        elif "Time" in name or "time" in name:
+            try:
+                fields[name] = pd.Timestamp(text, tz="utc")
+            except ValueError:  # e.g. SLOT_TIME_NOT_LIMITED
+                fields[name] = pd.NaT
+    return fields
+
+
 class FlightInfo:
+    """A flight element of a B2B reply.
+
+    Simple fields (directly under the flight element or under
+    flightId/keys) are available as attributes. They are indexed, and times
+    and durations decoded, only once, on first access.
+    """
+
+    __slots__ = ("_fields", "reply")
+
+    def __init__(self, reply: ElementTree.Element) -> None:
+        self.reply = reply
+        self._fields: None | dict[str, Any] = None
+
+    @classmethod
+    def fromET(cls, tree: ElementTree.Element) -> "FlightInfo":
+        return cls(tree)
+
     @classmethod
     def from_file(cls, filename: str) -> "FlightInfo":
         et = ElementTree.parse(filename)
         return cls.fromET(et.getroot())
 
+    @property
+    def fields(self) -> dict[str, Any]:
+        """The tag→value index of simple fields."""
+        if self._fields is None:
+            fields: dict[str, Any] = {}
+            flight_id = self.reply.find("flightId")
+            if flight_id is not None:
+                fields.update(
+                    (p.tag, p.text)
+                    for p in flight_id.iterfind("keys/*")
+                    if p.text is not None
+                )
+                id_ = flight_id.findtext("id")
+                if id_ is not None:
+                    fields["flightId"] = id_
+            # reversed, so that the first occurrence of a tag prevails
+            fields.update(
+                (p.tag, p.text)
+                for p in reversed(self.reply)
+                if p.text is not None and len(p) == 0
+            )
+            self._fields = _decode_fields(fields)
+        return self._fields
+
     def to_xml(self, filename: None | str | Path = None) -> None:
         if isinstance(filename, str):
             filepath = Path(filename)
@@ -132,11 +226,7 @@ class FlightInfo:
 
     @property
     def flight_id(self) -> str:
-        assert self.reply is not None
-        elt = self.reply.find("flightId/id")
-        assert elt is not None
-        assert elt.text is not None
-        return elt.text
+        return self.fields["flightId"]  # type: ignore
 
     @property
     def flight_plan(self) -> Any:
@@ -151,15 +241,13 @@ class FlightInfo:
 
     @property
     def callsign(self) -> None | str:
-        if hasattr(self, "aircraftId"):
-            return self.aircraftId
-        return None
+        callsign: None | str = self.fields.get("aircraftId")
+        return callsign
 
     @property
     def icao24(self) -> None | str:
-        if hasattr(self, "aircraftAddress"):
-            return self.aircraftAddress.lower()
-        return None
+        address: None | str = self.fields.get("aircraftAddress")
+        return address.lower() if address is not None else None
 
     def _repr_html_(self) -> str:
         from traffic.core.mixins import _HBox
@@ -205,16 +293,10 @@ class FlightInfo:
             + cast(str, _HBox(*cumul)._repr_html_())
         )
 
-    def __getattr__(self, name: str) -> str | pd.Timestamp:
+    def __getattr__(self, name: str) -> Any:
         cls = type(self)
-        assert self.reply is not None
-        elt = self.reply.find(name)
-        if elt is None:
-            elt = self.reply.find("flightId/keys/" + name)
-        if elt is not None and elt.text is not None:
-            if "Time" in name or "time" in name:
-                return pd.Timestamp(elt.text, tz="utc")
-            return elt.text
+        if not name.startswith("_") and name in self.fields:
+            return self.fields[name]
         msg = "{.__name__!r} object has no attribute {!r}"
         raise AttributeError(msg.format(cls, name))
 
@@ -225,12 +307,11 @@ class FlightInfo:
         :param name: one of ftfmPointProfile, rtfmPointProfile, ctfmPointProfile
 
         """
-        assert self.reply is not None
         msg = "No {} found in requested fields"
         if self.reply.find(name) is None:
             warnings.warn(msg.format(name))
             return None
-        parser = ParseFields()
+        parser = ParseFields(airac=self.estimatedOffBlockTime)
         return (
             pd.DataFrame.from_records(
                 [
@@ -254,11 +335,10 @@ class FlightInfo:
         )
 
 
-# https://github.com/python/mypy/issues/2511
-FlightListTypeVar = TypeVar("FlightListTypeVar", bound="FlightList")
-
+class FlightList(ElementListMixin):
+    elements_path = "data/flights/flight"
+    key_path = "flightId/id"
 
-class FlightList(DataFrameMixin):
     columns_options = dict(
         flightId=dict(style="blue bold"),
         callsign=dict(),
@@ -269,38 +349,9 @@ class FlightList(DataFrameMixin):
         EOBT=dict(),
     )
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        if len(args) == 0 and "data" not in kwargs:
-            super().__init__(data=None, **kwargs)
-        else:
-            super().__init__(*args, **kwargs)
-
-    @classmethod
-    def fromB2BReply(cls: Type[FlightListTypeVar], r) -> FlightListTypeVar:
-        assert r.reply is not None
-        return cls.fromET(r.reply)
-
-    @classmethod
-    def fromET(
-        cls: Type[FlightListTypeVar], tree: ElementTree.Element
-    ) -> FlightListTypeVar:
-        instance = cls()
-        instance.reply = tree
-        instance.build_df()
-        return instance
-
     def __getitem__(self, item: str) -> None | FlightInfo:
-        assert self.reply is not None
-        for elt in self.reply.findall("data/flights/flight"):
-            key = elt.find("flightId/id")
-            assert key is not None
-            if key.text == item:
-                return FlightInfo.fromET(elt)
-
-        return None
-
-    def _ipython_key_completions_(self) -> set[str]:
-        return set(self.data.flightId.unique())
+        elt = self.element(item)
+        return FlightInfo.fromET(elt) if elt is not None else None
 
     def build_df(self) -> None:
         assert self.reply is not None
@@ -355,29 +406,12 @@ class FlightList(DataFrameMixin):
             "ETOT",
         ]:
             if feat in self.data.columns:
-                self.data = self.data.assign(
-                    **{
-                        feat: self.data[feat].apply(
-                            lambda x: pd.Timestamp(x, tz="utc")
-                        )
-                    }
-                )
+                self.data[feat] = decode_time(self.data[feat])
 
         for feat in ["currentlyUsedTaxiTime", "taxiTime", "delay"]:
             if feat in self.data.columns:
-                self.data = self.data.assign(
-                    **{
-                        feat: self.data[feat].apply(
-                            lambda x: pd.Timedelta(
-                                f"{x[:2]} hours {x[2:4]} minutes "
-                                + f"{x[4:6]} seconds"
-                                if feat == "currentlyUsedTaxiTime"
-                                else ""
-                            )
-                            if x == x
-                            else pd.Timedelta("0")
-                        )
-                    }
+                self.data[feat] = decode_duration(self.data[feat]).fillna(
+                    pd.Timedelta(0)
                 )
 
         if "icao24" in self.data.columns:
@@ -1,23 +1,30 @@
-from typing import TypedDict
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypedDict
 
 import httpx
 
 import pandas as pd
 
-from ....mixins import DataFrameMixin, JSONMixin
-from ....types.generated.airspace import AerodromeICAOId
-from ....types.generated.flight import (
-    AerodromeRole,
-    FlightField,
-    FlightListByAerodromeReply,
-    FlightListByAerodromeRequest,
-)
+from ....mixins import JSONMixin
+from .columnar import FlightListMixin
+from .split import async_split_window, merge, split_window, time_window
+
+if TYPE_CHECKING:
+    from ....types.generated.airspace import AerodromeICAOId
+    from ....types.generated.flight import (
+        AerodromeRole,
+        FlightField,
+        FlightListByAerodromeReply,
+        FlightListByAerodromeRequest,
+    )
 
 Request = TypedDict(
-    "Request", {"fl:FlightListByAerodromeRequest": FlightListByAerodromeRequest}
+    "Request",
+    {"fl:FlightListByAerodromeRequest": "FlightListByAerodromeRequest"},
 )
 Reply = TypedDict(
-    "Reply", {"fl:FlightListByAerodromeReply": FlightListByAerodromeReply}
+    "Reply", {"fl:FlightListByAerodromeReply": "FlightListByAerodromeReply"}
 )
 
 default_fields: list[FlightField] = [
@@ -40,7 +47,7 @@ default_fields: list[FlightField] = [
 
 
 class FlightListByAerodrome(
-    DataFrameMixin, JSONMixin[FlightListByAerodromeReply]
+    FlightListMixin, JSONMixin["FlightListByAerodromeReply"]
 ):
     ...
 
@@ -55,6 +62,8 @@ class _FlightListByAerodrome:
         include_proposal: bool = False,
         include_forecast: bool = True,
         fields: list[FlightField] = default_fields,
+        *,
+        split: bool = False,
     ) -> FlightListByAerodrome:
         """Returns requested information about flights matching a criterion.
 
@@ -64,6 +73,9 @@ class _FlightListByAerodrome:
         :param stop: (UTC), by default one hour later
         :param fields: additional fields to request. By default, a set of
             (arguably) relevant fields are requested.
+        :param split: if True, the time window is bisected as long as the
+            service answers TOO_MANY_RESULTS, and the flights found in all
+            sub-windows are merged.
 
         **Example usage:**
 
@@ -73,6 +85,26 @@ class _FlightListByAerodrome:
             b2b.flightlistbyaerodrome(aerodrome="LFPG")
 
         """
+        if split:
+
+            def fetch(
+                wef: pd.Timestamp, unt: pd.Timestamp
+            ) -> FlightListByAerodromeReply:
+                request = self._flightlistbyaerodrome_request(
+                    aerodrome,
+                    aerodrome_role,
+                    wef,
+                    unt,
+                    include_proposal,
+                    include_forecast,
+                    fields,
+                )
+                reply = self.post(request)  # type: ignore
+                return reply["fl:FlightListByAerodromeReply"]  # type: ignore
+
+            replies = split_window(fetch, *time_window(start, stop))
+            return FlightListByAerodrome(merge(replies, "flights"))
+
         request = self._flightlistbyaerodrome_request(
             aerodrome,
             aerodrome_role,
@@ -95,6 +127,8 @@ class _FlightListByAerodrome:
         include_proposal: bool = False,
         include_forecast: bool = True,
         fields: list[FlightField] = default_fields,
+        *,
+        split: bool = False,
     ) -> FlightListByAerodrome:
         """Returns requested information about flights matching a criterion.
 
@@ -104,6 +138,9 @@ class _FlightListByAerodrome:
         :param stop: (UTC), by default one hour later
         :param fields: additional fields to request. By default, a set of
             (arguably) relevant fields are requested.
+        :param split: if True, the time window is bisected as long as the
+            service answers TOO_MANY_RESULTS, and the flights found in all
+            sub-windows are merged.
 
         **Example usage:**
 
@@ -113,6 +150,26 @@ class _FlightListByAerodrome:
             b2b.flight_list(aerodrome="LFPG")
 
         """
+        if split:
+
+            async def fetch(
+                wef: pd.Timestamp, unt: pd.Timestamp
+            ) -> FlightListByAerodromeReply:
+                request = self._flightlistbyaerodrome_request(
+                    aerodrome,
+                    aerodrome_role,
+                    wef,
+                    unt,
+                    include_proposal,
+                    include_forecast,
+                    fields,
+                )
+                reply = await self.async_post(client, request)  # type: ignore
+                return reply["fl:FlightListByAerodromeReply"]  # type: ignore
+
+            replies = await async_split_window(fetch, *time_window(start, stop))
+            return FlightListByAerodrome(merge(replies, "flights"))
+
         request = self._flightlistbyaerodrome_request(
             aerodrome,
             aerodrome_role,
@@ -1,22 +1,28 @@
-from typing import TypedDict
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypedDict
 
 import httpx
 
 import pandas as pd
 
-from ....mixins import DataFrameMixin, JSONMixin
-from ....types.generated.airspace import AirspaceId
-from ....types.generated.flight import (
-    FlightField,
-    FlightListByAirspaceReply,
-    FlightListByAirspaceRequest,
-)
+from ....mixins import JSONMixin
+from .columnar import FlightListMixin
+from .split import async_split_window, merge, split_window, time_window
+
+if TYPE_CHECKING:
+    from ....types.generated.airspace import AirspaceId
+    from ....types.generated.flight import (
+        FlightField,
+        FlightListByAirspaceReply,
+        FlightListByAirspaceRequest,
+    )
 
 Request = TypedDict(
-    "Request", {"fl:FlightListByAirspaceRequest": FlightListByAirspaceRequest}
+    "Request", {"fl:FlightListByAirspaceRequest": "FlightListByAirspaceRequest"}
 )
 Reply = TypedDict(
-    "Reply", {"fl:FlightListByAirspaceReply": FlightListByAirspaceReply}
+    "Reply", {"fl:FlightListByAirspaceReply": "FlightListByAirspaceReply"}
 )
 
 default_fields: list[FlightField] = [
@@ -38,7 +44,7 @@ default_fields: list[FlightField] = [
 
 
 class FlightListByAirspace(
-    DataFrameMixin, JSONMixin[FlightListByAirspaceReply]
+    FlightListMixin, JSONMixin["FlightListByAirspaceReply"]
 ):
     ...
 
@@ -52,6 +58,8 @@ class _FlightListByAirspace:
         include_proposal: bool = False,
         include_forecast: bool = True,
         fields: list[FlightField] = default_fields,
+        *,
+        split: bool = False,
     ) -> FlightListByAirspace:
         """Returns requested information about flights matching a criterion.
 
@@ -60,6 +68,9 @@ class _FlightListByAirspace:
         :param stop: (UTC), by default one hour later
         :param fields: additional fields to request. By default, a set of
             (arguably) relevant fields are requested.
+        :param split: if True, the time window is bisected as long as the
+            service answers TOO_MANY_RESULTS, and the flights found in all
+            sub-windows are merged.
 
         **Example usage:**
 
@@ -69,6 +80,25 @@ class _FlightListByAirspace:
             b2b.flightlistbyairspace(airspace="LFBBBDX")
 
         """
+        if split:
+
+            def fetch(
+                wef: pd.Timestamp, unt: pd.Timestamp
+            ) -> FlightListByAirspaceReply:
+                request = self._flightlistbyairspace_request(
+                    airspace,
+                    wef,
+                    unt,
+                    include_proposal,
+                    include_forecast,
+                    fields,
+                )
+                reply = self.post(request)  # type: ignore
+                return reply["fl:FlightListByAirspaceReply"]  # type: ignore
+
+            replies = split_window(fetch, *time_window(start, stop))
+            return FlightListByAirspace(merge(replies, "flights"))
+
         request = self._flightlistbyairspace_request(
             airspace,
             start,
@@ -89,6 +119,8 @@ class _FlightListByAirspace:
         include_proposal: bool = False,
         include_forecast: bool = True,
         fields: list[FlightField] = default_fields,
+        *,
+        split: bool = False,
     ) -> FlightListByAirspace:
         """Returns requested information about flights matching a criterion.
 
@@ -97,6 +129,9 @@ class _FlightListByAirspace:
         :param stop: (UTC), by default one hour later
         :param fields: additional fields to request. By default, a set of
             (arguably) relevant fields are requested.
+        :param split: if True, the time window is bisected as long as the
+            service answers TOO_MANY_RESULTS, and the flights found in all
+            sub-windows are merged.
 
         **Example usage:**
 
@@ -106,6 +141,25 @@ class _FlightListByAirspace:
             b2b.flight_list(aerodrome="LFPG")
 
         """
+        if split:
+
+            async def fetch(
+                wef: pd.Timestamp, unt: pd.Timestamp
+            ) -> FlightListByAirspaceReply:
+                request = self._flightlistbyairspace_request(
+                    airspace,
+                    wef,
+                    unt,
+                    include_proposal,
+                    include_forecast,
+                    fields,
+                )
+                reply = await self.async_post(client, request)  # type: ignore
+                return reply["fl:FlightListByAirspaceReply"]  # type: ignore
+
+            replies = await async_split_window(fetch, *time_window(start, stop))
+            return FlightListByAirspace(merge(replies, "flights"))
+
         request = self._flightlistbyairspace_request(
             airspace,
             start,
@@ -1,23 +1,28 @@
-from typing import TypedDict
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypedDict
 
 import httpx
 
 import pandas as pd
 
-from ....mixins import DataFrameMixin, JSONMixin
-from ....types.generated.flight import (
-    FlightField,
-    FlightListByMeasureMode,
-    FlightListByMeasureReply,
-    FlightListByMeasureRequest,
-)
-from ....types.generated.flow import MeasureId, RegulationId, ReroutingId
+from ....mixins import JSONMixin
+from .columnar import FlightListMixin
+
+if TYPE_CHECKING:
+    from ....types.generated.flight import (
+        FlightField,
+        FlightListByMeasureMode,
+        FlightListByMeasureReply,
+        FlightListByMeasureRequest,
+    )
+    from ....types.generated.flow import MeasureId, RegulationId, ReroutingId
 
 Request = TypedDict(
-    "Request", {"fl:FlightListByMeasureRequest": FlightListByMeasureRequest}
+    "Request", {"fl:FlightListByMeasureRequest": "FlightListByMeasureRequest"}
 )
 Reply = TypedDict(
-    "Reply", {"fl:FlightListByMeasureReply": FlightListByMeasureReply}
+    "Reply", {"fl:FlightListByMeasureReply": "FlightListByMeasureReply"}
 )
 
 default_fields: list[FlightField] = [
@@ -38,7 +43,9 @@ default_fields: list[FlightField] = [
 ]
 
 
-class FlightListByMeasure(DataFrameMixin, JSONMixin[FlightListByMeasureReply]):
+class FlightListByMeasure(
+    FlightListMixin, JSONMixin["FlightListByMeasureReply"]
+):
     ...
 
 
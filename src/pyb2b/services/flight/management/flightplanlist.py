@@ -1,26 +1,30 @@
 from __future__ import annotations
 
-from typing import Any, ClassVar, TypedDict
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, ClassVar, TypedDict
 
 import httpx
 
 import pandas as pd
 
+from ....decode import decode_time
 from ....mixins import DataFrameMixin, JSONMixin
-from ....types.generated.flight import (
-    FlightPlanListReply,
-    FlightPlanListRequest,
-    FlightPlanOrInvalidFiling,
-)
-from .flightretrieval import FlightRetrieval
+from .flightretrieval import FlightRetrieval, FlightRetrievalList
+from .split import async_split_window, merge, split_window, time_window
+
+if TYPE_CHECKING:
+    from ....types.generated.flight import (
+        FlightPlanListReply,
+        FlightPlanListRequest,
+    )
 
 Request = TypedDict(
-    "Request", {"fl:FlightPlanListRequest": FlightPlanListRequest}
+    "Request", {"fl:FlightPlanListRequest": "FlightPlanListRequest"}
 )
-Reply = TypedDict("Reply", {"fl:FlightPlanListReply": FlightPlanListReply})
+Reply = TypedDict("Reply", {"fl:FlightPlanListReply": "FlightPlanListReply"})
 
 
-class FlightPlanList(DataFrameMixin, JSONMixin[FlightPlanListReply]):
+class FlightPlanList(DataFrameMixin, JSONMixin["FlightPlanListReply"]):
     columns_options: ClassVar[None | dict[str, dict[str, Any]]] = dict(
         flightId=dict(style="blue bold"),
         callsign=dict(),
@@ -38,38 +42,56 @@ class FlightPlanList(DataFrameMixin, JSONMixin[FlightPlanListReply]):
         self.parent = parent
         self.json = json
 
-    @property
+    @cached_property
     def data(self) -> pd.DataFrame:
-        def eobt(entry: FlightPlanOrInvalidFiling) -> str:
-            if lfvp := entry.get("lastValidFlightPlan", None):
-                return lfvp["id"]["keys"]["estimatedOffBlockTime"]
-            return ""
+        """The flight plans in the list, sorted by EOBT.
 
+        The table is built on first access, then cached.
+        """
         summaries = self.json["data"]["summaries"]
         if not isinstance(summaries, list):
             summaries = [summaries]
-        summaries = sorted(summaries, key=eobt)
-        return pd.DataFrame.from_records(
-            {
-                "flightId": lvfp["id"]["id"],
-                "callsign": lvfp["id"]["keys"]["aircraftId"],
-                "origin": lvfp["id"]["keys"]["aerodromeOfDeparture"],
-                "destination": lvfp["id"]["keys"]["aerodromeOfDestination"],
-                "EOBT": pd.Timestamp(eobt_str, tz="utc")
-                if (eobt_str := eobt(entry))
-                else pd.Timestamp("NaT"),
-                "status": lvfp["status"],
-            }
+        plans = list(
+            lvfp
             for entry in summaries
             if (lvfp := entry.get("lastValidFlightPlan", None))
         )
+        keys = list(lvfp["id"]["keys"] for lvfp in plans)
+        data = pd.DataFrame(
+            {
+                "flightId": list(lvfp["id"]["id"] for lvfp in plans),
+                "callsign": list(k["aircraftId"] for k in keys),
+                "origin": pd.Categorical(
+                    list(k["aerodromeOfDeparture"] for k in keys)
+                ),
+                "destination": pd.Categorical(
+                    list(k["aerodromeOfDestination"] for k in keys)
+                ),
+                "EOBT": decode_time(
+                    list(k.get("estimatedOffBlockTime", None) for k in keys)
+                ),
+                "status": pd.Categorical(
+                    list(lvfp["status"] for lvfp in plans)
+                ),
+            }
+        )
+        return data.sort_values(
+            "EOBT", kind="stable", na_position="first", ignore_index=True
+        )
 
-    def __getitem__(self, item: str) -> None | FlightRetrieval:
-        handle = next(
-            (df for _, df in self.data.iterrows() if df.flightId == item), None
+    @cached_property
+    def _index(self) -> dict[str, int]:
+        return dict(
+            (flight_id, i) for i, flight_id in enumerate(self.data.flightId)
         )
-        if handle is None:
+
+    def _ipython_key_completions_(self) -> set[str]:
+        return set(self._index)
+
+    def __getitem__(self, item: str) -> None | FlightRetrieval:
+        if (idx := self._index.get(item, None)) is None:
             return None
+        handle = self.data.iloc[idx]
         return self.parent.flightretrieval(  # type: ignore
             EOBT=handle.EOBT,
             callsign=handle.callsign,
@@ -77,6 +99,26 @@ class FlightPlanList(DataFrameMixin, JSONMixin[FlightPlanListReply]):
             destination=handle.destination,
         )
 
+    def retrieve_all(self, max_workers: int = 8) -> FlightRetrievalList:
+        """Returns full information about all flights in the list.
+
+        See :meth:`~pyb2b.main.B2B.flightretrieval_many`.
+        """
+        return self.parent.flightretrieval_many(  # type: ignore
+            self.data, max_workers=max_workers
+        )
+
+    async def async_retrieve_all(
+        self, client: httpx.AsyncClient, max_concurrency: int = 8
+    ) -> FlightRetrievalList:
+        """Returns full information about all flights in the list.
+
+        See :meth:`~pyb2b.main.B2B.async_flightretrieval_many`.
+        """
+        return await self.parent.async_flightretrieval_many(  # type: ignore
+            client, self.data, max_concurrency=max_concurrency
+        )
+
 
 class _FlightPlanList:
     def flightplanlist(
@@ -87,6 +129,7 @@ class _FlightPlanList:
         callsign: None | str = None,
         origin: None | str = None,
         destination: None | str = None,
+        split: bool = False,
     ) -> FlightPlanList:
         """Returns a **minimum set of information** about flights.
 
@@ -99,6 +142,10 @@ class _FlightPlanList:
         :param origin: flying from a given airport (ICAO 4 letter code).
         :param destination: flying to a given airport (ICAO 4 letter code).
 
+        :param split: if True, the time window is bisected as long as the
+            service answers TOO_MANY_RESULTS, and the flight plans found in
+            all sub-windows are merged.
+
         **Example usage:**
 
         .. jupyter-execute::
@@ -107,6 +154,22 @@ class _FlightPlanList:
             b2b.flight_search(destination="EHAM", callsign="KLM*")
 
         """
+        if split:
+
+            def fetch(wef: pd.Timestamp, unt: pd.Timestamp) -> Any:
+                request = self._flightplanlist_request(
+                    start=wef,
+                    stop=unt,
+                    callsign=callsign,
+                    origin=origin,
+                    destination=destination,
+                )
+                reply: Reply = self.post(request)  # type: ignore
+                return reply["fl:FlightPlanListReply"]
+
+            replies = split_window(fetch, *time_window(start, stop))
+            return FlightPlanList(merge(replies, "summaries"), parent=self)
+
         request = self._flightplanlist_request(
             start=start,
             stop=stop,
@@ -126,6 +189,7 @@ class _FlightPlanList:
         callsign: None | str = None,
         origin: None | str = None,
         destination: None | str = None,
+        split: bool = False,
     ) -> FlightPlanList:
         """Returns a **minimum set of information** about flights.
 
@@ -138,6 +202,10 @@ class _FlightPlanList:
         :param origin: flying from a given airport (ICAO 4 letter code).
         :param destination: flying to a given airport (ICAO 4 letter code).
 
+        :param split: if True, the time window is bisected as long as the
+            service answers TOO_MANY_RESULTS, and the flight plans found in
+            all sub-windows are merged.
+
         **Example usage:**
 
         .. jupyter-execute::
@@ -146,6 +214,22 @@ class _FlightPlanList:
             b2b.flight_search(destination="EHAM", callsign="KLM*")
 
         """
+        if split:
+
+            async def fetch(wef: pd.Timestamp, unt: pd.Timestamp) -> Any:
+                request = self._flightplanlist_request(
+                    start=wef,
+                    stop=unt,
+                    callsign=callsign,
+                    origin=origin,
+                    destination=destination,
+                )
+                reply: Reply = await self.async_post(client, request)  # type: ignore
+                return reply["fl:FlightPlanListReply"]
+
+            replies = await async_split_window(fetch, *time_window(start, stop))
+            return FlightPlanList(merge(replies, "summaries"), parent=self)
+
         request = self._flightplanlist_request(
             start=start,
             stop=stop,
@@ -1,23 +1,61 @@
-from typing import TypedDict
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property, lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    TypedDict,
+    get_args,
+)
 
 import httpx
 
 import pandas as pd
 
-from ....mixins import JSONMixin
-from ....types.generated.flight import (
-    FlightField,
-    FlightRetrievalReply,
-    FlightRetrievalRequest,
-)
+from ....decode import decode_time
+from ....mixins import DataFrameMixin, JSONMixin
+
+if TYPE_CHECKING:
+    from ....types.generated.flight import (
+        FlightField,
+        FlightRetrievalReply,
+        FlightRetrievalRequest,
+    )
 
 Request = TypedDict(
-    "Request", {"fl:FlightRetrievalRequest": FlightRetrievalRequest}
+    "Request", {"fl:FlightRetrievalRequest": "FlightRetrievalRequest"}
 )
-Reply = TypedDict("Reply", {"fl:FlightRetrievalReply": FlightRetrievalReply})
+Reply = TypedDict("Reply", {"fl:FlightRetrievalReply": "FlightRetrievalReply"})
+
+
+class FlightKeys(NamedTuple):
+    """The parameters identifying a flight in a FlightRetrievalRequest."""
+
+    EOBT: str | pd.Timestamp
+    callsign: str
+    origin: str
+    destination: str
 
 
-class FlightRetrieval(JSONMixin[FlightRetrievalReply]):
+def flight_keys(
+    flights: pd.DataFrame | Iterable[tuple[Any, str, str, str]],
+) -> list[FlightKeys]:
+    """Returns the keys of flights, e.g. from a FlightPlanList.data table."""
+    if isinstance(flights, pd.DataFrame):
+        flights = flights[
+            ["EOBT", "callsign", "origin", "destination"]
+        ].itertuples(index=False)
+    return list(FlightKeys(*elt) for elt in flights)
+
+
+class FlightRetrieval(JSONMixin["FlightRetrievalReply"]):
     @property
     def callsign(self) -> str:
         return self.json["data"]["flight"]["flightId"]["keys"]["aircraftId"]
@@ -68,30 +106,141 @@ class FlightRetrieval(JSONMixin[FlightRetrievalReply]):
                 }
             )
             .dropna()
-            .eval("value = @pd.to_datetime(value, utc=True)")
+            .assign(value=lambda df: decode_time(df.value))
         )
 
 
-default_fields: list[FlightField] = list(
-    field
-    for field in FlightField.__args__  # type: ignore
-    if field
-    not in [
-        # NM 27.0.0 - not a valid value of union type 'FlightField'
-        "highestModelTrafficVolumeProfile",
-        "highestModelRouteChargeIndicator",
-        "highestModelFuelConsumptionIndicator",
-        # INVALID_ATTRIBUTE_VALUE:
-        # Flight field is not supported by FlightRetrieval
-        "worstLoadStateAtReferenceLocation",
-        "compareWithOtherTrafficType",
-        "slotSwapCandidateList",
-        # SERVICE_UNAVAILABLE: read access
-        # to resource '/operational/hotspots?kind=PROBLEM' is disabled
-        "caughtInHotspots",
-        "hotspots",
-    ]
-)
+time_fields = {
+    "ETOT": "estimatedTakeOffTime",
+    "ETOA": "estimatedTimeOfArrival",
+    "COBT": "calculatedOffBlockTime",
+    "CTOT": "calculatedTakeOffTime",
+    "CTOA": "calculatedTimeOfArrival",
+    "AOBT": "actualOffBlockTime",
+    "ATOT": "actualTakeOffTime",
+    "ATOA": "actualTimeOfArrival",
+}
+
+
+class FlightRetrievalList(DataFrameMixin):
+    """The results of many flight retrievals.
+
+    Results are accessible by flightId, flights which could not be retrieved
+    are listed with the corresponding exception in the ``errors`` attribute.
+    """
+
+    columns_options: ClassVar[None | dict[str, dict[str, Any]]] = dict(
+        flightId=dict(style="blue bold"),
+        callsign=dict(),
+        origin=dict(),
+        destination=dict(),
+        EOBT=dict(),
+        CTOT=dict(),
+        status=dict(),
+    )
+
+    def __init__(
+        self,
+        results: list[FlightRetrieval],
+        errors: None | dict[FlightKeys, Exception] = None,
+    ) -> None:
+        self.results = results
+        self.errors = errors if errors is not None else dict()
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[FlightRetrieval]:
+        yield from self.results
+
+    @cached_property
+    def _index(self) -> dict[str, FlightRetrieval]:
+        ids = (
+            result.json["data"]["flight"]["flightId"].get("id", None)
+            for result in self.results
+        )
+        return dict(
+            (id_, result)
+            for id_, result in zip(ids, self.results)
+            if id_ is not None
+        )
+
+    def __getitem__(self, item: str) -> None | FlightRetrieval:
+        return self._index.get(item, None)
+
+    @cached_property
+    def data(self) -> pd.DataFrame:
+        """A summary of all the flights retrieved, one flight per line."""
+        records = []
+        for result in self.results:
+            flight = result.json["data"]["flight"]
+            flight_id = flight["flightId"]
+            records.append(
+                {
+                    "flightId": flight_id.get("id", None),
+                    "callsign": flight_id["keys"]["aircraftId"],
+                    "origin": flight_id["keys"]["aerodromeOfDeparture"],
+                    "destination": flight_id["keys"]["aerodromeOfDestination"],
+                    "EOBT": flight_id["keys"]["estimatedOffBlockTime"],
+                    **dict(
+                        (key, flight.get(value, None))
+                        for key, value in time_fields.items()
+                    ),
+                    "status": flight.get("flightState", None),
+                    "regulation": flight.get("mostPenalisingRegulation", None),
+                }
+            )
+        data = pd.DataFrame.from_records(
+            records,
+            columns=[
+                "flightId",
+                "callsign",
+                "origin",
+                "destination",
+                "EOBT",
+                *time_fields,
+                "status",
+                "regulation",
+            ],
+        )
+        for column in ["EOBT", *time_fields]:
+            data[column] = decode_time(data[column])
+        return data
+
+
+#: Flight fields not supported by FlightRetrieval
+unsupported_fields = [
+    # NM 27.0.0 - not a valid value of union type 'FlightField'
+    "highestModelTrafficVolumeProfile",
+    "highestModelRouteChargeIndicator",
+    "highestModelFuelConsumptionIndicator",
+    # INVALID_ATTRIBUTE_VALUE:
+    # Flight field is not supported by FlightRetrieval
+    "worstLoadStateAtReferenceLocation",
+    "compareWithOtherTrafficType",
+    "slotSwapCandidateList",
+    # SERVICE_UNAVAILABLE: read access
+    # to resource '/operational/hotspots?kind=PROBLEM' is disabled
+    "caughtInHotspots",
+    "hotspots",
+]
+
+default_fields: list[FlightField]
+
+
+@lru_cache()
+def _default_fields() -> list[FlightField]:
+    # The list of all flight fields is only built on first use, so that the
+    # generated types need not be imported with the module.
+    from ....types.generated.flight import FlightField
+
+    return [f for f in get_args(FlightField) if f not in unsupported_fields]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "default_fields":
+        return _default_fields()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class _FlightRetrieval:
@@ -148,6 +297,101 @@ class _FlightRetrieval:
         reply = await self.async_post(client, request)  # type: ignore
         return FlightRetrieval(reply["fl:FlightRetrievalReply"])
 
+    def flightretrieval_many(
+        self,
+        flights: pd.DataFrame | Iterable[tuple[Any, str, str, str]],
+        max_workers: int = 8,
+    ) -> FlightRetrievalList:
+        """Returns full information about many flights.
+
+        Flights are retrieved concurrently, in a pool of threads sharing the
+        keep-alive connections of the client. Failures do not abort the batch:
+        they are collected in the ``errors`` attribute of the result.
+
+        :param flights: a table with EOBT, callsign, origin and destination
+            columns (e.g. ``FlightPlanList.data``), or an iterable of such
+            tuples.
+        :param max_workers: the maximum number of concurrent requests.
+        """
+        results: list[FlightRetrieval] = []
+        errors: dict[FlightKeys, Exception] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = dict(
+                (executor.submit(self.flightretrieval, *keys), keys)
+                for keys in flight_keys(flights)
+            )
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as error:
+                    errors[futures[future]] = error
+        return FlightRetrievalList(results, errors)
+
+    async def async_flightretrieval_iter(
+        self,
+        client: httpx.AsyncClient,
+        flights: pd.DataFrame | Iterable[tuple[Any, str, str, str]],
+        max_concurrency: int = 8,
+    ) -> AsyncIterator[tuple[FlightKeys, FlightRetrieval | Exception]]:
+        """Yields full information about many flights, as they come.
+
+        Each item is a tuple with the keys of the flight, and either the
+        result of the retrieval or the exception raised.
+
+        :param flights: a table with EOBT, callsign, origin and destination
+            columns (e.g. ``FlightPlanList.data``), or an iterable of such
+            tuples.
+        :param max_concurrency: the maximum number of concurrent requests.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def retrieve(
+            keys: FlightKeys,
+        ) -> tuple[FlightKeys, FlightRetrieval | Exception]:
+            async with semaphore:
+                try:
+                    return keys, await self.async_flightretrieval(client, *keys)
+                except Exception as error:
+                    return keys, error
+
+        tasks = [
+            asyncio.ensure_future(retrieve(keys))
+            for keys in flight_keys(flights)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def async_flightretrieval_many(
+        self,
+        client: httpx.AsyncClient,
+        flights: pd.DataFrame | Iterable[tuple[Any, str, str, str]],
+        max_concurrency: int = 8,
+    ) -> FlightRetrievalList:
+        """Returns full information about many flights.
+
+        Failures do not abort the batch: they are collected in the ``errors``
+        attribute of the result.
+
+        :param flights: a table with EOBT, callsign, origin and destination
+            columns (e.g. ``FlightPlanList.data``), or an iterable of such
+            tuples.
+        :param max_concurrency: the maximum number of concurrent requests.
+        """
+        results: list[FlightRetrieval] = []
+        errors: dict[FlightKeys, Exception] = {}
+        async for keys, result in self.async_flightretrieval_iter(
+            client, flights, max_concurrency
+        ):
+            if isinstance(result, Exception):
+                errors[keys] = result
+            else:
+                results.append(result)
+        return FlightRetrievalList(results, errors)
+
     def _flightretrieval_request(
         self,
         EOBT: str | pd.Timestamp,
@@ -175,7 +419,7 @@ class _FlightRetrieval:
                 }
             },
             "requestedFlightDatasets": "flight",
-            "requestedFlightFields": default_fields,
+            "requestedFlightFields": _default_fields(),
         }
         return {
             "fl:FlightRetrievalRequest": {  # type: ignore
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Literal
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+from ....navigation import NavIndex
+from .flightlist import FlightInfo
+from .flightretrieval import FlightRetrieval
+
+ProfileName = Literal[
+    "ftfmPointProfile", "rtfmPointProfile", "ctfmPointProfile"
+]
+
+Flight = FlightInfo | FlightRetrieval | ElementTree.Element | dict[str, Any]
+
+# (timeOver, flight level, route, point name, latitude, longitude)
+Point = tuple[None | str, float, None | str, None | str, float, float]
+
+
+def _angle(position: Any, side: str) -> float:
+    if position is None or position.get("angle", None) is None:
+        return np.nan
+    angle = int(position["angle"]) / 10000
+    return -angle if position.get("side", None) == side else angle
+
+
+def _geopoint(position: Any) -> tuple[float, float]:
+    return (
+        _angle(position.get("latitude", None), "SOUTH"),
+        _angle(position.get("longitude", None), "WEST"),
+    )
+
+
+def _element_to_dict(elt: ElementTree.Element) -> Any:
+    if len(elt) == 0:
+        return elt.text
+    return dict((child.tag, _element_to_dict(child)) for child in elt)
+
+
+def _flight_dict(flight: Flight) -> dict[str, Any]:
+    if isinstance(flight, FlightRetrieval):
+        return flight.json["data"]["flight"]  # type: ignore
+    if isinstance(flight, FlightInfo):
+        return _flight_dict(flight.reply)
+    if isinstance(flight, ElementTree.Element):
+        flight_id = flight.find("flightId")
+        if flight_id is None:
+            return {}
+        return {"flightId": _element_to_dict(flight_id)}
+    return flight
+
+
+def _points(flight: Flight, name: ProfileName) -> Iterator[Any]:
+    if isinstance(flight, FlightInfo):
+        yield from _points(flight.reply, name)
+        return
+    if isinstance(flight, ElementTree.Element):
+        for elt in flight.iterfind(name):
+            yield _element_to_dict(elt)
+        return
+    points = _flight_dict(flight).get(name, [])
+    yield from points if isinstance(points, list) else [points]
+
+
+def _decode(points: Iterable[Any], index: NavIndex) -> Iterator[Point]:
+    route: None | str = None
+    for point in points:
+        level = point.get("flightLevel", None) or {}
+        fl = (
+            float(level["level"])
+            if level.get("unit", None) == "F" and level.get("level", None)
+            else np.nan
+        )
+
+        segment = point.get("associatedRouteOrTerminalProcedure", None) or {}
+        route_id: None | str = None
+        if "route" in segment:
+            route = route_id = segment["route"]
+        elif "SID" in segment or "STAR" in segment:
+            route = None
+            route_id = (segment.get("SID") or segment.get("STAR") or {}).get(
+                "id", None
+            )
+        elif "DCT" in segment:
+            route_id = "DCT"
+
+        location = point.get("point", None) or {}
+        lat, lon = np.nan, np.nan
+        point_id: None | str = location.get("pointId", None)
+        if point_id is not None:
+            if (coords := index.get(point_id, route)) is not None:
+                lat, lon = coords
+        elif (dbe := location.get("nonPublishedPoint-DBEPoint")) is not None:
+            point_id = dbe if isinstance(dbe, str) else dbe.get("id", None)
+        elif (geo := location.get("nonPublishedPoint-GeoPoint")) is not None:
+            lat, lon = _geopoint(geo.get("position", None) or {})
+        elif (aerodrome := point.get("aerodrome", None)) is not None:
+            point_id = aerodrome
+
+        yield point.get("timeOver", None), fl, route_id, point_id, lat, lon
+
+
+class ProfileBatch:
+    """Point profiles of many flights, decoded into flat NumPy arrays.
+
+    Points of the i-th flight are stored between ``offsets[i]`` and
+    ``offsets[i + 1]``; ``batch[i]`` (or ``batch[flight_id]``) returns views
+    on these slices, without copying data.
+
+    Arrays (one value per point):
+
+    - ``flight``: the index of the flight in the batch;
+    - ``timestamp``: datetime64[s], in UTC;
+    - ``flight_level``, ``latitude``, ``longitude``: float32 (NaN if unknown);
+    - ``point``, ``route``: names of the point and of the route (or SID/STAR)
+      leading to it, as objects (None if unknown).
+    """
+
+    columns = (
+        "timestamp",
+        "flight_level",
+        "latitude",
+        "longitude",
+        "point",
+        "route",
+    )
+
+    def __init__(
+        self,
+        flight_ids: np.ndarray,
+        offsets: np.ndarray,
+        timestamp: np.ndarray,
+        flight_level: np.ndarray,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        point: np.ndarray,
+        route: np.ndarray,
+    ) -> None:
+        self.flight_ids = flight_ids
+        self.offsets = offsets
+        self.flight = np.repeat(
+            np.arange(len(flight_ids), dtype=np.int32), np.diff(offsets)
+        )
+        self.timestamp = timestamp
+        self.flight_level = flight_level
+        self.latitude = latitude
+        self.longitude = longitude
+        self.point = point
+        self.route = route
+        self._index = dict((id_, i) for i, id_ in enumerate(flight_ids))
+
+    def __len__(self) -> int:
+        return len(self.flight_ids)
+
+    def __getitem__(self, item: int | str) -> dict[str, np.ndarray]:
+        idx = self._index[item] if isinstance(item, str) else item
+        chunk = slice(self.offsets[idx], self.offsets[idx + 1])
+        return dict(
+            (column, getattr(self, column)[chunk]) for column in self.columns
+        )
+
+    @classmethod
+    def decode(
+        cls,
+        flights: Iterable[Flight],
+        name: ProfileName = "ctfmPointProfile",
+        index: None | NavIndex = None,
+    ) -> ProfileBatch:
+        """Decodes the point profiles of many flights.
+
+        :param flights: FlightRetrieval or FlightInfo instances, or the flight
+            part of raw replies (as dictionaries or XML elements)
+        :param name: one of ftfmPointProfile, rtfmPointProfile,
+            ctfmPointProfile
+        :param index: the navigation index used to locate published points.
+            By default, each flight is located with the index of the AIRAC
+            cycle of its off-block time (or of its first point).
+        """
+        # AIRAC cycles start at 00:00 UTC: one index per day is enough
+        indexes: dict[None | str, NavIndex] = {}
+        flight_ids: list[None | str] = []
+        lengths: list[int] = []
+        points: list[Point] = []
+        for flight in flights:
+            profile = list(_points(flight, name))
+            flight_id = _flight_dict(flight).get("flightId", None) or {}
+            flight_index = index
+            if flight_index is None:
+                keys = flight_id.get("keys", None) or {}
+                time = keys.get("estimatedOffBlockTime", None) or (
+                    profile[0].get("timeOver", None) if profile else None
+                )
+                day = time[:10] if time is not None else None
+                if day not in indexes:
+                    indexes[day] = NavIndex.load(
+                        pd.Timestamp(day) if day is not None else None
+                    )
+                flight_index = indexes[day]
+            before = len(points)
+            points.extend(_decode(profile, flight_index))
+            flight_ids.append(flight_id.get("id", None))
+            lengths.append(len(points) - before)
+
+        time, fl, route, point, lat, lon = (
+            zip(*points) if len(points) > 0 else ([], [], [], [], [], [])
+        )
+        return cls(
+            flight_ids=np.array(flight_ids, dtype=object),
+            offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            timestamp=np.array(time, dtype="datetime64[s]"),
+            flight_level=np.array(fl, dtype=np.float32),
+            latitude=np.array(lat, dtype=np.float32),
+            longitude=np.array(lon, dtype=np.float32),
+            point=np.array(point, dtype=object),
+            route=np.array(route, dtype=object),
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns all the points in one table, with a flight_id column."""
+        return pd.DataFrame(
+            {
+                "flight_id": self.flight_ids[self.flight],
+                "timestamp": pd.to_datetime(self.timestamp, utc=True),
+                **dict(
+                    (column, getattr(self, column))
+                    for column in self.columns[1:]
+                ),
+            }
+        )
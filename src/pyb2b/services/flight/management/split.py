@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Literal, TypeVar
+
+import pandas as pd
+
+from ....errors import ReplyError
+
+R = TypeVar("R", bound=Any)
+
+Window = tuple[pd.Timestamp, pd.Timestamp]
+
+_log = logging.getLogger(__name__)
+
+
+def utc(timestamp: str | pd.Timestamp) -> pd.Timestamp:
+    """Returns a naive timestamp in UTC, as expected by request builders."""
+    ts = pd.Timestamp(timestamp)
+    return ts.tz_convert("utc").tz_localize(None) if ts.tz is not None else ts
+
+
+def time_window(
+    start: None | str | pd.Timestamp, stop: None | str | pd.Timestamp
+) -> Window:
+    """Returns the time window of a request, by default the next hour."""
+    start = utc(start if start is not None else pd.Timestamp("now", tz="utc"))
+    stop = utc(stop) if stop is not None else start + pd.Timedelta("1h")
+    return start, stop
+
+
+def bisect(start: pd.Timestamp, stop: pd.Timestamp) -> None | list[Window]:
+    """Splits a window in two halves, on a minute boundary.
+
+    Returns None if the window cannot be split anymore.
+    """
+    middle = (start + (stop - start) / 2).floor("min")
+    if middle <= start or middle >= stop:
+        return None
+    return [(start, middle), (middle, stop)]
+
+
+def _bisect_or_raise(error: ReplyError, window: Window) -> list[Window]:
+    if error.status != "TOO_MANY_RESULTS":
+        raise error
+    if (halves := bisect(*window)) is None:
+        raise error
+    _log.info(f"Too many results between {window[0]} and {window[1]}")
+    return halves
+
+
+def split_window(
+    fetch: Callable[[pd.Timestamp, pd.Timestamp], R],
+    start: pd.Timestamp,
+    stop: pd.Timestamp,
+    max_workers: int = 4,
+) -> list[R]:
+    """Calls fetch(start, stop), and bisects the time window as long as the
+    service answers TOO_MANY_RESULTS.
+
+    Sub-windows are fetched concurrently in a pool of threads.
+    """
+    results: list[R] = []
+    windows: list[Window] = [(start, stop)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(windows) > 0:
+            futures = [(w, executor.submit(fetch, *w)) for w in windows]
+            windows = []
+            for window, future in futures:
+                try:
+                    results.append(future.result())
+                except ReplyError as error:
+                    windows.extend(_bisect_or_raise(error, window))
+    return results
+
+
+async def async_split_window(
+    fetch: Callable[[pd.Timestamp, pd.Timestamp], Awaitable[R]],
+    start: pd.Timestamp,
+    stop: pd.Timestamp,
+) -> list[R]:
+    """Awaits fetch(start, stop), and bisects the time window as long as the
+    service answers TOO_MANY_RESULTS.
+
+    Sub-windows are fetched concurrently.
+    """
+    try:
+        return [await fetch(start, stop)]
+    except ReplyError as error:
+        halves = _bisect_or_raise(error, (start, stop))
+    results = await asyncio.gather(
+        *(async_split_window(fetch, *w) for w in halves)
+    )
+    return [result for partial in results for result in partial]
+
+
+def flight_id(entry: Any) -> None | str:
+    """Returns the flightId of a FlightOrFlightPlan or FlightPlanSummary."""
+    if flight := entry.get("flight", None):
+        return flight["flightId"].get("id", None)  # type: ignore
+    plan = entry.get("flightPlan", entry)
+    if lvfp := plan.get("lastValidFlightPlan", None):
+        return lvfp["id"].get("id", None)  # type: ignore
+    return None
+
+
+def merge(replies: list[R], field: Literal["flights", "summaries"]) -> R:
+    """Merges the replies fetched over several time windows.
+
+    Entries are deduplicated based on their flightId.
+    """
+    entries: dict[Any, Any] = dict()
+    for i, reply in enumerate(replies):
+        data = reply.get("data", None) or {}
+        elts = data.get(field, [])
+        for j, entry in enumerate(elts if isinstance(elts, list) else [elts]):
+            key = flight_id(entry)
+            entries.setdefault(key if key is not None else (i, j), entry)
+
+    merged = dict(replies[0])
+    merged["data"] = dict(merged.get("data", None) or {})
+    merged["data"][field] = list(entries.values())
+    windows = [
+        window
+        for reply in replies
+        if (window := (reply.get("data") or {}).get("effectiveTrafficWindow"))
+    ]
+    if len(windows) > 0:
+        merged["data"]["effectiveTrafficWindow"] = {
+            "wef": min(window["wef"] for window in windows),
+            "unt": max(window["unt"] for window in windows),
+        }
+    return merged  # type: ignore
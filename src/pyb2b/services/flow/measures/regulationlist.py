@@ -1,14 +1,84 @@
 from __future__ import annotations
 
-from typing import Any, Optional, Set, Type, TypeVar
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional, Set
 from xml.etree import ElementTree
 
+import httpx
+
 import pandas as pd
 
-from ....mixins import DataFrameMixin
+from ....decode import decode_time
+from ....mixins import ElementListMixin
 from ....xml import REQUESTS
+from ...flight.management.split import time_window
+
+#: Where each column of RegulationList.data is found in a regulation item,
+#: as a tree of tags
+extraction_plan: dict[str, Any] = {
+    "regulationId": "regulationId",
+    "regulationState": "state",
+    "subType": "type",
+    "reason": "reason",
+    "applicability": {"wef": "start", "unt": "stop"},
+    "location": {
+        "id": "tvId",
+        "referenceLocation-ReferenceLocationAirspace": {"id": "airspace"},
+        "referenceLocation-ReferenceLocationAerodrome": {"id": "aerodrome"},
+        "flightLevels": {
+            "min": {"level": "fl_min"},
+            "max": {"level": "fl_max"},
+        },
+    },
+    "description": "description",
+}
+
+Plan = dict[str, "int | Plan"]
+
+#: Columns of RegulationList.data
+columns = [
+    "regulationId",
+    "state",
+    "type",
+    "reason",
+    "start",
+    "stop",
+    "tvId",
+    "airspace",
+    "aerodrome",
+    "fl_min",
+    "fl_max",
+    "description",
+]
+
+
+def _compile(plan: dict[str, Any], columns: list[str]) -> Plan:
+    """Replaces column names in the plan with their position in columns."""
+    return {
+        tag: _compile(step, columns)
+        if isinstance(step, dict)
+        else columns.index(step)
+        for tag, step in plan.items()
+    }
+
+
+def _extract(
+    elt: ElementTree.Element, plan: Plan, values: list[list[Any]], i: int
+) -> None:
+    """Walks the subtree once, filling row i of the column arrays."""
+    for child in elt:
+        step = plan.get(child.tag)
+        if step is None:
+            continue
+        if isinstance(step, dict):
+            _extract(child, step, values, i)
+        else:
+            values[step][i] = child.text
+
+
+_plan = _compile(extraction_plan, columns)
 
-rename_cols = {"id": "tvId", "regulationState": "state", "subType": "type"}
 
 default_regulation_fields: Set[str] = {
     "applicability",
@@ -37,99 +107,108 @@ default_regulation_fields: Set[str] = {
     # "delayConfirmationThreshold",
 }
 
-# https://github.com/python/mypy/issues/2511
-RegulationListTypeVar = TypeVar("RegulationListTypeVar", bound="RegulationList")
-
 
 class RegulationInfo:
+    """A regulation element of a B2B reply.
+
+    Simple fields are available as attributes. They are indexed, together
+    with the decoded applicability, location and flight levels, only once,
+    on first access.
+    """
+
+    __slots__ = ("_fields", "reply")
+
+    def __init__(self, reply: ElementTree.Element) -> None:
+        self.reply = reply
+        self._fields: None | dict[str, Any] = None
+
+    @classmethod
+    def fromET(cls, tree: ElementTree.Element) -> "RegulationInfo":
+        return cls(tree)
+
+    @property
+    def fields(self) -> dict[str, Any]:
+        """The tag→value index of simple fields."""
+        if self._fields is None:
+            reply = self.reply
+            refloc = "location/referenceLocation-"
+            # reversed, so that the first occurrence of a tag prevails
+            fields: dict[str, Any] = dict(
+                (p.tag, p.text) for p in reversed(reply) if len(p) == 0
+            )
+            wef, unt = (
+                reply.findtext("applicability/wef"),
+                reply.findtext("applicability/unt"),
+            )
+            fl_min, fl_max = (
+                reply.findtext("location/flightLevels/min/level"),
+                reply.findtext("location/flightLevels/max/level"),
+            )
+            fields.update(
+                start=pd.Timestamp(wef, tz="UTC") if wef else None,
+                stop=pd.Timestamp(unt, tz="UTC") if unt else None,
+                tvId=reply.findtext("location/id"),
+                location=reply.findtext(refloc + "ReferenceLocationAirspace/id")
+                or reply.findtext(refloc + "ReferenceLocationAerodrome/id"),
+                fl_min=int(fl_min) if fl_min else 0,
+                fl_max=int(fl_max) if fl_max else 999,
+            )
+            self._fields = fields
+        return self._fields
+
+    def _get(self, name: str) -> Any:
+        value = self.fields.get(name)
+        assert value is not None
+        return value
+
     @property
     def regulation_id(self) -> str:
-        assert self.reply is not None
-        elt = self.reply.find("regulationId")
-        assert elt is not None
-        assert elt.text is not None
-        return elt.text
+        return self._get("regulationId")  # type: ignore
 
     @property
     def state(self) -> str:
-        assert self.reply is not None
-        elt = self.reply.find("regulationState")
-        assert elt is not None
-        assert elt.text is not None
-        return elt.text
+        return self._get("regulationState")  # type: ignore
 
     @property
     def type(self) -> str:
-        assert self.reply is not None
-        elt = self.reply.find("subType")
-        assert elt is not None
-        assert elt.text is not None
-        return elt.text
+        return self._get("subType")  # type: ignore
 
     @property
     def start(self) -> pd.Timestamp:
-        assert self.reply is not None
-        elt = self.reply.find("applicability/wef")
-        assert elt is not None
-        assert elt.text is not None
-        return pd.Timestamp(elt.text, tz="UTC")
+        return self._get("start")
 
     @property
     def stop(self) -> pd.Timestamp:
-        assert self.reply is not None
-        elt = self.reply.find("applicability/unt")
-        assert elt is not None
-        assert elt.text is not None
-        return pd.Timestamp(elt.text, tz="UTC")
+        return self._get("stop")
 
     @property
     def tvId(self) -> str:
-        assert self.reply is not None
-        elt = self.reply.find("location/id")
-        assert elt is not None
-        assert elt.text is not None
-        return elt.text
+        return self._get("tvId")  # type: ignore
 
     @property
     def location(self) -> Optional[str]:
-        assert self.reply is not None
-        elt = self.reply.find(
-            "location/referenceLocation-ReferenceLocationAirspace/id"
-        )
-        if elt is not None:
-            return elt.text
-        elt = self.reply.find(
-            "location/referenceLocation-ReferenceLocationAerodrome/id"
-        )
-        if elt is not None:
-            return elt.text
-        return None
+        return self.fields["location"]  # type: ignore
 
     @property
     def fl_min(self) -> int:
-        assert self.reply is not None
-        elt = self.reply.find("location/flightLevels/min/level")
-        return int(elt.text) if elt is not None and elt.text is not None else 0
+        return self.fields["fl_min"]  # type: ignore
 
     @property
     def fl_max(self) -> int:
-        assert self.reply is not None
-        elt = self.reply.find("location/flightLevels/max/level")
-        return (
-            int(elt.text) if elt is not None and elt.text is not None else 999
-        )
+        return self.fields["fl_max"]  # type: ignore
 
-    def __getattr__(self, name: str) -> str:
+    def __getattr__(self, name: str) -> Any:
         cls = type(self)
-        assert self.reply is not None
-        elt = self.reply.find(name)
-        if elt is not None:
-            return elt.text  # type: ignore
+        if not name.startswith("_") and name in self.fields:
+            return self.fields[name]
         msg = "{.__name__!r} object has no attribute {!r}"
         raise AttributeError(msg.format(cls, name))
 
 
-class _RegulationList(DataFrameMixin):
+class RegulationList(ElementListMixin):
+    elements_path = "data/regulations/item"
+    key_path = "regulationId"
+
     columns_options = dict(
         regulationId=dict(style="blue bold"),
         state=dict(),
@@ -142,123 +221,39 @@ class _RegulationList(DataFrameMixin):
         aerodrome=dict(),
     )
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        if len(args) == 0 and "data" not in kwargs:
-            super().__init__(data=None, **kwargs)
-        else:
-            super().__init__(*args, **kwargs)
-
-    @classmethod
-    def fromET(
-        cls: Type[RegulationListTypeVar], tree: ElementTree.Element
-    ) -> RegulationListTypeVar:
-        instance = cls()
-        instance.reply = tree
-        instance.build_df()
-        return instance
-
     def __getitem__(self, item: str) -> Optional[RegulationInfo]:
-        assert self.reply is not None
-        for elt in self.reply.findall("data/regulations/item"):
-            key = elt.find("regulationId")
-            assert key is not None
-            if key.text == item:
-                return RegulationInfo.fromET(elt)
-
-        return None
-
-    def _ipython_key_completions_(self) -> Set[str]:
-        return set(self.data.RegulationId.unique())
+        elt = self.element(item)
+        return RegulationInfo.fromET(elt) if elt is not None else None
 
     def build_df(self) -> None:
         assert self.reply is not None
 
-        refloc = "location/referenceLocation-"
-
-        self.data = pd.DataFrame.from_records(
-            [
-                {
-                    **{p.tag: p.text for p in elt if p.text is not None},
-                    **{
-                        p.tag: p.text
-                        for p in elt.find("location")  # type: ignore
-                        if p.text is not None
-                    },
-                    **{
-                        "start": elt.find(  # type: ignore
-                            "applicability/wef"
-                        ).text
-                        if elt.find("applicability") is not None
-                        else None,
-                        "stop": elt.find(  # type: ignore
-                            "applicability/unt"
-                        ).text
-                        if elt.find("applicability") is not None
-                        else None,
-                    },
-                    **{
-                        "airspace": elt.find(  # type: ignore
-                            refloc + "ReferenceLocationAirspace/id"
-                        ).text
-                        if elt.find(refloc + "ReferenceLocationAirspace")
-                        is not None
-                        else None,
-                        "aerodrome": elt.find(  # type: ignore
-                            refloc + "ReferenceLocationAerodrome/id"
-                        ).text
-                        if elt.find(refloc + "ReferenceLocationAerodrome")
-                        is not None
-                        else None,
-                    },
-                    **{
-                        "fl_min": elt.find(  # type: ignore
-                            "location/flightLevels/min/level"
-                        ).text
-                        if elt.find("location/flightLevels/min/level")
-                        is not None
-                        else 0,
-                        "fl_max": elt.find(  # type: ignore
-                            "location/flightLevels/max/level"
-                        ).text
-                        if elt.find("location/flightLevels/max/level")
-                        is not None
-                        else 999,
-                    },
-                }
-                for elt in self.reply.findall("data/regulations/item")
-            ]
+        items = self.reply.findall(self.elements_path)
+        values: list[list[Any]] = [[None] * len(items) for _ in columns]
+        for i, elt in enumerate(items):
+            _extract(elt, _plan, values, i)
+
+        data = dict(zip(columns, values))
+        self.data = pd.DataFrame(
+            {
+                **data,
+                "start": decode_time(data["start"]),
+                "stop": decode_time(data["stop"]),
+                "fl_min": pd.to_numeric(pd.Series(data["fl_min"]))
+                .fillna(0)
+                .astype(int),
+                "fl_max": pd.to_numeric(pd.Series(data["fl_max"]))
+                .fillna(999)
+                .astype(int),
+            },
+            columns=columns,
         )
 
-        if self.data.empty:
-            return
-
-        self.data = self.data.rename(columns=rename_cols)
-        self.data = self.data[
-            [
-                "regulationId",
-                "state",
-                "type",
-                "reason",
-                "start",
-                "stop",
-                "tvId",
-                "airspace",
-                "aerodrome",
-                "fl_min",
-                "fl_max",
-                "description",
-            ]
-        ]
-
-        for feat in ["start", "stop"]:
-            if feat in self.data.columns:
-                self.data = self.data.assign(
-                    **{
-                        feat: self.data[feat].apply(
-                            lambda x: pd.Timestamp(x, tz="utc")
-                        )
-                    }
-                )
+
+Window = tuple[None | str | pd.Timestamp, None | str | pd.Timestamp]
+Query = tuple[
+    None | str | pd.Timestamp, None | str | pd.Timestamp, None | list[str]
+]
 
 
 class _RegulationList:
@@ -269,7 +264,7 @@ class _RegulationList:
         traffic_volumes: None | list[str] = None,
         regulations: None | str | list[str] = None,
         fields: None | list[str] = None,
-    ) -> None | _RegulationList:
+    ) -> RegulationList:
         """Returns information about a (set of) given regulation(s).
 
         :param start: (UTC), by default current time
@@ -289,12 +284,99 @@ class _RegulationList:
             nm_b2b.regulation_list()
 
         """
+        request = self._regulation_list_request(
+            start, stop, traffic_volumes, regulations, fields
+        )
+        reply = self.post(request, element=True)  # type: ignore
+        return RegulationList.fromET(reply)
+
+    async def async_regulation_list(
+        self,
+        client: httpx.AsyncClient,
+        start: None | str | pd.Timestamp = None,
+        stop: None | str | pd.Timestamp = None,
+        traffic_volumes: None | list[str] = None,
+        regulations: None | str | list[str] = None,
+        fields: None | list[str] = None,
+    ) -> RegulationList:
+        """Returns information about a (set of) given regulation(s).
+
+        :param client: the asynchronous client used to post the request
+
+        Other parameters are the same as in :meth:`regulation_list`.
+
+        """
+        request = self._regulation_list_request(
+            start, stop, traffic_volumes, regulations, fields
+        )
+        reply = await self.async_post(client, request, element=True)  # type: ignore
+        return RegulationList.fromET(reply)
+
+    def regulation_list_many(
+        self,
+        windows: None | Iterable[Window] = None,
+        traffic_volumes: None | Iterable[None | list[str]] = None,
+        regulations: None | str | list[str] = None,
+        fields: None | list[str] = None,
+        max_workers: int = 4,
+    ) -> RegulationList:
+        """Returns the regulations matching many queries, merged.
+
+        One request is posted per time window and per set of traffic
+        volumes, in a pool of threads. Regulations returned by several
+        requests appear only once.
+
+        :param windows: (start, stop) tuples, by default the next hour
+        :param traffic_volumes: sets of traffic volumes, by default all
+        :param max_workers: the maximum number of concurrent requests.
+
+        Other parameters are the same as in :meth:`regulation_list`.
+
+        """
+
+        def fetch(query: Query) -> RegulationList:
+            start, stop, tvs = query
+            return self.regulation_list(start, stop, tvs, regulations, fields)
 
-        if start is not None:
-            start = pd.Timestamp(start, tz="utc")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return RegulationList.concat(
+                executor.map(fetch, _queries(windows, traffic_volumes))
+            )
+
+    async def async_regulation_list_many(
+        self,
+        client: httpx.AsyncClient,
+        windows: None | Iterable[Window] = None,
+        traffic_volumes: None | Iterable[None | list[str]] = None,
+        regulations: None | str | list[str] = None,
+        fields: None | list[str] = None,
+    ) -> RegulationList:
+        """Returns the regulations matching many queries, merged.
 
-        if stop is not None:
-            stop = pd.Timestamp(stop, tz="utc")
+        Requests are posted concurrently, within the limits of the
+        governor. Parameters are the same as in
+        :meth:`regulation_list_many`.
+
+        """
+        results = await asyncio.gather(
+            *(
+                self.async_regulation_list(
+                    client, start, stop, tvs, regulations, fields
+                )
+                for start, stop, tvs in _queries(windows, traffic_volumes)
+            )
+        )
+        return RegulationList.concat(results)
+
+    def _regulation_list_request(
+        self,
+        start: None | str | pd.Timestamp,
+        stop: None | str | pd.Timestamp,
+        traffic_volumes: None | list[str],
+        regulations: None | str | list[str],
+        fields: None | list[str],
+    ) -> str:
+        start, stop = time_window(start, stop)
 
         _tvs = traffic_volumes if traffic_volumes is not None else []
         _fields = fields if fields is not None else []
@@ -302,7 +384,7 @@ class _RegulationList:
             regulations = [regulations]
         _regulations = regulations if regulations is not None else []
 
-        data = REQUESTS["RegulationListRequest"].format(
+        return REQUESTS["RegulationListRequest"].format(
             send_time=pd.Timestamp("now", tz="utc"),
             start=start,
             stop=stop,
@@ -310,7 +392,9 @@ class _RegulationList:
                 "<requestedRegulationFields>"
                 + "\n".join(
                     f"<item>{field}</item>"
-                    for field in default_regulation_fields.union(_fields)
+                    for field in sorted(
+                        default_regulation_fields.union(_fields)
+                    )
                 )
                 + "</requestedRegulationFields>"
             ),
@@ -331,5 +415,15 @@ class _RegulationList:
             if regulations is not None
             else "",
         )
-        rep = self.post(data)  # type: ignore
-        return _RegulationList.fromB2BReply(rep)
+
+
+def _queries(
+    windows: None | Iterable[Window],
+    traffic_volumes: None | Iterable[None | list[str]],
+) -> list[Query]:
+    """Returns (start, stop, traffic_volumes) for each combination."""
+    return list(
+        (start, stop, tvs)
+        for start, stop in (windows if windows is not None else [(None, None)])
+        for tvs in (traffic_volumes if traffic_volumes is not None else [None])
+    )
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.serialization import pkcs12
+from cryptography.x509.oid import NameOID
+from pyb2b.main import B2B
+
+
+@pytest.fixture(scope="session")
+def pkcs12_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A self-signed client certificate, not valid for NM services."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "pyb2b")])
+    now = datetime.now(tz=timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=365))
+        .sign(key, hashes.SHA256())
+    )
+    path = tmp_path_factory.mktemp("auth") / "test.p12"
+    path.write_bytes(
+        pkcs12.serialize_key_and_certificates(
+            b"pyb2b",
+            key,
+            cert,
+            None,
+            serialization.BestAvailableEncryption(b"password"),
+        )
+    )
+    return path
+
+
+@pytest.fixture
+def offline_b2b(pkcs12_file: Path) -> B2B:
+    """A B2B instance meant to be used with a httpx.MockTransport."""
+    return B2B("PREOPS", "27.0.0", pkcs12_file, "password")
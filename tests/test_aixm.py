@@ -0,0 +1,597 @@
+import asyncio
+import json
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+import xmltodict
+from pyb2b import navigation
+from pyb2b.aixm import AirspaceIndex, AIXMStore, ingest
+from pyb2b.main import B2B
+from pyb2b.navigation import NavIndex
+
+import numpy as np
+import pandas as pd
+
+content = bytes(range(256)) * 1000
+file = {"id": "2401/BASELINE/DesignatedPoint.BASELINE.zip"}
+
+
+def file_handler(request: httpx.Request) -> httpx.Response:
+    range_ = request.headers.get("Range")
+    if range_ is None:
+        return httpx.Response(200, content=content)
+    start = int(range_.removeprefix("bytes=").removesuffix("-"))
+    if start >= len(content):
+        headers = {"Content-Range": f"bytes */{len(content)}"}
+        return httpx.Response(416, headers=headers)
+    return httpx.Response(206, content=content[start:])
+
+
+def download(b2b: B2B, output_dir: Path, length: None | int) -> None:
+    async def main() -> None:
+        transport = httpx.MockTransport(file_handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await b2b._async_file_get(
+                client,
+                {**file}
+                if length is None
+                else {**file, "fileLength": str(length)},
+                output_dir,
+            )
+
+    asyncio.run(main())
+
+
+def test_file_get(offline_b2b: B2B, tmp_path: Path) -> None:
+    path = tmp_path / "DesignatedPoint.BASELINE.zip"
+    partial = tmp_path / "DesignatedPoint.BASELINE.zip.part"
+
+    # resume an interrupted download
+    partial.write_bytes(content[:1000])
+    download(offline_b2b, tmp_path, len(content))
+    assert path.read_bytes() == content
+    assert not partial.exists()
+
+    # a wrong length is detected, and the file not renamed
+    path.unlink()
+    with pytest.raises(RuntimeError, match="Incomplete"):
+        download(offline_b2b, tmp_path, len(content) + 1)
+    assert not path.exists()
+    assert partial.stat().st_size == len(content)
+
+    # without fileLength, a complete .part file is only renamed...
+    download(offline_b2b, tmp_path, None)
+    assert path.read_bytes() == content
+    assert not partial.exists()
+
+    # ... and a stale one is downloaded again
+    path.unlink()
+    partial.write_bytes(content + b"stale")
+    download(offline_b2b, tmp_path, None)
+    assert path.read_bytes() == content
+    assert not partial.exists()
+
+
+def aixm_file(name: str, release: str = "2024-01-01 00:00:00") -> Any:
+    return {
+        "id": f"2401/BASELINE/{name}.BASELINE.zip",
+        "releaseTime": release,
+        "fileLength": "1000",
+    }
+
+
+def aixm_request(
+    b2b: B2B,
+    output_dir: Path,
+    update_id: str,
+    files: list[Any],
+    errors: None | dict[str, list[type[httpx.TransportError]]] = None,
+) -> list[str]:
+    """Runs async_aixm_request, returns the names of the files requested."""
+    summary = {"updateId": update_id, "files": files}
+    _errors = errors if errors is not None else {}
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            reply = xmltodict.unparse(
+                {
+                    "as:CompleteAIXMDatasetReply": {
+                        "@xmlns:as": "eurocontrol/cfmu/b2b/AirspaceServices",
+                        "status": "OK",
+                        "data": {"datasetSummaries": [summary, summary]},
+                    }
+                }
+            )
+            return httpx.Response(200, content=reply)
+        name = request.url.path.split("/")[-1]
+        requested.append(name)
+        if _errors.get(name):
+            raise _errors[name].pop(0)("error", request=request)
+        return httpx.Response(200, content=content[:1000])
+
+    async def main() -> None:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await b2b.async_aixm_request(client, "2401", output_dir, jobs=3)
+
+    asyncio.run(main())
+    return requested
+
+
+def test_aixm_request(offline_b2b: B2B, tmp_path: Path) -> None:
+    offline_b2b.governor.backoff = 0.01
+    files = [
+        aixm_file(name)
+        for name in ["Airspace", "DesignatedPoint", "Navaid", "Route"]
+    ]
+    requested = aixm_request(
+        offline_b2b,
+        tmp_path,
+        "1",
+        files,
+        {"Navaid.BASELINE.zip": [httpx.ReadTimeout, httpx.ReadError]},
+    )
+    assert requested.count("Navaid.BASELINE.zip") == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        [file["id"].split("/")[-1] for file in files] + ["aixm_2401.json"]
+    )
+
+    # nothing to download
+    assert aixm_request(offline_b2b, tmp_path, "1", files) == []
+
+    # one file changed, one superseded, one new
+    files = [
+        files[0],
+        files[1],
+        aixm_file("Navaid", "2024-01-02 00:00:00"),
+        aixm_file("RouteSegment"),
+    ]
+    requested = aixm_request(offline_b2b, tmp_path, "2", files)
+    assert sorted(requested) == [
+        "Navaid.BASELINE.zip",
+        "RouteSegment.BASELINE.zip",
+    ]
+    assert not (tmp_path / "Route.BASELINE.zip").exists()
+    manifest = json.loads((tmp_path / "aixm_2401.json").read_text())
+    assert manifest["updateId"] == "2"
+    assert manifest["files"][files[2]["id"]] == files[2]
+
+
+header = """<?xml version="1.0" encoding="UTF-8"?>
+<message:AIXMBasicMessage
+    xmlns:message="http://www.aixm.aero/schema/5.1/message"
+    xmlns:aixm="http://www.aixm.aero/schema/5.1"
+    xmlns:gml="http://www.opengis.net/gml/3.2"
+    xmlns:xlink="http://www.w3.org/1999/xlink">
+"""
+
+aixm_message = (
+    header
+    + """  <message:hasMember>
+    <aixm:DesignatedPoint gml:id="p1">
+      <gml:identifier codeSpace="urn:uuid:">p1</gml:identifier>
+      <aixm:timeSlice><aixm:DesignatedPointTimeSlice gml:id="p1ts">
+        <aixm:interpretation>BASELINE</aixm:interpretation>
+        <aixm:designator>NARAK</aixm:designator>
+        <aixm:type>ICAO</aixm:type>
+        <aixm:location><aixm:Point><gml:pos>44.5 1.25</gml:pos></aixm:Point>
+        </aixm:location>
+      </aixm:DesignatedPointTimeSlice></aixm:timeSlice>
+    </aixm:DesignatedPoint>
+  </message:hasMember>
+  <message:hasMember>
+    <aixm:Navaid gml:id="n1">
+      <gml:identifier codeSpace="urn:uuid:">n1</gml:identifier>
+      <aixm:timeSlice><aixm:NavaidTimeSlice gml:id="n1ts">
+        <aixm:interpretation>BASELINE</aixm:interpretation>
+        <aixm:designator>TOU</aixm:designator>
+        <aixm:type>VOR_DME</aixm:type>
+        <aixm:name>TOULOUSE</aixm:name>
+        <aixm:location><aixm:ElevatedPoint>
+          <gml:pos>43.5 1.375</gml:pos>
+        </aixm:ElevatedPoint></aixm:location>
+      </aixm:NavaidTimeSlice></aixm:timeSlice>
+    </aixm:Navaid>
+  </message:hasMember>
+  <message:hasMember>
+    <aixm:Route gml:id="r1">
+      <gml:identifier codeSpace="urn:uuid:">r1</gml:identifier>
+      <aixm:timeSlice><aixm:RouteTimeSlice gml:id="r1ts">
+        <aixm:interpretation>BASELINE</aixm:interpretation>
+        <aixm:designatorPrefix>U</aixm:designatorPrefix>
+        <aixm:designatorSecondLetter>N</aixm:designatorSecondLetter>
+        <aixm:designatorNumber>869</aixm:designatorNumber>
+      </aixm:RouteTimeSlice></aixm:timeSlice>
+    </aixm:Route>
+  </message:hasMember>
+  <message:hasMember>
+    <aixm:RouteSegment gml:id="s1">
+      <gml:identifier codeSpace="urn:uuid:">s1</gml:identifier>
+      <aixm:timeSlice><aixm:RouteSegmentTimeSlice gml:id="s1ts">
+        <aixm:interpretation>BASELINE</aixm:interpretation>
+        <aixm:upperLimit uom="FL">660</aixm:upperLimit>
+        <aixm:lowerLimit uom="FT">19500</aixm:lowerLimit>
+        <aixm:start><aixm:EnRouteSegmentPoint>
+          <aixm:pointChoice_navaidSystem xlink:href="urn:uuid:n1"/>
+        </aixm:EnRouteSegmentPoint></aixm:start>
+        <aixm:end><aixm:EnRouteSegmentPoint>
+          <aixm:pointChoice_fixDesignatedPoint xlink:href="urn:uuid:p1"/>
+        </aixm:EnRouteSegmentPoint></aixm:end>
+        <aixm:routeFormed xlink:href="urn:uuid:r1"/>
+      </aixm:RouteSegmentTimeSlice></aixm:timeSlice>
+    </aixm:RouteSegment>
+  </message:hasMember>
+  <message:hasMember>
+    <aixm:Airspace gml:id="a1">
+      <gml:identifier codeSpace="urn:uuid:">a1</gml:identifier>
+      <aixm:timeSlice><aixm:AirspaceTimeSlice gml:id="a1ts">
+        <aixm:interpretation>BASELINE</aixm:interpretation>
+        <aixm:type>SECTOR</aixm:type>
+        <aixm:designator>LFBBR1</aixm:designator>
+        <aixm:geometryComponent><aixm:AirspaceGeometryComponent>
+          <aixm:theAirspaceVolume><aixm:AirspaceVolume>
+            <aixm:upperLimit uom="FL">345</aixm:upperLimit>
+            <aixm:lowerLimit>GND</aixm:lowerLimit>
+            <aixm:horizontalProjection><aixm:Surface><gml:patches>
+              <gml:PolygonPatch><gml:exterior><gml:LinearRing>
+                <gml:posList>44 0 45 0 45 2 44 2 44 0</gml:posList>
+              </gml:LinearRing></gml:exterior></gml:PolygonPatch>
+            </gml:patches></aixm:Surface></aixm:horizontalProjection>
+          </aixm:AirspaceVolume></aixm:theAirspaceVolume>
+        </aixm:AirspaceGeometryComponent></aixm:geometryComponent>
+      </aixm:AirspaceTimeSlice></aixm:timeSlice>
+    </aixm:Airspace>
+  </message:hasMember>
+  <message:hasMember>
+    <aixm:Airspace gml:id="a2">
+      <gml:identifier codeSpace="urn:uuid:">a2</gml:identifier>
+      <aixm:timeSlice><aixm:AirspaceTimeSlice gml:id="a2ts">
+        <aixm:interpretation>BASELINE</aixm:interpretation>
+        <aixm:type>CTA</aixm:type>
+        <aixm:designator>LFBBT1</aixm:designator>
+        <aixm:geometryComponent><aixm:AirspaceGeometryComponent>
+          <aixm:theAirspaceVolume><aixm:AirspaceVolume>
+            <aixm:upperLimit uom="FL">195</aixm:upperLimit>
+            <aixm:lowerLimit uom="FT">5000</aixm:lowerLimit>
+            <aixm:horizontalProjection><aixm:Surface><gml:patches>
+              <gml:PolygonPatch><gml:exterior><gml:LinearRing>
+                <gml:posList>44 0 45 0 44 2</gml:posList>
+              </gml:LinearRing></gml:exterior></gml:PolygonPatch>
+            </gml:patches></aixm:Surface></aixm:horizontalProjection>
+          </aixm:AirspaceVolume></aixm:theAirspaceVolume>
+        </aixm:AirspaceGeometryComponent></aixm:geometryComponent>
+      </aixm:AirspaceTimeSlice></aixm:timeSlice>
+    </aixm:Airspace>
+  </message:hasMember>
+</message:AIXMBasicMessage>
+"""
+)
+
+
+def airspace(id_: str, designator: str, *components: str) -> str:
+    return f"""  <message:hasMember>
+    <aixm:Airspace gml:id="{id_}">
+      <gml:identifier codeSpace="urn:uuid:">{id_}</gml:identifier>
+      <aixm:timeSlice><aixm:AirspaceTimeSlice gml:id="{id_}ts">
+        <aixm:interpretation>BASELINE</aixm:interpretation>
+        <aixm:type>SECTOR</aixm:type>
+        <aixm:designator>{designator}</aixm:designator>
+        {"".join(components)}
+      </aixm:AirspaceTimeSlice></aixm:timeSlice>
+    </aixm:Airspace>
+  </message:hasMember>
+"""
+
+
+def component(
+    operation: str, lower: None | int, upper: None | int, volume: str
+) -> str:
+    limits = "".join(
+        f'<aixm:{name} uom="FL">{value}</aixm:{name}>'
+        for name, value in (("upperLimit", upper), ("lowerLimit", lower))
+        if value is not None
+    )
+    return (
+        "<aixm:geometryComponent><aixm:AirspaceGeometryComponent>"
+        f"<aixm:operation>{operation}</aixm:operation>"
+        "<aixm:theAirspaceVolume><aixm:AirspaceVolume>"
+        f"{limits}{volume}"
+        "</aixm:AirspaceVolume></aixm:theAirspaceVolume>"
+        "</aixm:AirspaceGeometryComponent></aixm:geometryComponent>"
+    )
+
+
+def polygon(pos_list: str) -> str:
+    return (
+        "<aixm:horizontalProjection><aixm:Surface><gml:patches>"
+        "<gml:PolygonPatch><gml:exterior><gml:LinearRing>"
+        f"<gml:posList>{pos_list}</gml:posList>"
+        "</gml:LinearRing></gml:exterior></gml:PolygonPatch>"
+        "</gml:patches></aixm:Surface></aixm:horizontalProjection>"
+    )
+
+
+def contributor(id_: str) -> str:
+    return (
+        "<aixm:contributorAirspace><aixm:AirspaceVolumeDependency>"
+        f'<aixm:theAirspace xlink:href="urn:uuid:{id_}"/>'
+        "</aixm:AirspaceVolumeDependency></aixm:contributorAirspace>"
+    )
+
+
+components_message = (
+    header
+    # two components with different vertical limits
+    + airspace(
+        "a1",
+        "LFBBE1",
+        component("BASE", 0, 245, polygon("44 0 45 0 45 1 44 1 44 0")),
+        component("UNION", 245, 345, polygon("44 .5 45 .5 45 2 44 2 44 .5")),
+    )
+    # an aggregate of an airspace defined later, with its own ceiling
+    + airspace("a2", "LFBBC1", component("BASE", None, 365, contributor("a3")))
+    + airspace(
+        "a3",
+        "LFBBE2",
+        component("BASE", 100, 300, polygon("45 0 46 0 46 1 45 1 45 0")),
+        component("SUBTR", 100, 300, polygon("45 0 45.5 0 45.5 1 45 0")),
+    )
+    + airspace("a4", "LFBBC2", component("BASE", 0, 660, contributor("a9")))
+    + "</message:AIXMBasicMessage>\n"
+)
+
+
+def test_ingest(tmp_path: Path) -> None:
+    archive = tmp_path / "AIXM.BASELINE.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("AIXM.BASELINE.xml", aixm_message)
+
+    stale = tmp_path / "navindex_2401.npz"
+    stale.touch()
+    store = ingest([archive], "2401", tmp_path)
+    assert not stale.exists()
+    assert AIXMStore.load("2401", tmp_path) is not None
+    assert AIXMStore.load("2402", tmp_path) is None
+    assert store.meta["sizes"]["route_segments"] == 1
+
+    latitude = store.column("designated_points", "latitude")
+    assert isinstance(latitude, np.memmap)
+    assert latitude[0] == 44.5
+    assert store.frame("navaids").name.tolist() == ["TOULOUSE"]
+    segments = store.frame("route_segments")
+    assert (segments.lower[0], segments.upper[0]) == (195, 660)
+
+    assert store.vertices(0).tolist()[:2] == [[44, 0], [45, 0]]
+    assert store.frame("airspace_components").lower.tolist() == [0, 50]
+
+    index = NavIndex.from_aixm(store)
+    assert index.get("NARAK") == (44.5, 1.25)
+    assert index.get("TOU", "UN869") == (43.5, 1.375)
+
+
+def test_ingest_components(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    (tmp_path / "AIXM.xml").write_text(components_message)
+    store = ingest([tmp_path / "AIXM.xml"], "2401", tmp_path)
+
+    airspaces = store.frame("airspaces")
+    assert airspaces.designator.tolist() == [
+        "LFBBE1",
+        "LFBBC1",
+        "LFBBE2",
+        "LFBBC2",
+    ]
+    components = store.frame("airspace_components")
+    assert components.airspace.tolist() == [0, 0, 1, 2]
+    assert components.lower.tolist() == [0, 245, 100, 100]
+    assert components.upper.tolist() == [245, 345, 365, 300]
+    assert store.components(0).tolist() == [0, 1]
+    assert store.components(3).tolist() == []
+    assert store.vertices(1).tolist()[0] == [44, 0.5]
+    assert store.vertices(2).tolist() == store.vertices(3).tolist()
+
+    assert "1 SUBTR/INTERS airspace components skipped" in caplog.text
+    assert "LFBBC2: contributor a9 not found" in caplog.text
+
+
+def projection(*patches: str) -> str:
+    return (
+        "<aixm:horizontalProjection><aixm:Surface><gml:patches>"
+        + "".join(
+            f"<gml:PolygonPatch>{patch}</gml:PolygonPatch>" for patch in patches
+        )
+        + "</gml:patches></aixm:Surface></aixm:horizontalProjection>"
+    )
+
+
+def ring(*segments: str) -> str:
+    return (
+        "<gml:Ring><gml:curveMember><gml:Curve><gml:segments>"
+        + "".join(segments)
+        + "</gml:segments></gml:Curve></gml:curveMember></gml:Ring>"
+    )
+
+
+geometry_message = (
+    header
+    # a half disc above the 44th parallel, with a hole
+    + airspace(
+        "a1",
+        "LFBBA1",
+        component(
+            "BASE",
+            0,
+            245,
+            projection(
+                "<gml:exterior>"
+                + ring(
+                    "<gml:GeodesicString><gml:posList>44 1.7 44 0.3"
+                    "</gml:posList></gml:GeodesicString>",
+                    "<gml:ArcByCenterPoint><gml:pos>44 1</gml:pos>"
+                    '<gml:radius uom="NM">30</gml:radius>'
+                    '<gml:startAngle uom="deg">270</gml:startAngle>'
+                    '<gml:endAngle uom="deg">450</gml:endAngle>'
+                    "</gml:ArcByCenterPoint>",
+                    "<gml:ArcString><gml:posList>44 1.7 44 1.8 44 1.9"
+                    "</gml:posList></gml:ArcString>",
+                )
+                + "</gml:exterior><gml:interior><gml:LinearRing><gml:posList>"
+                "44.1 0.9 44.2 0.9 44.2 1.1 44.1 0.9"
+                "</gml:posList></gml:LinearRing></gml:interior>"
+            ),
+        ),
+    )
+    # a circle and a square, in two patches
+    + airspace(
+        "a2",
+        "LFBBA2",
+        component(
+            "BASE",
+            0,
+            245,
+            projection(
+                "<gml:exterior>"
+                + ring(
+                    "<gml:CircleByCenterPoint><gml:pointProperty><gml:Point>"
+                    "<gml:pos>46 1</gml:pos></gml:Point></gml:pointProperty>"
+                    '<gml:radius uom="KM">55.56</gml:radius>'
+                    "</gml:CircleByCenterPoint>"
+                )
+                + "</gml:exterior>",
+                "<gml:exterior><gml:LinearRing><gml:posList>"
+                "47 0 48 0 48 1 47 0"
+                "</gml:posList></gml:LinearRing></gml:exterior>",
+            ),
+        ),
+    )
+    + "</message:AIXMBasicMessage>\n"
+)
+
+
+def test_ingest_geometry(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    (tmp_path / "AIXM.xml").write_text(geometry_message)
+    store = ingest([tmp_path / "AIXM.xml"], "2401", tmp_path)
+    components = store.frame("airspace_components")
+    assert components.airspace.tolist() == [0, 1, 1]
+
+    # the two ends of the geodesic, then one vertex every 5 degrees
+    half_disc = store.vertices(0)
+    assert len(half_disc) == 2 + 37
+    assert half_disc[:2].ravel() == pytest.approx([44, 1.7, 44, 0.3])
+    assert half_disc[:, 0].max() == pytest.approx(44.5)
+    assert half_disc[:, 0].min() == pytest.approx(44)
+
+    circle = store.vertices(1)
+    assert len(circle) == 73
+    assert circle[:, 0].min() == pytest.approx(45.5)
+    assert circle[:, 0].max() == pytest.approx(46.5)
+    assert store.vertices(2).tolist() == [[47, 0], [48, 0], [48, 1], [47, 0]]
+
+    assert "1 interior rings ignored" in caplog.text
+    assert "1 ArcString segments ignored" in caplog.text
+
+    index = AirspaceIndex(store)
+    points, airspaces = index.query([44.15, 46, 47.5], [1, 1, 0.25])
+    assert points.tolist() == [0, 1, 2]
+    assert index.designators[airspaces].tolist() == [
+        "LFBBA1",
+        "LFBBA2",
+        "LFBBA2",
+    ]
+
+
+def test_navindex_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    traffic = NavIndex.from_frames(
+        pd.DataFrame.from_records(
+            [("NARAK", 0.0, 0.0)], columns=["name", "latitude", "longitude"]
+        ),
+        pd.DataFrame(columns=["route", "navaid", "latitude", "longitude"]),
+    )
+    monkeypatch.setattr(navigation, "cache_dir", tmp_path)
+    monkeypatch.setattr(navigation, "version", lambda name: "2.12")
+    monkeypatch.setattr(NavIndex, "from_traffic", lambda: traffic)
+    navigation._load.cache_clear()
+    navigation._load_traffic.cache_clear()
+    try:
+        assert NavIndex.load("2401").get("NARAK") == (0, 0)
+        assert NavIndex.load("2402").get("NARAK") == (0, 0)
+        files = sorted(path.name for path in tmp_path.iterdir())
+        assert files == ["navindex_traffic_2.12.npz"]
+
+        (tmp_path / "AIXM.xml").write_text(aixm_message)
+        ingest([tmp_path / "AIXM.xml"], "2401", tmp_path)
+        assert NavIndex.load("2401").get("NARAK") == (44.5, 1.25)
+        assert NavIndex.load("2402").get("NARAK") == (0, 0)
+        assert (tmp_path / "navindex_2401.npz").exists()
+    finally:
+        navigation._load.cache_clear()
+        navigation._load_traffic.cache_clear()
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+def test_airspace_index(tmp_path: Path) -> None:
+    (tmp_path / "AIXM.xml").write_text(aixm_message)
+    store = ingest([tmp_path / "AIXM.xml"], "2401", tmp_path)
+
+    index = AirspaceIndex(store, resolution=0.5)
+    latitude = [44.2, 44.9, 44.2, 46.0, 44.2, np.nan]
+    longitude = [0.5, 1.8, 0.5, 1.0, 0.5, np.nan]
+    points, airspaces = index.query(
+        latitude, longitude, [100, 100, 300, 100, np.nan, 100]
+    )
+    pairs = sorted(zip(points.tolist(), index.designators[airspaces]))
+    assert pairs == [
+        (0, "LFBBR1"),
+        (0, "LFBBT1"),
+        (1, "LFBBR1"),  # outside of the triangle
+        (2, "LFBBR1"),  # above the triangle
+        (4, "LFBBR1"),
+        (4, "LFBBT1"),
+    ]
+
+    sectors = AirspaceIndex(store, types=["SECTOR"])
+    profile = pd.DataFrame(
+        dict(latitude=latitude, longitude=longitude, altitude=[10000] * 6)
+    )
+    annotated = sectors.annotate(profile, "sectors")
+    assert annotated.sectors.tolist() == [["LFBBR1"]] * 3 + [
+        [],
+        ["LFBBR1"],
+        [],  # not located
+    ]
+
+
+def test_airspace_components(tmp_path: Path) -> None:
+    (tmp_path / "AIXM.xml").write_text(components_message)
+    store = ingest([tmp_path / "AIXM.xml"], "2401", tmp_path)
+
+    index = AirspaceIndex(store)
+    assert index.designators.tolist() == ["LFBBE1"] * 2 + ["LFBBC1", "LFBBE2"]
+    profile = pd.DataFrame(
+        dict(
+            latitude=[44.5, 44.5, 44.5, 44.5, 45.5],
+            longitude=[0.25, 1.5, 0.25, 0.75, 0.5],
+            flight_level=[300, 300, 100, 245, 320],
+        )
+    )
+    points, _ = index.query(
+        profile.latitude, profile.longitude, profile.flight_level
+    )
+    assert points.tolist() == [1, 2, 3, 4]  # both components contain point 3
+    annotated = index.annotate(profile)
+    assert annotated.airspaces.tolist() == [
+        [],  # above the first component, outside of the second one
+        ["LFBBE1"],
+        ["LFBBE1"],
+        ["LFBBE1"],
+        ["LFBBC1"],  # with the ceiling of the aggregate
+    ]
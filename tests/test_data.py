@@ -0,0 +1,434 @@
+import ast
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree
+
+import pytest
+from pyb2b.decode import decode_duration, decode_time, parse_duration
+from pyb2b.navigation import NavIndex
+from pyb2b.services.flight.management import (
+    FlightListByAirspace,
+    FlightPlanList,
+    ProfileBatch,
+)
+from pyb2b.services.flight.management.columnar import duration_fields
+from pyb2b.services.flight.management.flightlist import (
+    FlightInfo,
+    FlightList,
+    ParseFields,
+)
+from pyb2b.services.flight.management.flightretrieval import (
+    FlightRetrieval,
+    FlightRetrievalList,
+)
+from pyb2b.services.flow.measures.regulationlist import (
+    RegulationInfo,
+    RegulationList,
+    columns,
+)
+from pyb2b.types import generated
+
+import numpy as np
+import pandas as pd
+
+
+def test_decode() -> None:
+    times = decode_time(["2024-01-01 10:00", None, "2024-01-01 10:00:30"])
+    assert times.dtype == "datetime64[ns, UTC]"
+    assert times.isna().tolist() == [False, True, False]
+    assert times[2] == pd.Timestamp("2024-01-01 10:00:30", tz="utc")
+
+    # durations and sentinel values are not timestamps
+    times = decode_time(pd.Series(["1200", "0012", "SLOT_TIME_NOT_LIMITED"]))
+    assert times.dtype == "datetime64[ns, UTC]"
+    assert times.isna().all()
+
+    values = [
+        "0012",
+        "011230",
+        "-0005",
+        None,
+        "x",
+        "12345678",
+        "+-0012",
+        "12:3",
+    ]
+    durations = decode_duration(values)
+    assert durations.dtype == "timedelta64[ns]"
+    assert durations[:3].tolist() == [
+        pd.Timedelta("12min"),
+        pd.Timedelta("1h12min30s"),
+        pd.Timedelta("-5min"),
+    ]
+    assert durations[3:].isna().all()
+    assert [parse_duration(value) for value in values] == [
+        pd.Timedelta("12min"),
+        pd.Timedelta("1h12min30s"),
+        pd.Timedelta("-5min"),
+        *[pd.NaT] * 5,
+    ]
+
+
+def plan(flight_id: str, eobt: str, status: str = "FILED") -> Any:
+    return {
+        "lastValidFlightPlan": {
+            "id": {
+                "id": flight_id,
+                "keys": {
+                    "aircraftId": f"CS{flight_id}",
+                    "aerodromeOfDeparture": "LFBO",
+                    "aerodromeOfDestination": "LFPO",
+                    "estimatedOffBlockTime": eobt,
+                },
+            },
+            "status": status,
+        }
+    }
+
+
+def test_flightplanlist() -> None:
+    class Parent:
+        def flightretrieval(self, **kwargs: Any) -> Any:
+            return kwargs
+
+    summaries = [
+        plan("AT2", "2024-01-01 12:00"),
+        {"currentInvalid": {}},
+        plan("AT1", "2024-01-01 10:00", "TERMINATED"),
+    ]
+    fpl = FlightPlanList(
+        {"data": {"summaries": summaries}},
+        parent=Parent(),  # type: ignore
+    )
+    data = fpl.data
+    assert data is fpl.data
+    assert list(data.flightId) == ["AT1", "AT2"]
+    assert isinstance(data.EOBT.dtype, pd.DatetimeTZDtype)
+    assert isinstance(data.origin.dtype, pd.CategoricalDtype)
+    assert isinstance(data.status.dtype, pd.CategoricalDtype)
+
+    handle: Any = fpl["AT2"]
+    assert handle["callsign"] == "CSAT2"
+    assert handle["EOBT"] == pd.Timestamp("2024-01-01 12:00", tz="utc")
+    assert fpl["AT3"] is None
+
+
+def flight(flight_id: str, eobt: str, **fields: Any) -> Any:
+    return {
+        "flight": {
+            "flightId": {
+                "id": flight_id,
+                "keys": {
+                    "aircraftId": f"CS{flight_id}",
+                    "aerodromeOfDeparture": "LFBO",
+                    "aerodromeOfDestination": "LFPO",
+                    "estimatedOffBlockTime": eobt,
+                },
+            },
+            **fields,
+        }
+    }
+
+
+def test_flightretrieval_list() -> None:
+    known = flight("AT1", "2024-01-01 10:00")
+    unknown = flight("AT2", "2024-01-01 11:00")
+    del unknown["flight"]["flightId"]["id"]
+    results = FlightRetrievalList(
+        [FlightRetrieval({"data": known}), FlightRetrieval({"data": unknown})]
+    )
+    assert results["AT1"] is results.results[0]
+    assert results["AT2"] is None
+    assert results.data.flightId.isna().tolist() == [False, True]
+
+
+def test_flightlist() -> None:
+    flights = [
+        flight(
+            "AT2",
+            "2024-01-01 12:00",
+            aircraftType="A320",
+            calculatedTakeOffTime="2024-01-01 12:25",
+            mostPenalisingRegulation="LFBBA01",
+            taxiTime="0012",
+            totalEstimatedElapsedTime="0130",
+            arrivalInformation={"arrivalTaxiTime": "0012"},
+            requestedFlightLevel={"level": "350", "unit": "F"},
+        ),
+        flight("AT1", "2024-01-01 10:00", aircraftType="B738"),
+    ]
+    fl = FlightListByAirspace({"data": {"flights": flights}})  # type: ignore
+    data = fl.data
+    assert data is fl.data
+    assert list(data.flightId) == ["AT1", "AT2"]
+    assert data.EOBT.dtype == "datetime64[ns, UTC]"
+    assert data.calculatedTakeOffTime.dtype == "datetime64[ns, UTC]"
+    assert data.calculatedTakeOffTime.isna().sum() == 1
+    assert isinstance(data.origin.dtype, pd.CategoricalDtype)
+    assert isinstance(data.aircraftType.dtype, pd.CategoricalDtype)
+    assert data.mostPenalisingRegulation.dtype == "string"
+    assert data.taxiTime.iloc[1] == pd.Timedelta("12min")
+    # durations named ...Time are not timestamps
+    assert data.totalEstimatedElapsedTime.iloc[1] == pd.Timedelta("1h30min")
+    taxi = data["arrivalInformation.arrivalTaxiTime"]
+    assert taxi.iloc[1] == pd.Timedelta("12min")
+    assert data["requestedFlightLevel.level"].iloc[1] == "350"
+
+    empty = FlightListByAirspace({"data": None})  # type: ignore
+    assert empty.data.shape[0] == 0
+
+
+def test_duration_fields() -> None:
+    # all fields typed as durations in the generated types are listed
+    fields = set()
+    for path in Path(generated.__file__).parent.glob("*.py"):
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.AnnAssign):
+                annotation = ast.unparse(node.annotation)
+                if annotation.split(".")[-1].startswith(
+                    ("Duration", "SignedDuration")
+                ):
+                    assert isinstance(node.target, ast.Name)
+                    fields.add(node.target.id)
+    assert fields - {"value"} <= duration_fields
+
+
+def test_navindex(tmp_path: Path) -> None:
+    points = pd.DataFrame.from_records(
+        [
+            ("NARAK", 44.6, 1.2),
+            ("NARAK", 44.6, 1.2),
+            ("ABC", 10.0, 10.0),
+            ("ABC", -10.0, -10.0),
+        ],
+        columns=["name", "latitude", "longitude"],
+    )
+    airways = pd.DataFrame.from_records(
+        [("UN869", "NARAK", 44.6, 1.2), ("UN869", "ABC", 10.0, 10.0)],
+        columns=["route", "navaid", "latitude", "longitude"],
+    )
+    index = NavIndex.from_frames(points, airways)
+    index.to_file(tmp_path / "navindex.npz")
+    index = NavIndex.from_file(tmp_path / "navindex.npz")
+
+    assert index.get("NARAK") == pytest.approx((44.6, 1.2))  # co-located
+    assert index.get("ABC") is None  # ambiguous
+    assert index.get("ABC", "UN869") == pytest.approx((10.0, 10.0))
+    assert index.get("NARAK", "UN870") == pytest.approx((44.6, 1.2))
+    assert index.get("XYZ") is None
+
+
+def test_parse_fields(monkeypatch: pytest.MonkeyPatch) -> None:
+    index = NavIndex.from_frames(
+        pd.DataFrame.from_records(
+            [("NARAK", 44.5, 1.25)], columns=["name", "latitude", "longitude"]
+        ),
+        pd.DataFrame(columns=["route", "navaid", "latitude", "longitude"]),
+    )
+    loaded: list[Any] = []
+
+    def load(airac: Any = None) -> NavIndex:
+        loaded.append(airac)
+        return index
+
+    monkeypatch.setattr(NavIndex, "load", load)
+    parser = ParseFields(airac="2401")
+    level = "<flightLevel><unit>F</unit><level>350</level></flightLevel>"
+    assert parser.parse(ElementTree.fromstring(level)) == {"altitude": 35000}
+    assert loaded == []
+
+    point = "<point><pointId>NARAK</pointId></point>"
+    for _ in range(2):
+        assert parser.parse(ElementTree.fromstring(point)) == {
+            "FIX": "NARAK",
+            "latitude": 44.5,
+            "longitude": 1.25,
+        }
+    assert loaded == ["2401"]
+
+
+def test_profiles_airac(monkeypatch: pytest.MonkeyPatch) -> None:
+    loaded: list[Any] = []
+
+    def load(airac: Any = None) -> NavIndex:
+        loaded.append(airac)
+        return NavIndex.from_frames(
+            pd.DataFrame.from_records(
+                [("NARAK", len(loaded), 0)],
+                columns=["name", "latitude", "longitude"],
+            ),
+            pd.DataFrame(columns=["route", "navaid", "latitude", "longitude"]),
+        )
+
+    monkeypatch.setattr(NavIndex, "load", load)
+    profile = [
+        {"timeOver": "2024-02-01 10:20:00", "point": {"pointId": "NARAK"}}
+    ]
+    flights = [
+        flight("AT1", "2024-01-01 10:00", ctfmPointProfile=profile)["flight"],
+        flight("AT2", "2024-02-01 10:00", ctfmPointProfile=profile)["flight"],
+        flight("AT3", "2024-01-01 23:00", ctfmPointProfile=profile)["flight"],
+        # without keys, the first point tells the cycle
+        {"flightId": {"id": "AT4"}, "ctfmPointProfile": profile},
+    ]
+    batch = ProfileBatch.decode(flights)
+    assert loaded == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")]
+    assert batch.latitude.tolist() == [1, 2, 1, 2]
+
+
+def test_profiles() -> None:
+    index = NavIndex.from_frames(
+        pd.DataFrame.from_records(
+            [("NARAK", 44.6, 1.2)], columns=["name", "latitude", "longitude"]
+        ),
+        pd.DataFrame(columns=["route", "navaid", "latitude", "longitude"]),
+    )
+    profile = [
+        {
+            "timeOver": "2024-01-01 10:00:00",
+            "flightLevel": {"unit": "F", "level": "0"},
+            "aerodrome": "LFBO",
+        },
+        {
+            "timeOver": "2024-01-01 10:20:00",
+            "flightLevel": {"unit": "F", "level": "350"},
+            "associatedRouteOrTerminalProcedure": {"route": "UN869"},
+            "point": {"pointId": "NARAK"},
+        },
+    ]
+    first = flight("AT1", "2024-01-01 10:00", ctfmPointProfile=profile)
+    second = ElementTree.fromstring(
+        "<flight><flightId><id>AT2</id></flightId><ctfmPointProfile>"
+        "<timeOver>2024-01-01 11:00:00</timeOver>"
+        "<point><nonPublishedPoint-GeoPoint><position>"
+        "<latitude><angle>450000</angle><side>NORTH</side></latitude>"
+        "<longitude><angle>10000</angle><side>WEST</side></longitude>"
+        "</position></nonPublishedPoint-GeoPoint></point>"
+        "</ctfmPointProfile></flight>"
+    )
+    batch = ProfileBatch.decode([first["flight"], second], index=index)
+    assert len(batch) == 2
+    assert batch.flight.tolist() == [0, 0, 1]
+    assert batch.flight_level[1] == 350
+    assert batch.latitude.tolist() == pytest.approx(
+        [np.nan, 44.6, 45], nan_ok=True
+    )
+    assert batch.longitude[2] == pytest.approx(-1)
+    assert batch.point.tolist() == ["LFBO", "NARAK", None]
+
+    view = batch["AT1"]
+    assert np.shares_memory(view["latitude"], batch.latitude)
+    assert view["route"].tolist() == [None, "UN869"]
+    assert batch.to_dataframe().flight_id.tolist() == ["AT1", "AT1", "AT2"]
+
+
+def test_flightinfo() -> None:
+    info = FlightInfo.fromET(
+        ElementTree.fromstring(
+            "<flight><flightId><id>AT1</id><keys>"
+            "<aircraftId>AFR12</aircraftId>"
+            "<aerodromeOfDeparture>LFBO</aerodromeOfDeparture>"
+            "<estimatedOffBlockTime>2024-01-01 10:00</estimatedOffBlockTime>"
+            "</keys></flightId>"
+            "<aircraftType>A320</aircraftType>"
+            "<taxiTime>0012</taxiTime>"
+            "<calculatedTakeOffTime>SLOT_TIME_NOT_LIMITED</calculatedTakeOffTime>"
+            "</flight>"
+        )
+    )
+    assert info.flight_id == "AT1"
+    assert info.callsign == "AFR12"
+    assert info.aircraftType == "A320"
+    assert info.estimatedOffBlockTime == pd.Timestamp("2024-01-01 10:00Z")
+    assert info.taxiTime == pd.Timedelta("12min")
+    assert info.calculatedTakeOffTime is pd.NaT
+    assert info.icao24 is None
+    assert info.fields is info.fields
+    with pytest.raises(AttributeError):
+        info.unknown
+
+
+def test_regulationinfo() -> None:
+    info = RegulationInfo.fromET(
+        ElementTree.fromstring(
+            "<item><regulationId>LFBBA01</regulationId>"
+            "<regulationState>APPLIED</regulationState>"
+            "<reason>WEATHER</reason>"
+            "<applicability><wef>2024-01-01 10:00</wef>"
+            "<unt>2024-01-01 12:00</unt></applicability>"
+            "<location><id>LFBBTV</id><flightLevels><min><level>300</level>"
+            "</min></flightLevels>"
+            "<referenceLocation-ReferenceLocationAirspace><id>LFBBR1</id>"
+            "</referenceLocation-ReferenceLocationAirspace></location>"
+            "</item>"
+        )
+    )
+    assert info.regulation_id == "LFBBA01"
+    assert info.state == "APPLIED"
+    assert info.reason == "WEATHER"
+    assert info.stop - info.start == pd.Timedelta("2h")
+    assert (info.tvId, info.location) == ("LFBBTV", "LFBBR1")
+    assert (info.fl_min, info.fl_max) == (300, 999)
+
+
+def flight_element(flight_id: str, eobt: str) -> str:
+    return (
+        f"<flight><flightId><id>{flight_id}</id><keys>"
+        f"<aircraftId>AFR{flight_id}</aircraftId>"
+        "<aerodromeOfDeparture>LFBO</aerodromeOfDeparture>"
+        "<aerodromeOfDestination>LFPO</aerodromeOfDestination>"
+        f"<estimatedOffBlockTime>{eobt}</estimatedOffBlockTime>"
+        "</keys></flightId><aircraftType>A320</aircraftType></flight>"
+    )
+
+
+def test_flightlist_take() -> None:
+    flights = FlightList.fromET(
+        ElementTree.fromstring(
+            "<reply><data><flights>"
+            + flight_element("AT3", "2024-01-01 12:00")
+            + flight_element("AT1", "2024-01-01 10:00")
+            + flight_element("AT2", "2024-01-01 11:00")
+            + "</flights></data></reply>"
+        )
+    )
+    assert flights.data.flightId.tolist() == ["AT1", "AT2", "AT3"]
+    assert flights.data.EOBT.iloc[0] == pd.Timestamp("2024-01-01 10:00Z")
+    assert flights._ipython_key_completions_() == {"AT1", "AT2", "AT3"}
+
+    info = flights["AT2"]
+    assert info is not None and info.callsign == "AFRAT2"
+    assert flights["AT4"] is None
+
+    subset = flights.take(["AT3", "AT4", "AT1", "AT3"])
+    assert isinstance(subset, FlightList)
+    assert list(subset._elements) == ["AT3", "AT1"]
+    assert subset.data.flightId.tolist() == ["AT1", "AT3"]
+
+
+def test_regulationlist_take() -> None:
+    regulations = RegulationList.fromET(
+        ElementTree.fromstring(
+            "<reply><data><regulations>"
+            + "".join(
+                f"<item><regulationId>{id_}</regulationId>"
+                "<regulationState>APPLIED</regulationState>"
+                "<subType>ATFM</subType><reason>WEATHER</reason>"
+                "<description>thunderstorms</description>"
+                "<applicability><wef>2024-01-01 10:00</wef>"
+                "<unt>2024-01-01 12:00</unt></applicability>"
+                "<location><id>LFBBTV</id></location></item>"
+                for id_ in ["LFBBA01", "LFBBA02"]
+            )
+            + "</regulations></data></reply>"
+        )
+    )
+    assert regulations.data.regulationId.tolist() == ["LFBBA01", "LFBBA02"]
+    assert regulations.data.tvId.tolist() == ["LFBBTV", "LFBBTV"]
+    assert regulations.data.fl_max.tolist() == [999, 999]
+    assert isinstance(regulations.data.start.dtype, pd.DatetimeTZDtype)
+    info = regulations["LFBBA02"]
+    assert info is not None and info.regulation_id == "LFBBA02"
+    subset = regulations.take(["LFBBA02"])
+    assert subset.data.regulationId.tolist() == ["LFBBA02"]
+    assert regulations.take([]).data.columns.tolist() == columns
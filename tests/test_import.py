@@ -0,0 +1,68 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+#: Modules slow to import, only needed once the B2B instance is accessed
+heavy = ["numpy", "pandas", "httpx", "pyb2b.main"]
+
+
+def run(code: str, config_home: Path) -> str:
+    env = {"XDG_CONFIG_HOME": str(config_home), "PATH": ""}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def test_import_lazy(tmp_path: Path) -> None:
+    code = f"""
+import sys
+import pyb2b
+print([name for name in {heavy!r} if name in sys.modules])
+"""
+    assert run(code, tmp_path).strip() == "[]"
+
+
+def test_import_generated_types(tmp_path: Path) -> None:
+    code = """
+import sys
+import pyb2b.main
+print(any(".types.generated." in name for name in sys.modules))
+"""
+    assert run(code, tmp_path).strip() == "False"
+
+
+def test_lazy_b2b(tmp_path: Path, pkcs12_file: Path) -> None:
+    code = """
+import pyb2b
+try:
+    pyb2b.b2b
+except ImportError:
+    print("ImportError")
+"""
+    assert run(code, tmp_path).strip() == "ImportError"
+    assert (tmp_path / "b2b" / "b2b.conf").exists()
+
+    (tmp_path / "b2b" / "b2b.conf").write_text(
+        f"[global]\npkcs12_filename = {pkcs12_file}\n"
+        "pkcs12_password = password\n"
+    )
+    code = """
+import pyb2b
+from pyb2b import b2b
+print(type(b2b).__name__, b2b is pyb2b.b2b)
+"""
+    assert run(code, tmp_path).strip() == "B2B True"
+
+
+def test_missing_attribute() -> None:
+    import pyb2b
+
+    with pytest.raises(AttributeError):
+        pyb2b.missing
@@ -0,0 +1,358 @@
+import asyncio
+import inspect
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+import xmltodict
+from pyb2b.errors import QuotaExceeded, ReplyError
+from pyb2b.governor import Governor
+from pyb2b.main import B2B
+
+import pandas as pd
+
+request = {
+    "fl:FlightPlanListRequest": {
+        "@xmlns:fl": "eurocontrol/cfmu/b2b/FlightServices",
+        "sendTime": "2024-01-01 00:00:00",
+    }
+}
+
+
+def reply(status: str, data: str = "", name: str = "FlightPlanList") -> bytes:
+    return (
+        f"<fl:{name}Reply "
+        'xmlns:fl="eurocontrol/cfmu/b2b/FlightServices">'
+        "<requestId>1</requestId>"
+        "<requestReceptionTime>2024-01-01 00:00:00</requestReceptionTime>"
+        "<sendTime>2024-01-01 00:00:01</sendTime>"
+        f"<status>{status}</status>{data}"
+        f"</fl:{name}Reply>"
+    ).encode()
+
+
+def test_decode_reply(offline_b2b: B2B) -> None:
+    data = "<data><summaries><status>FILED</status></summaries></data>"
+    res = httpx.Response(200, content=reply("OK", data))
+    decoded = offline_b2b.decode_reply(res)
+    body = decoded["fl:FlightPlanListReply"]  # type: ignore
+    assert body["status"] == "OK"
+    assert body["data"]["summaries"]["status"] == "FILED"
+
+    errors = (
+        "<inputValidationErrors><type>INVALID_VALUE</type>"
+        "<parameters><key>aerodromeOfDeparture</key></parameters>"
+        "</inputValidationErrors>"
+    )
+    res = httpx.Response(200, content=reply("INVALID_INPUT", errors))
+    with pytest.raises(AttributeError, match="INVALID_VALUE"):
+        offline_b2b.decode_reply(res)
+
+    res = httpx.Response(200, content=reply("BANDWIDTH_QUOTAS_EXCEEDED"))
+    with pytest.raises(QuotaExceeded):
+        offline_b2b.decode_reply(res)
+
+
+def test_governor_limit() -> None:
+    governor = Governor(initial=4, retries=0)
+
+    async def rejected() -> None:
+        await asyncio.sleep(0.01)
+        raise QuotaExceeded("PARALLEL_REQUEST_COUNT_QUOTA_EXCEEDED", "")
+
+    async def accepted() -> int:
+        return 1
+
+    async def main() -> None:
+        # concurrent rejections only halve the limit once
+        results = await asyncio.gather(
+            *(governor.call(rejected) for _ in range(4)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, QuotaExceeded) for r in results)
+        assert governor.limit == 2
+        for _ in range(10):
+            await governor.call(accepted)
+        assert 3 < governor.limit < 6
+        assert governor.active == 0
+
+    asyncio.run(main())
+
+
+def test_governor_loops() -> None:
+    governor = Governor(initial=2, retries=0)
+    started, proceed = threading.Event(), threading.Event()
+    running, peak = 0, 0
+
+    async def slow() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        if running == 2:
+            started.set()
+        await asyncio.to_thread(proceed.wait)
+        running -= 1
+
+    async def fast() -> int:
+        return 1
+
+    async def main() -> None:
+        await asyncio.gather(*(governor.call(slow) for _ in range(4)))
+
+    thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+    thread.start()
+    try:
+        started.wait()
+        # another loop, while the first one holds all its slots
+        assert asyncio.run(governor.call(fast)) == 1
+        assert governor.active == 2
+    finally:
+        proceed.set()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert peak == 2
+    assert governor.active == 0
+
+
+def test_async_post_retry(offline_b2b: B2B) -> None:
+    offline_b2b.governor = Governor(backoff=0.01)
+    statuses = ["REQUEST_COUNT_QUOTA_EXCEEDED", "RESOURCE_OVERLOAD", "OK"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=reply(statuses.pop(0)))
+
+    async def main() -> None:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            res = await offline_b2b.async_post(client, request)
+        assert res["fl:FlightPlanListReply"]["status"] == "OK"
+
+    asyncio.run(main())
+    assert statuses == []
+
+
+def test_async_post_error(offline_b2b: B2B) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=reply("OBJECT_NOT_FOUND"))
+
+    async def main() -> None:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await offline_b2b.async_post(client, request)
+
+    with pytest.raises(ReplyError) as exc_info:
+        asyncio.run(main())
+    assert exc_info.value.status == "OBJECT_NOT_FOUND"
+
+
+def test_async_post_thread(
+    offline_b2b: B2B, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    decoded_in = []
+    decode_reply = offline_b2b.decode_reply
+
+    def decode(res: httpx.Response) -> Any:
+        decoded_in.append(threading.current_thread())
+        return decode_reply(res)
+
+    monkeypatch.setattr(offline_b2b, "async_decode_size", 0)
+    monkeypatch.setattr(offline_b2b, "decode_reply", decode)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=reply("OBJECT_NOT_FOUND"))
+
+    async def main() -> None:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await offline_b2b.async_post(client, request)
+
+    with pytest.raises(ReplyError):
+        asyncio.run(main())
+    assert decoded_in != [threading.main_thread()]
+    assert len(decoded_in) == 1
+
+
+def airspace_handler(request: httpx.Request) -> httpx.Response:
+    """Answers TOO_MANY_RESULTS for windows longer than two hours."""
+    body = xmltodict.parse(request.content)["fl:FlightListByAirspaceRequest"]
+    window = body["trafficWindow"]
+    wef, unt = pd.Timestamp(window["wef"]), pd.Timestamp(window["unt"])
+    if unt - wef > pd.Timedelta("2h"):
+        content = reply("TOO_MANY_RESULTS", name="FlightListByAirspace")
+        return httpx.Response(200, content=content)
+    # one flight per hour, with one duplicate at each boundary
+    flights = "".join(
+        f"<flights><flight><flightId><id>AT{ts:%H}</id></flightId>"
+        "</flight></flights>"
+        for ts in pd.date_range(wef.ceil("h"), unt, freq="h")
+    )
+    content = reply("OK", f"<data>{flights}</data>", "FlightListByAirspace")
+    return httpx.Response(200, content=content)
+
+
+def test_split_window(offline_b2b: B2B) -> None:
+    transport = httpx.MockTransport(airspace_handler)
+    start, stop = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02")
+
+    offline_b2b._client = httpx.Client(transport=transport)
+    offline_b2b._client_pid = os.getpid()
+    result = offline_b2b.flightlistbyairspace(
+        "LFBBBDX", start, stop, split=True
+    )
+    flights = result.json["data"]["flights"]
+    assert isinstance(flights, list)
+    assert sorted(f["flight"]["flightId"]["id"] for f in flights) == sorted(
+        f"AT{hour:02d}" for hour in range(24)
+    )
+
+    async def main() -> None:
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await offline_b2b.async_flightlistbyairspace(
+                client, "LFBBBDX", start, stop, split=True
+            )
+        assert len(result.json["data"]["flights"]) == 24
+
+    asyncio.run(main())
+
+    with pytest.raises(ReplyError):
+        offline_b2b.flightlistbyairspace("LFBBBDX", start, stop)
+
+
+def test_split_keyword_only() -> None:
+    for name in (
+        "flightplanlist",
+        "flightlistbyairspace",
+        "flightlistbyaerodrome",
+    ):
+        for method in (getattr(B2B, name), getattr(B2B, f"async_{name}")):
+            split = inspect.signature(method).parameters["split"]
+            assert split.kind is inspect.Parameter.KEYWORD_ONLY, method
+
+
+def retrieval_handler(request: httpx.Request) -> httpx.Response:
+    body = xmltodict.parse(request.content)["fl:FlightRetrievalRequest"]
+    keys = body["flightId"]["keys"]
+    if keys["aircraftId"] == "UNKNOWN":
+        content = reply("OBJECT_NOT_FOUND", name="FlightRetrieval")
+        return httpx.Response(200, content=content)
+    flight = (
+        "<data><flight><flightId>"
+        f"<id>AT{keys['aircraftId']}</id><keys>"
+        f"<aircraftId>{keys['aircraftId']}</aircraftId>"
+        f"<aerodromeOfDeparture>{keys['aerodromeOfDeparture']}"
+        "</aerodromeOfDeparture>"
+        f"<aerodromeOfDestination>{keys['aerodromeOfDestination']}"
+        "</aerodromeOfDestination>"
+        f"<estimatedOffBlockTime>{keys['estimatedOffBlockTime']}"
+        "</estimatedOffBlockTime>"
+        "</keys></flightId>"
+        "<calculatedTakeOffTime>2024-01-01 10:25</calculatedTakeOffTime>"
+        "</flight></data>"
+    )
+    content = reply("OK", flight, name="FlightRetrieval")
+    return httpx.Response(200, content=content)
+
+
+def test_flightretrieval_many(offline_b2b: B2B) -> None:
+    flights = pd.DataFrame.from_records(
+        [
+            ("2024-01-01 10:00", "AFR123", "LFPG", "LFBO"),
+            ("2024-01-01 10:10", "UNKNOWN", "LFPG", "LFBO"),
+            ("2024-01-01 10:20", "EZY456", "LFBO", "LFPO"),
+        ],
+        columns=["EOBT", "callsign", "origin", "destination"],
+    )
+
+    async def main() -> None:
+        transport = httpx.MockTransport(retrieval_handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await offline_b2b.async_flightretrieval_many(
+                client, flights, max_concurrency=2
+            )
+        assert len(result) == 2
+        assert [keys.callsign for keys in result.errors] == ["UNKNOWN"]
+        assert result["ATAFR123"] is not None
+        assert result.data.CTOT.notna().all()
+        assert result.data.EOBT.dt.tz is not None
+
+    asyncio.run(main())
+
+
+def regulation_handler(request: httpx.Request) -> httpx.Response:
+    body = xmltodict.parse(request.content)["fw:RegulationListRequest"]
+    tvs = body["tvs"]["item"] if body.get("tvs") else ["LFBBTV", "LFEETV"]
+    items = "".join(
+        f"<item><regulationId>{tv[:4]}A01</regulationId>"
+        "<regulationState>APPLIED</regulationState>"
+        f"<location><id>{tv}</id></location></item>"
+        for tv in ([tvs] if isinstance(tvs, str) else tvs)
+    )
+    data = f"<data><regulations>{items}</regulations></data>"
+    return httpx.Response(200, content=reply("OK", data, "RegulationList"))
+
+
+def test_regulation_list(offline_b2b: B2B) -> None:
+    transport = httpx.MockTransport(regulation_handler)
+    offline_b2b._client = httpx.Client(transport=transport)
+    offline_b2b._client_pid = os.getpid()
+
+    result = offline_b2b.regulation_list(traffic_volumes=["LFBBTV"])
+    assert result.data.regulationId.tolist() == ["LFBBA01"]
+
+    windows = [("2024-01-01 10:00", "2024-01-01 11:00")] * 2
+    tvs = [["LFBBTV"], ["LFBBTV", "LFEETV"]]
+    result = offline_b2b.regulation_list_many(windows, tvs)
+    assert result.data.regulationId.tolist() == ["LFBBA01", "LFEEA01"]
+
+    async def main() -> None:
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await offline_b2b.async_regulation_list(client)
+            assert len(result.data) == 2
+            result = await offline_b2b.async_regulation_list_many(
+                client, traffic_volumes=tvs
+            )
+            assert sorted(result._elements) == ["LFBBA01", "LFEEA01"]
+
+    asyncio.run(main())
+
+
+def test_ssl_context(pkcs12_file: Path) -> None:
+    first = B2B("PREOPS", "27.0.0", pkcs12_file, "password")
+    second = B2B("OPS", "27.0.0", pkcs12_file, "password")
+    assert first.context is second.context
+
+    with pytest.raises(ValueError):
+        B2B("PREOPS", "27.0.0", pkcs12_file, "wrong password")
+
+
+def test_client(offline_b2b: B2B, monkeypatch: pytest.MonkeyPatch) -> None:
+    parent = offline_b2b.client
+    assert offline_b2b.client is parent
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "getpid", lambda: -1)
+        # a forked process gets its own client...
+        forked = offline_b2b.client
+        assert forked is not parent
+        assert offline_b2b.client is forked
+        offline_b2b.close()
+        assert forked.is_closed
+    assert not parent.is_closed
+    parent.close()
+
+    # ... and leaves the connections of its parent alone
+    parent = offline_b2b.client
+    with monkeypatch.context() as m:
+        m.setattr(os, "getpid", lambda: -1)
+        offline_b2b.close()
+    assert not parent.is_closed
+    parent.close()
+
+    with offline_b2b as b2b:
+        client = b2b.client
+        assert not client.is_closed
+    assert client.is_closed
+    assert b2b._client is None
@@ -0,0 +1,299 @@
+import asyncio
+from types import ModuleType
+from typing import Any
+
+import pyb2b
+import pytest
+from pyb2b.main import B2B
+from pyb2b.services.flight.management import FlightPlanList
+from pyb2b.services.flight.management.flightretrieval import FlightKeys
+from rich.text import Text
+from textual.widgets import DataTable
+
+import pandas as pd
+
+flights = [
+    FlightKeys("2024-01-01 10:00", f"AFR{i}", "LFPG", "LFBO") for i in range(3)
+]
+
+
+@pytest.fixture
+def tui(offline_b2b: B2B, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """The console module, with a B2B instance which is not configured."""
+    monkeypatch.setitem(vars(pyb2b), "b2b", offline_b2b)
+    from pyb2b.console import tui
+
+    monkeypatch.setattr(tui, "b2b", offline_b2b)
+    return tui
+
+
+class Fetch:
+    """A fake fetch coroutine, counting its calls."""
+
+    def __init__(self, delay: float = 0, error: bool = False) -> None:
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self) -> Any:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise RuntimeError("fetch failed")
+        return self.calls
+
+
+def test_cache_shared_task(tui: ModuleType) -> None:
+    async def main() -> None:
+        cache = tui.RetrievalCache()
+        fetch = Fetch(delay=0.01)
+        task = cache.get(flights[0], fetch)
+        assert cache.get(flights[0], fetch) is task
+        assert await task == 1
+        assert await cache.get(flights[0], fetch) == 1
+        assert fetch.calls == 1
+
+    asyncio.run(main())
+
+
+def test_cache_ttl(tui: ModuleType) -> None:
+    async def main() -> None:
+        cache = tui.RetrievalCache(ttl=0.05)
+        fetch = Fetch()
+        assert await cache.get(flights[0], fetch) == 1
+        assert flights[0] in cache
+        await asyncio.sleep(0.06)
+        assert flights[0] not in cache
+        assert await cache.get(flights[0], fetch) == 2
+
+    asyncio.run(main())
+
+
+def test_cache_lru(tui: ModuleType) -> None:
+    async def main() -> None:
+        cache = tui.RetrievalCache(maxsize=2)
+        fetch = Fetch()
+        await cache.get(flights[0], fetch)
+        await cache.get(flights[1], fetch)
+        await cache.get(flights[0], fetch)  # the most recently used now
+        await cache.get(flights[2], fetch)
+        assert flights[0] in cache
+        assert flights[1] not in cache
+        assert flights[2] in cache
+        assert fetch.calls == 3
+
+    asyncio.run(main())
+
+
+def test_cache_failure(tui: ModuleType) -> None:
+    async def main() -> None:
+        cache = tui.RetrievalCache()
+        fetch = Fetch(error=True)
+        with pytest.raises(RuntimeError):
+            await cache.get(flights[0], fetch)
+        assert flights[0] not in cache
+
+        fetch.error = False
+        assert await cache.get(flights[0], fetch) == 2
+        assert flights[0] in cache
+
+    asyncio.run(main())
+
+
+def test_cache_cancellation(tui: ModuleType) -> None:
+    async def main() -> None:
+        cache = tui.RetrievalCache()
+        fetch = Fetch(delay=0.01)
+
+        # a cancelled prefetch does not cancel the shielded fetch
+        waiter = asyncio.ensure_future(
+            asyncio.shield(cache.get(flights[0], fetch))
+        )
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert await cache.get(flights[0], fetch) == 1
+        assert flights[0] in cache
+        assert fetch.calls == 1
+
+        # a cancelled fetch is not kept
+        task = cache.get(flights[1], fetch)
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert flights[1] not in cache
+
+    asyncio.run(main())
+
+
+def plan_row(flight_id: str, eobt: str, status: str) -> tuple[str, ...]:
+    return ("01 Jan", "AFR1", "LFPG", "LFBO", eobt, flight_id, status)
+
+
+def test_diff_rows(tui: ModuleType) -> None:
+    async def main() -> None:
+        app = tui.B2B()
+        async with app.run_test():
+            table = app.query_one(DataTable)
+            await app.add_rows(
+                table,
+                [
+                    plan_row("AA1", "10:00", "FILED"),
+                    plan_row("AA2", "11:00", "FILED"),
+                ],
+            )
+            await app.diff_rows(
+                table,
+                [
+                    plan_row("AA1", "10:00", "ATC_ACTIVATED"),
+                    plan_row("AA3", "12:00", "FILED"),
+                ],
+            )
+            assert [key.value for key in table.rows] == ["AA1", "AA3"]
+            status = table.get_cell("AA1", "status")
+            assert isinstance(status, Text)
+            assert status.plain == "ATC_ACTIVATED"
+            assert status.style == tui.changed_style
+            assert table.get_cell("AA1", "EOBT") == "10:00"
+            assert table.get_row("AA3") == list(
+                plan_row("AA3", "12:00", "FILED")
+            )
+
+            # cells are only highlighted until the next refresh
+            await app.diff_rows(
+                table,
+                [
+                    plan_row("AA1", "10:00", "ATC_ACTIVATED"),
+                    plan_row("AA3", "12:00", "FILED"),
+                ],
+            )
+            assert table.get_cell("AA1", "status") == "ATC_ACTIVATED"
+
+    asyncio.run(main())
+
+
+def test_live_mode(tui: ModuleType) -> None:
+    async def main() -> None:
+        app = tui.B2B()
+        app.refresh_interval = 0.01
+        refreshes = 0
+
+        def refresh_search() -> None:
+            nonlocal refreshes
+            refreshes += 1
+
+        app.refresh_search = refresh_search
+        async with app.run_test() as pilot:
+            app.query_one(DataTable).focus()
+            await pilot.press("r")
+            assert app.refresh_timer is not None
+            assert app.sub_title == "Live"
+            await pilot.pause(0.05)
+            assert refreshes > 0
+
+            await pilot.press("r")
+            assert app.refresh_timer is None
+            assert app.sub_title == ""
+            count = refreshes
+            await pilot.pause(0.05)
+            assert refreshes == count
+
+    asyncio.run(main())
+
+
+def test_json_tree(tui: ModuleType) -> None:
+    summaries = [{"flightId": {"id": f"AA{i}"}} for i in range(250)]
+
+    async def main() -> None:
+        app = tui.B2B()
+        async with app.run_test() as pilot:
+            tree = app.query_one(tui.JSONTree)
+            tree.update_json({"data": {"flights": summaries}})
+            assert not tree.root.children  # built when displayed
+
+            app.query_one(DataTable).focus()
+            await pilot.press("d")
+            (data,) = tree.root.children
+            data.expand()
+            await pilot.pause()
+            (node,) = data.children
+            node.expand()
+            await pilot.pause()
+            assert len(node.children) == tree.page_size + 1
+            more = node.children[-1]
+            assert isinstance(more.data, tui._Page)
+            assert str(more.label) == "… 150 more"
+
+            # flights are only built when their node is expanded
+            assert not node.children[0].children
+
+            tree.select_node(more)
+            await pilot.pause()
+            assert len(node.children) == 2 * tree.page_size + 1
+            tree.select_node(node.children[-1])
+            await pilot.pause()
+            assert len(node.children) == len(summaries)
+            assert str(node.children[-1].label) == "249 {1}"
+
+    asyncio.run(main())
+
+
+def plan(flight_id: str, eobt: str) -> Any:
+    return {
+        "lastValidFlightPlan": {
+            "id": {
+                "id": flight_id,
+                "keys": {
+                    "aircraftId": flight_id[:3],
+                    "aerodromeOfDeparture": "LFBO",
+                    "aerodromeOfDestination": "LFPO",
+                    "estimatedOffBlockTime": eobt,
+                },
+            },
+            "status": "FILED",
+        }
+    }
+
+
+def test_search(tui: ModuleType, monkeypatch: pytest.MonkeyPatch) -> None:
+    delays = {"AFR": 0.05, "EZY": 0}
+
+    async def fetch(self: Any, client: Any) -> FlightPlanList:
+        await asyncio.sleep(delays[self.callsign])
+        summaries = [
+            plan(f"{self.callsign}{i:03d}", f"2024-01-01 {i // 60 % 24:02d}:00")
+            for i in range(600)
+        ]
+        return FlightPlanList({"data": {"summaries": summaries}})
+
+    monkeypatch.setattr(tui.Search, "fetch", fetch)
+    start = pd.Timestamp("2024-01-01")
+
+    async def main() -> None:
+        app = tui.B2B()
+        async with app.run_test():
+            table = app.query_one(DataTable)
+            # the slow search is cancelled when the next one starts
+            first = app.search(tui.Search(start, "AFR", "", "", "", ""))
+            second = app.search(tui.Search(start, "EZY", "", "", "", ""))
+            await second.wait()
+            assert first.is_cancelled
+            assert second.is_finished
+            assert table.row_count == 600
+            assert all(key.value.startswith("EZY") for key in table.rows)
+
+            # rows are added by chunks, so a search may stop halfway
+            delays["AFR"] = 0
+            first = app.search(tui.Search(start, "AFR", "", "", "", ""))
+            while "AFR000" not in table.rows:
+                await asyncio.sleep(0)
+            assert table.row_count == tui.chunk_size
+            second = app.search(tui.Search(start, "EZY", "", "", "", ""))
+            await second.wait()
+            assert first.is_cancelled
+            assert table.row_count == 600
+            assert all(key.value.startswith("EZY") for key in table.rows)
+
+    asyncio.run(main())